@@ -0,0 +1,122 @@
+# app/core/conditional.py
+
+"""
+Conditional GET (ETag / Last-Modified / 304) for database-backed reads.
+
+A response is versioned by (row count, max updated_at) over the rows it is
+built from: an update moves updated_at, an insert adds a newer row and a
+delete lowers the count, so the pair changes whenever the body would. The
+ETag hashes that pair with the request path and query string (different
+pages and filters never share a tag).
+
+Endpoints run the version query first - one aggregate per table, all in a
+single UNION ALL - and answer If-None-Match with 304 before loading or
+serializing anything. Reading the version before the data means a write
+racing the request can only make the ETag older than the body, which
+costs the client one extra 200 and never serves stale data.
+
+Paginated lists are the exception: versioning every row a filter
+matches would scan the whole filter on each page request, undoing what
+keyset pagination saves. They load their page first and version just
+those rows (rows_version: ids + updated_at), so a 304 there saves the
+serialization and transfer, not the query.
+
+Last-Modified is informational: If-Modified-Since is not honoured because
+deleting a row does not move max(updated_at).
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy import Table, func, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import ColumnElement
+
+CACHE_CONTROL = "private, no-cache"
+
+
+@dataclass(frozen=True)
+class ResourceVersion:
+    count: int
+    last_modified: Optional[datetime]
+    # Digest of the row ids, for versions built from loaded rows
+    members: str = ""
+
+    def etag(self, scope: str) -> str:
+        stamp = self.last_modified.isoformat() if self.last_modified else "-"
+        key = f"{scope}|{self.count}|{stamp}"
+        if self.members:
+            key += f"|{self.members}"
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return f'"{digest[:32]}"'
+
+    def headers(self, scope: str) -> Dict[str, str]:
+        headers = {"ETag": self.etag(scope), "Cache-Control": CACHE_CONTROL}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(
+                self.last_modified.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True
+            )
+        return headers
+
+
+def version_select(table: Table, *where: ColumnElement) -> Select:
+    """count(*) and max(updated_at) over the rows of `table` matching `where`."""
+    return select(
+        func.count().label("n"),
+        func.max(table.c.updated_at).label("last_modified"),
+    ).where(*where)
+
+
+async def load_version(db: AsyncSession, *selects: Select) -> ResourceVersion:
+    """Run every version_select in one statement and fold the results."""
+    stmt = selects[0] if len(selects) == 1 else union_all(*selects)
+    count, last_modified = 0, None
+    for row in (await db.execute(stmt)).all():
+        count += row.n
+        if row.last_modified is not None and (last_modified is None or row.last_modified > last_modified):
+            last_modified = row.last_modified
+    return ResourceVersion(count=count, last_modified=last_modified)
+
+
+def rows_version(rows: Iterable[Tuple[Any, Optional[datetime]]]) -> ResourceVersion:
+    """Version of rows already loaded, from their (id, updated_at) pairs."""
+    digest = hashlib.sha256()
+    count, last_modified = 0, None
+    for row_id, updated_at in rows:
+        count += 1
+        digest.update(f"{row_id}|{updated_at.isoformat() if updated_at else '-'};".encode("utf-8"))
+        if updated_at is not None and (last_modified is None or updated_at > last_modified):
+            last_modified = updated_at
+    return ResourceVersion(count=count, last_modified=last_modified, members=digest.hexdigest())
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison, as RFC 9110 requires for If-None-Match."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in if_none_match.split(","))
+
+
+def not_modified(request: Request, response: Response, version: ResourceVersion) -> Optional[Response]:
+    """
+    Return a 304 when the client's If-None-Match matches `version`;
+    otherwise set the validators on `response` (the 200) and return None.
+    """
+    scope = request.url.path
+    if request.url.query:
+        scope += "?" + request.url.query
+    headers = version.headers(scope)
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -6,27 +6,30 @@ Database initialization helper for the Military Leaders backend.
 Usage (from backend/):
     python -m app.core.init_db
 
-This will import all models (via Base) and create tables in the configured DB.
+This will apply every pending schema migration (see app.core.migrations)
+to the configured DB.
 """
 
 from __future__ import annotations
 
 from sqlalchemy.exc import SQLAlchemyError
 
-from app.core.db import engine, Base
+from app.core.db import get_stored_schema_version
+from app.core.migrations import upgrade
 
 
 def init_db() -> None:
     """
-    Create all tables defined on the SQLAlchemy Base metadata.
-    Safe to run multiple times; it will only create missing tables.
+    Apply pending migrations.
+    Safe to run multiple times; already-applied versions are skipped.
     """
     try:
-        Base.metadata.create_all(bind=engine)
-        print("[init_db] Database tables created or already present.")
+        applied = upgrade()
+        version = get_stored_schema_version()
+        print(f"[init_db] Applied {applied} migration(s); schema at version {version}.")
     except SQLAlchemyError as exc:
         # Basic error logging; you can replace with structured logging later.
-        print(f"[init_db] ERROR while creating tables: {exc}")
+        print(f"[init_db] ERROR while migrating: {exc}")
         raise
 
 
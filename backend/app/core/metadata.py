@@ -0,0 +1,337 @@
+# app/core/metadata.py
+
+"""
+Registry for per-branch metadata vocabularies.
+
+Files live at config/metadata/<module>/<branch>/<key>.json, e.g.
+training/army/training_types.json, and look like:
+
+    {"module": "training", "branch": "army", "key": "training_types",
+     "version": 1, "description": "...", "items": [...]}
+
+All files are parsed once (at startup or on first use) into an index keyed
+by (module, branch, key). Each file's item identifiers are kept in a
+frozenset, so validating a value such as TrainingEntry.branch_metadata_key
+or FlagAction.category is an in-memory set lookup.
+
+Validation on load:
+- the file must be a JSON object whose module/branch/key match its path
+- `version` must be a positive integer and may not go backwards on reload
+Invalid files are reported in `registry.errors`; on reload the last good
+copy stays in service.
+
+Changed files are hot-reloaded by a watcher thread (watchfiles, shipped
+with uvicorn[standard]; falls back to polling mtimes).
+
+Check every file (from backend/):
+    python -m app.core.metadata
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from app.core.settings import get_config_dir, get_settings
+
+logger = logging.getLogger("mlt.metadata")
+
+MetadataKey = Tuple[str, str, str]  # (module, branch, key)
+
+# Fields tried, in order, to identify a dict item
+_ITEM_ID_FIELDS = ("key", "code", "value", "name", "id")
+
+
+def branch_slug(branch: Any) -> str:
+    """
+    Branch enum / value -> metadata directory name ("AirForce" -> "air_force").
+    """
+    value = getattr(branch, "value", branch)
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", str(value)).lower()
+
+
+def _item_id(item: Any) -> Optional[str]:
+    if isinstance(item, str):
+        return item
+    if isinstance(item, dict):
+        for name in _ITEM_ID_FIELDS:
+            if isinstance(item.get(name), str):
+                return item[name]
+    return None
+
+
+@dataclass(frozen=True)
+class MetadataFile:
+    module: str
+    branch: str
+    key: str
+    version: int
+    description: str
+    items: Tuple[Any, ...]
+    item_ids: FrozenSet[str]
+    path: Path
+    mtime_ns: int
+
+
+class MetadataError(ValueError):
+    """A metadata file failed validation."""
+
+
+# ---------------------------------------------------------------------------
+# REGISTRY
+# ---------------------------------------------------------------------------
+
+class MetadataRegistry:
+    def __init__(self, root: Path) -> None:
+        # Absolute, so watcher event paths match the index
+        self.root = root.resolve()
+        self._index: Dict[MetadataKey, MetadataFile] = {}
+        self._by_path: Dict[Path, MetadataKey] = {}
+        # mtime of the last load attempt per path, accepted or not
+        self._seen: Dict[Path, int] = {}
+        self.errors: Dict[Path, str] = {}
+        self._lock = threading.Lock()
+
+    # -- loading ------------------------------------------------------------
+
+    def _parse(self, path: Path) -> MetadataFile:
+        try:
+            module, branch, _ = path.relative_to(self.root).parts
+        except ValueError:
+            raise MetadataError("not at <module>/<branch>/<key>.json")
+
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError as exc:
+            raise MetadataError(f"invalid JSON: {exc}") from exc
+        if not isinstance(data, dict):
+            raise MetadataError("expected a JSON object")
+
+        expected = {"module": module, "branch": branch, "key": path.stem}
+        for field, value in expected.items():
+            if data.get(field, value) != value:
+                raise MetadataError(f"{field}={data.get(field)!r} does not match path ({value!r})")
+
+        version = data.get("version")
+        if not isinstance(version, int) or isinstance(version, bool) or version < 1:
+            raise MetadataError(f"version must be a positive integer, got {version!r}")
+
+        items = data.get("items", [])
+        if not isinstance(items, list):
+            raise MetadataError("items must be a list")
+
+        return MetadataFile(
+            module=module,
+            branch=branch,
+            key=path.stem,
+            version=version,
+            description=data.get("description", ""),
+            items=tuple(items),
+            item_ids=frozenset(i for i in map(_item_id, items) if i is not None),
+            path=path,
+            mtime_ns=path.stat().st_mtime_ns,
+        )
+
+    def _load_path(self, path: Path) -> bool:
+        """
+        (Re)load one file. Returns True when the index changed.
+        """
+        if not path.exists():
+            with self._lock:
+                key = self._by_path.pop(path, None)
+                self._seen.pop(path, None)
+                self.errors.pop(path, None)
+                if key is not None:
+                    del self._index[key]
+            return key is not None
+
+        with self._lock:
+            self._seen[path] = path.stat().st_mtime_ns
+        try:
+            parsed = self._parse(path)
+        except (MetadataError, OSError) as exc:
+            with self._lock:
+                self.errors[path] = str(exc)
+            logger.warning("metadata: %s rejected: %s", path, exc)
+            return False
+
+        key = (parsed.module, parsed.branch, parsed.key)
+        with self._lock:
+            current = self._index.get(key)
+            if current is not None and parsed.version < current.version:
+                self.errors[path] = (
+                    f"version went backwards ({current.version} -> {parsed.version})"
+                )
+                logger.warning("metadata: %s rejected: %s", path, self.errors[path])
+                return False
+            if current is not None and parsed.version == current.version and parsed.items != current.items:
+                logger.warning("metadata: %s changed without a version bump", path)
+
+            self._index[key] = parsed
+            self._by_path[path] = key
+            self.errors.pop(path, None)
+        return True
+
+    def load_all(self) -> int:
+        """
+        Parse every file under the root. Returns the number indexed.
+        """
+        for path in sorted(self.root.glob("*/*/*.json")):
+            self._load_path(path)
+        logger.info("metadata: %d files indexed, %d rejected", len(self._index), len(self.errors))
+        return len(self._index)
+
+    def reload_changed(self, paths: Optional[Iterable[Path]] = None) -> List[Path]:
+        """
+        Reload `paths`, or every file whose mtime changed (plus new and
+        removed files) when none are given.
+        """
+        if paths is None:
+            with self._lock:
+                known = dict(self._seen)
+            on_disk = set(self.root.glob("*/*/*.json"))
+            paths = [
+                path
+                for path in on_disk | set(known)
+                if path not in on_disk or known.get(path) != path.stat().st_mtime_ns
+            ]
+
+        return [path for path in paths if path.suffix == ".json" and self._load_path(path)]
+
+    # -- lookups ------------------------------------------------------------
+
+    def get(self, module: str, branch: Any, key: str) -> Optional[MetadataFile]:
+        return self._index.get((module, branch_slug(branch), key))
+
+    def items(self, module: str, branch: Any, key: str) -> Tuple[Any, ...]:
+        found = self.get(module, branch, key)
+        return found.items if found is not None else ()
+
+    def is_valid(self, module: str, branch: Any, key: str, value: str) -> bool:
+        found = self.get(module, branch, key)
+        return found is not None and value in found.item_ids
+
+    def keys(self, module: str, branch: Any) -> List[str]:
+        slug = branch_slug(branch)
+        return sorted(k for m, b, k in self._index if m == module and b == slug)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+# ---------------------------------------------------------------------------
+# WATCHER
+# ---------------------------------------------------------------------------
+
+class MetadataWatcher:
+    """
+    Background thread that hot-reloads changed files.
+    """
+
+    def __init__(self, registry: MetadataRegistry, poll_seconds: float) -> None:
+        self.registry = registry
+        self.poll_seconds = poll_seconds
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metadata-watcher", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Signal the loop and wait for it (up to one poll): a daemon thread
+        still inside watchfiles at interpreter exit can crash the process.
+        """
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=self.poll_seconds + 1)
+
+    def _run(self) -> None:
+        try:
+            from watchfiles import watch
+        except ImportError:
+            watch = None
+
+        if watch is None:
+            while not self._stop.wait(self.poll_seconds):
+                self._reload(None)
+            return
+
+        # Empty batches arrive every poll_seconds; an mtime scan then catches
+        # anything written before the OS watch was in place
+        for changes in watch(
+            self.registry.root,
+            stop_event=self._stop,
+            yield_on_timeout=True,
+            rust_timeout=int(self.poll_seconds * 1000),
+        ):
+            self._reload([Path(path) for _, path in changes] if changes else None)
+
+    def _reload(self, paths: Optional[Iterable[Path]]) -> None:
+        try:
+            changed = self.registry.reload_changed(paths)
+        except Exception:
+            logger.exception("metadata: reload failed")
+            return
+        for path in changed:
+            logger.info("metadata: reloaded %s", path)
+
+
+# ---------------------------------------------------------------------------
+# PROCESS-WIDE REGISTRY
+# ---------------------------------------------------------------------------
+
+_registry: Optional[MetadataRegistry] = None
+_registry_lock = threading.Lock()
+_watcher: Optional[MetadataWatcher] = None
+
+
+def get_metadata_registry() -> MetadataRegistry:
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = MetadataRegistry(get_config_dir() / "metadata")
+            _registry.load_all()
+        return _registry
+
+
+def start_metadata_watcher() -> None:
+    global _watcher
+    seconds = get_settings().metadata_reload_interval_seconds
+    if not seconds or _watcher is not None:
+        return
+    _watcher = MetadataWatcher(get_metadata_registry(), seconds)
+    _watcher.start()
+
+
+def stop_metadata_watcher() -> None:
+    global _watcher
+    if _watcher is not None:
+        _watcher.stop()
+        _watcher = None
+
+
+def require_metadata_item(module: str, branch: Any, key: str, value: str) -> None:
+    """
+    Raise 422 unless `value` is an item of <module>/<branch>/<key>.json.
+    """
+    if not get_metadata_registry().is_valid(module, branch, key, value):
+        raise HTTPException(
+            status_code=422,
+            detail=f"{value!r} is not a valid {module} {key} for {branch_slug(branch)}",
+        )
+
+
+if __name__ == "__main__":
+    registry = get_metadata_registry()
+    print(f"[metadata] {len(registry)} files indexed from {registry.root}")
+    for path, error in sorted(registry.errors.items()):
+        print(f"[metadata] REJECTED {path}: {error}")
+    raise SystemExit(1 if registry.errors else 0)
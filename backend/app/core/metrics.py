@@ -0,0 +1,262 @@
+# app/core/metrics.py
+
+"""
+In-process metrics served at /metrics in the Prometheus text format.
+
+Exported series:
+
+    mlt_http_request_duration_seconds{method,route}   histogram
+    mlt_http_requests_in_flight                         gauge
+    mlt_http_responses_total{method,route,status}      counter
+    mlt_http_not_found_total                            counter
+    mlt_auth_failures_total{route}                      counter (401/403)
+    mlt_db_pool_checkout_wait_seconds{pool}             histogram
+    mlt_db_pool_size / _checked_out / _overflow{pool}   gauges
+    mlt_threadpool_tokens_{total,borrowed,waiting}      gauges (anyio)
+    mlt_password_hash_*                                 from passwords.hash_stats
+
+Request metrics are recorded by MetricsMiddleware on the event loop
+thread only, so they are plain dict / list increments with no locks.
+Pool checkout waits happen on worker threads and take a small lock, but
+only around the (already lock-protected) pool checkout itself.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+POOL_WAIT_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0,
+)
+
+# Label used when no route matched (404s on unknown paths)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> Iterable[str]:
+        sep = "," if labels else ""
+        cumulative = 0
+        for bound, n in zip(self.buckets, self.counts):
+            cumulative += n
+            yield f'{name}_bucket{{{labels}{sep}le="{bound}"}} {cumulative}'
+        yield f'{name}_bucket{{{labels}{sep}le="+Inf"}} {self.count}'
+        wrapped = f"{{{labels}}}" if labels else ""
+        yield f"{name}_sum{wrapped} {self.total}"
+        yield f"{name}_count{wrapped} {self.count}"
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+
+class HttpMetrics:
+    def __init__(self) -> None:
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.responses: Dict[Tuple[str, str, int], int] = {}
+        self.in_flight = 0
+        self.not_found = 0
+        self.auth_failures: Dict[str, int] = {}
+
+    def record(self, method: str, route: str, status: int, seconds: float) -> None:
+        key = (method, route)
+        histogram = self.latency.get(key)
+        if histogram is None:
+            histogram = self.latency[key] = Histogram(LATENCY_BUCKETS)
+        histogram.observe(seconds)
+
+        status_key = (method, route, status)
+        self.responses[status_key] = self.responses.get(status_key, 0) + 1
+        if status == 404:
+            self.not_found += 1
+        elif status in (401, 403):
+            self.auth_failures[route] = self.auth_failures.get(route, 0) + 1
+
+
+http_metrics = HttpMetrics()
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware timing every HTTP request by route template.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_metrics.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_metrics.in_flight -= 1
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            http_metrics.record(scope["method"], route, status, time.perf_counter() - started)
+
+
+# ---------------------------------------------------------------------------
+# DB POOL
+# ---------------------------------------------------------------------------
+
+_pool_waits: Dict[str, Histogram] = {}
+_pool_lock = threading.Lock()
+_pools: Dict[str, object] = {}
+
+
+def instrument_engine_pool(engine: Engine, name: str) -> None:
+    """
+    Time connection checkout on `engine`'s pool.
+
+    SQLAlchemy has no "before checkout" event, so the pool's _do_get (the
+    blocking wait for a free connection) is wrapped on this instance.
+    """
+    pool = engine.pool
+    _pools[name] = pool
+    if name in _pool_waits or not hasattr(pool, "_do_get"):
+        return
+
+    histogram = _pool_waits[name] = Histogram(POOL_WAIT_BUCKETS)
+    do_get = pool._do_get
+
+    def timed_do_get():
+        started = time.perf_counter()
+        try:
+            return do_get()
+        finally:
+            waited = time.perf_counter() - started
+            with _pool_lock:
+                histogram.observe(waited)
+
+    pool._do_get = timed_do_get
+
+
+# ---------------------------------------------------------------------------
+# EXPOSITION
+# ---------------------------------------------------------------------------
+
+def _metric(lines: List[str], name: str, kind: str, help_text: str) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _threadpool_lines(lines: List[str]) -> None:
+    try:
+        from anyio.to_thread import current_default_thread_limiter
+
+        limiter = current_default_thread_limiter()
+        stats = limiter.statistics()
+    except Exception:  # no running event loop (e.g. called from a script)
+        return
+    for suffix, value, help_text in (
+        ("total", limiter.total_tokens, "Threadpool size (sync endpoints and dependencies)"),
+        ("borrowed", limiter.borrowed_tokens, "Threadpool workers in use"),
+        ("waiting", stats.tasks_waiting, "Tasks waiting for a threadpool worker"),
+    ):
+        name = f"mlt_threadpool_tokens_{suffix}"
+        _metric(lines, name, "gauge", help_text)
+        lines.append(f"{name} {value}")
+
+
+def render_metrics() -> str:
+    lines: List[str] = []
+
+    # Copy first: request handlers on this thread cannot interleave, but
+    # keep the rendering independent of later mutation anyway
+    latency = dict(http_metrics.latency)
+    responses = dict(http_metrics.responses)
+
+    name = "mlt_http_request_duration_seconds"
+    _metric(lines, name, "histogram", "HTTP request latency by route template")
+    for (method, route), histogram in sorted(latency.items()):
+        lines.extend(histogram.render(name, f'method="{method}",route="{_label(route)}"'))
+
+    _metric(lines, "mlt_http_requests_in_flight", "gauge", "HTTP requests being served")
+    lines.append(f"mlt_http_requests_in_flight {http_metrics.in_flight}")
+
+    _metric(lines, "mlt_http_responses_total", "counter", "HTTP responses by route and status")
+    for (method, route, status), count in sorted(responses.items()):
+        lines.append(
+            f'mlt_http_responses_total{{method="{method}",route="{_label(route)}",status="{status}"}} {count}'
+        )
+
+    _metric(lines, "mlt_http_not_found_total", "counter", "404 responses")
+    lines.append(f"mlt_http_not_found_total {http_metrics.not_found}")
+
+    _metric(lines, "mlt_auth_failures_total", "counter", "401/403 responses by route")
+    for route, count in sorted(http_metrics.auth_failures.items()):
+        lines.append(f'mlt_auth_failures_total{{route="{_label(route)}"}} {count}')
+
+    name = "mlt_db_pool_checkout_wait_seconds"
+    _metric(lines, name, "histogram", "Time spent waiting for a pooled DB connection")
+    with _pool_lock:
+        for pool_name, histogram in sorted(_pool_waits.items()):
+            lines.extend(histogram.render(name, f'pool="{pool_name}"'))
+
+    for suffix, attr, help_text in (
+        ("size", "size", "Configured DB pool size"),
+        ("checked_out", "checkedout", "DB connections in use"),
+        ("overflow", "overflow", "DB connections opened beyond the pool size"),
+    ):
+        name = f"mlt_db_pool_{suffix}"
+        _metric(lines, name, "gauge", help_text)
+        for pool_name, pool in sorted(_pools.items()):
+            method = getattr(pool, attr, None)
+            if method is not None:
+                # QueuePool.overflow() counts up from -pool_size
+                lines.append(f'{name}{{pool="{pool_name}"}} {max(method(), 0)}')
+
+    _threadpool_lines(lines)
+
+    from app.core.passwords import hash_stats
+
+    hashes = hash_stats.snapshot()
+    for key, name, kind, help_text in (
+        ("calls", "calls_total", "counter", "bcrypt hash/verify calls"),
+        ("rejected", "rejected_total", "counter", "bcrypt calls rejected because the queue was full"),
+        ("in_flight", "in_flight", "gauge", "bcrypt calls queued or running"),
+        ("hash_seconds_total", "seconds_total", "counter", "Total bcrypt CPU seconds"),
+        ("wait_seconds_avg", "wait_seconds_avg", "gauge", "Average wait for a bcrypt worker"),
+    ):
+        name = f"mlt_password_hash_{name}"
+        _metric(lines, name, kind, help_text)
+        lines.append(f"{name} {hashes[key]}")
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,193 @@
+# app/core/migrations/__init__.py
+
+"""
+Versioned schema migrations.
+
+Replaces Base.metadata.create_all on boot. Each script in
+app/core/migrations/versions/ is named vNNNN_<slug>.py and defines:
+
+    VERSION = 3                    # strictly increasing, no gaps
+    DESCRIPTION = "..."
+    TRANSACTIONAL = True           # optional; False = autocommit connection
+    def upgrade(conn): ...
+
+The applied version lives in the mlt_schema_version table (app.core.db).
+Startup compares it to the newest script and, when they match, does
+nothing else: no model imports and no schema reflection.
+
+v0001_baseline is not a frozen schema: it runs create_all from the
+current models, so a fresh database starts at today's schema and later
+scripts must tolerate objects that already exist.
+
+Usage (from backend/):
+    python -m app.core.migrations current
+    python -m app.core.migrations history
+    python -m app.core.migrations upgrade [--to N]
+"""
+
+from __future__ import annotations
+
+import logging
+import pkgutil
+from dataclasses import dataclass
+from importlib import import_module
+from typing import Callable, List, Optional, Sequence
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.db import engine as default_engine
+from app.core.db import get_stored_schema_version, set_stored_schema_version
+
+from .backfill import run_backfill
+
+logger = logging.getLogger("mlt.migrations")
+
+# Arbitrary constant; serializes concurrent upgrades on PostgreSQL
+_PG_ADVISORY_LOCK_KEY = 7_301_955
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    description: str
+    upgrade: Callable[[Connection], None]
+    transactional: bool = True
+
+
+# ---------------------------------------------------------------------------
+# DISCOVERY
+# ---------------------------------------------------------------------------
+
+def discover_migrations() -> List[Migration]:
+    from . import versions
+
+    found: List[Migration] = []
+    for info in pkgutil.iter_modules(versions.__path__):
+        if not info.name.startswith("v"):
+            continue
+        module = import_module(f"{versions.__name__}.{info.name}")
+        found.append(
+            Migration(
+                version=module.VERSION,
+                name=info.name,
+                description=getattr(module, "DESCRIPTION", ""),
+                upgrade=module.upgrade,
+                transactional=getattr(module, "TRANSACTIONAL", True),
+            )
+        )
+
+    found.sort(key=lambda m: m.version)
+
+    expected = list(range(1, len(found) + 1))
+    actual = [m.version for m in found]
+    if actual != expected:
+        raise RuntimeError(f"Migration versions must be 1..N without gaps, got {actual}")
+
+    return found
+
+
+def head_version(migrations: Optional[Sequence[Migration]] = None) -> int:
+    migrations = discover_migrations() if migrations is None else migrations
+    return migrations[-1].version if migrations else 0
+
+
+# ---------------------------------------------------------------------------
+# HELPERS FOR MIGRATION SCRIPTS
+# ---------------------------------------------------------------------------
+
+def table_exists(conn: Connection, table_name: str) -> bool:
+    return inspect(conn).has_table(table_name)
+
+
+def create_index_online(
+    conn: Connection,
+    index_name: str,
+    table_name: str,
+    columns: Sequence[str],
+) -> bool:
+    """
+    Create an index without blocking writers where the backend allows it.
+
+    PostgreSQL uses CREATE INDEX CONCURRENTLY, which must run outside a
+    transaction: call this from a migration with TRANSACTIONAL = False.
+    SQLite builds the index in place (short write lock).
+
+    Returns False when the table does not exist yet; create_all will build
+    the index from the model definition when the table is created.
+    """
+    if not table_exists(conn, table_name):
+        return False
+
+    concurrently = "CONCURRENTLY " if conn.dialect.name == "postgresql" else ""
+    cols = ", ".join(columns)
+    conn.execute(
+        text(f"CREATE INDEX {concurrently}IF NOT EXISTS {index_name} ON {table_name} ({cols})")
+    )
+    return True
+
+
+# ---------------------------------------------------------------------------
+# RUNNER
+# ---------------------------------------------------------------------------
+
+def _apply(bind: Engine, migration: Migration) -> None:
+    if migration.transactional:
+        with bind.begin() as conn:
+            migration.upgrade(conn)
+    else:
+        with bind.connect() as conn:
+            migration.upgrade(conn.execution_options(isolation_level="AUTOCOMMIT"))
+
+    set_stored_schema_version(migration.version, bind=bind)
+
+
+def upgrade(bind: Optional[Engine] = None, target: Optional[int] = None) -> int:
+    """
+    Apply pending migrations in order, up to `target` (default: head).
+
+    Each migration commits on its own and the stored version advances after
+    each one, so an interrupted run resumes where it stopped.
+
+    Returns the number of migrations applied.
+    """
+    bind = bind or default_engine
+    current = get_stored_schema_version(bind) or 0
+
+    migrations = discover_migrations()
+    target = head_version(migrations) if target is None else target
+    if current >= target:
+        return 0
+
+    lock_conn = None
+    if bind.dialect.name == "postgresql":
+        lock_conn = bind.connect()
+        lock_conn.execute(text("SELECT pg_advisory_lock(:k)"), {"k": _PG_ADVISORY_LOCK_KEY})
+        # Another worker may have finished while we waited for the lock
+        current = get_stored_schema_version(bind) or 0
+
+    applied = 0
+    try:
+        for migration in migrations:
+            if current < migration.version <= target:
+                logger.info("applying %s: %s", migration.name, migration.description)
+                _apply(bind, migration)
+                applied += 1
+    finally:
+        if lock_conn is not None:
+            lock_conn.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": _PG_ADVISORY_LOCK_KEY})
+            lock_conn.close()
+
+    return applied
+
+
+__all__ = [
+    "Migration",
+    "create_index_online",
+    "discover_migrations",
+    "head_version",
+    "run_backfill",
+    "table_exists",
+    "upgrade",
+]
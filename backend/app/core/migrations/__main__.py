@@ -0,0 +1,38 @@
+# app/core/migrations/__main__.py
+
+from __future__ import annotations
+
+import argparse
+import logging
+
+from app.core.db import get_stored_schema_version
+
+from . import discover_migrations, head_version, upgrade
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.core.migrations")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("current", help="show applied and head versions")
+    sub.add_parser("history", help="list migration scripts")
+    up = sub.add_parser("upgrade", help="apply pending migrations")
+    up.add_argument("--to", type=int, default=None, help="target version (default: head)")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="[migrations] %(message)s")
+
+    if args.command == "current":
+        print(f"applied={get_stored_schema_version() or 0} head={head_version()}")
+    elif args.command == "history":
+        current = get_stored_schema_version() or 0
+        for m in discover_migrations():
+            mark = "x" if m.version <= current else " "
+            print(f"[{mark}] {m.version:04d} {m.name}: {m.description}")
+    elif args.command == "upgrade":
+        applied = upgrade(target=args.to)
+        print(f"[migrations] applied {applied}; now at {get_stored_schema_version() or 0}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# app/core/migrations/backfill.py
+
+"""
+Online, batched backfill runner.
+
+Large UPDATEs are split into primary-key ranges, each committed in its
+own short transaction, so API writers are never locked out for the length
+of the whole backfill. The runner walks the table by primary key (keyset),
+which stays O(batch) per step no matter how big the table is.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, Optional, Union
+
+from sqlalchemy import MetaData, Table, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql.elements import ColumnElement
+
+
+def run_backfill(
+    bind: Engine,
+    table: Union[Table, str],
+    values: Dict[str, Any],
+    *,
+    where: Optional[ColumnElement] = None,
+    batch_size: int = 1000,
+    pause_seconds: float = 0.0,
+) -> int:
+    """
+    UPDATE `table` SET `values` [WHERE `where`] in batches of `batch_size`.
+
+    `values` may hold SQL expressions (e.g. table.c.a + 1). Rows are
+    visited once, in primary-key order; `pause_seconds` between batches
+    gives foreground traffic room on busy databases.
+
+    Returns the number of rows updated.
+    """
+    if isinstance(table, str):
+        table = Table(table, MetaData(), autoload_with=bind)
+
+    pk_cols = list(table.primary_key.columns)
+    if len(pk_cols) != 1:
+        raise ValueError(f"run_backfill needs a single-column primary key on {table.name}")
+    pk = pk_cols[0]
+
+    last_key = None
+    total = 0
+
+    while True:
+        stmt = select(pk).order_by(pk).limit(batch_size)
+        if where is not None:
+            stmt = stmt.where(where)
+        if last_key is not None:
+            stmt = stmt.where(pk > last_key)
+
+        with bind.begin() as conn:
+            keys = conn.execute(stmt).scalars().all()
+            if not keys:
+                break
+            result = conn.execute(
+                update(table).where(pk.in_(keys)).values(**values)
+            )
+            total += result.rowcount or 0
+
+        last_key = keys[-1]
+        if len(keys) < batch_size:
+            break
+        if pause_seconds:
+            time.sleep(pause_seconds)
+
+    return total
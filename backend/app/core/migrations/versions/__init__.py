@@ -0,0 +1 @@
+# Migration scripts: vNNNN_<slug>.py (see app/core/migrations/__init__.py)
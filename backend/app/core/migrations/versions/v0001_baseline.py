@@ -0,0 +1,24 @@
+"""
+Baseline: create every table declared by the modules in MODULES.
+
+create_all is idempotent (checkfirst), so databases created before the
+migration subsystem existed are simply stamped at version 1.
+
+Not reproducible: this builds from whatever the models declare today,
+not from the schema as of version 1. A fresh database therefore already
+has columns and indexes that later scripts add, which is why those use
+IF NOT EXISTS / table_exists() guards. New migrations must do the same;
+do not rely on replaying 1..N to recreate an older schema.
+"""
+
+from sqlalchemy.engine import Connection
+
+VERSION = 1
+DESCRIPTION = "baseline schema from module models"
+
+
+def upgrade(conn: Connection) -> None:
+    from app.core.db import Base, import_all_models
+
+    import_all_models()
+    Base.metadata.create_all(bind=conn)
@@ -0,0 +1,24 @@
+"""
+Index hr_metric_entries.expiration_date for expiry/status-color scans.
+
+Runs outside a transaction so PostgreSQL can build it CONCURRENTLY.
+No-op while the hr_metrics table does not exist; the model declares the
+same index for when create_all builds the table.
+"""
+
+from sqlalchemy.engine import Connection
+
+from app.core.migrations import create_index_online
+
+VERSION = 2
+DESCRIPTION = "index hr_metric_entries.expiration_date"
+TRANSACTIONAL = False
+
+
+def upgrade(conn: Connection) -> None:
+    create_index_online(
+        conn,
+        "ix_hr_metric_entries_expiration_date",
+        "hr_metric_entries",
+        ["expiration_date"],
+    )
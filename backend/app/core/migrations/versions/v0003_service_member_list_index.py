@@ -0,0 +1,21 @@
+"""
+Composite (last_name, id) index backing keyset pagination of the soldier
+list. Built CONCURRENTLY on PostgreSQL.
+"""
+
+from sqlalchemy.engine import Connection
+
+from app.core.migrations import create_index_online
+
+VERSION = 3
+DESCRIPTION = "index service_members (last_name, id)"
+TRANSACTIONAL = False
+
+
+def upgrade(conn: Connection) -> None:
+    create_index_online(
+        conn,
+        "ix_service_members_last_name_id",
+        "service_members",
+        ["last_name", "id"],
+    )
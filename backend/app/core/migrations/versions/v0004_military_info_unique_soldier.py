@@ -0,0 +1,62 @@
+"""
+Make soldier_id unique on the 1:1 Military Info tables so bulk ingest can
+upsert with ON CONFLICT (soldier_id).
+
+Duplicate rows left by older create-or-replace code are removed first,
+keeping the most recently updated row per soldier (ties broken by
+created_at, then id) and logging how many were dropped. The plain
+soldier_id index is then replaced by a unique one under the same name
+(the name create_all uses for index=True, unique=True).
+"""
+
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.core.migrations import table_exists
+
+logger = logging.getLogger("mlt.migrations")
+
+VERSION = 4
+DESCRIPTION = "unique soldier_id on 1:1 military_info tables"
+
+ONE_TO_ONE_TABLES = (
+    "admin_data",
+    "service_data",
+    "security_driver_weapons_cbrn",
+    "medical_readiness_snapshot",
+    "personal_family_data",
+    "additional_soldier_data",
+)
+
+
+def upgrade(conn: Connection) -> None:
+    for table in ONE_TO_ONE_TABLES:
+        if not table_exists(conn, table):
+            continue
+
+        removed = conn.execute(
+            text(
+                f"""
+                DELETE FROM {table}
+                WHERE EXISTS (
+                    SELECT 1 FROM {table} AS keep
+                    WHERE keep.soldier_id = {table}.soldier_id
+                      AND (keep.updated_at > {table}.updated_at
+                           OR (keep.updated_at = {table}.updated_at
+                               AND (keep.created_at > {table}.created_at
+                                    OR (keep.created_at = {table}.created_at
+                                        AND keep.id > {table}.id))))
+                )
+                """
+            )
+        ).rowcount
+        if removed:
+            logger.warning(
+                "%s: removed %d duplicate row(s), kept the newest per soldier", table, removed
+            )
+        conn.execute(text(f"DROP INDEX IF EXISTS ix_{table}_soldier_id"))
+        conn.execute(
+            text(f"CREATE UNIQUE INDEX ix_{table}_soldier_id ON {table} (soldier_id)")
+        )
@@ -0,0 +1,21 @@
+"""
+Create the dashboard tables (dashboard_snapshots, dashboard_box_mirrors)
+now that the dashboard module is registered. Fresh databases already get
+them from the baseline; this covers databases created before.
+"""
+
+from sqlalchemy.engine import Connection
+
+VERSION = 5
+DESCRIPTION = "create dashboard snapshot + box mirror tables"
+
+
+def upgrade(conn: Connection) -> None:
+    from app.core.db import Base
+    from app.modules.dashboard.models import DashboardBoxMirror, DashboardSnapshot
+
+    Base.metadata.create_all(
+        conn,
+        tables=[DashboardSnapshot.__table__, DashboardBoxMirror.__table__],
+        checkfirst=True,
+    )
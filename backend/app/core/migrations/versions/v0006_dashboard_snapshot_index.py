@@ -0,0 +1,22 @@
+"""
+Composite (user_id, snapshot_timestamp) index for latest-snapshot lookups
+and daily compaction of dashboard_snapshots. Built CONCURRENTLY on
+PostgreSQL.
+"""
+
+from sqlalchemy.engine import Connection
+
+from app.core.migrations import create_index_online
+
+VERSION = 6
+DESCRIPTION = "index dashboard_snapshots (user_id, snapshot_timestamp)"
+TRANSACTIONAL = False
+
+
+def upgrade(conn: Connection) -> None:
+    create_index_online(
+        conn,
+        "ix_dashboard_snapshots_user_ts",
+        "dashboard_snapshots",
+        ["user_id", "snapshot_timestamp"],
+    )
@@ -0,0 +1,26 @@
+"""
+Register the attachments table (now served by the attachments module) and
+add attachments.sha256 for streaming uploads / download ETags. Databases
+created before get the table, or just the new column.
+"""
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+from app.core.migrations import table_exists
+
+VERSION = 7
+DESCRIPTION = "create attachments table / add attachments.sha256"
+
+
+def upgrade(conn: Connection) -> None:
+    from app.core.db import Base
+    from app.modules.attachments.models import Attachment
+
+    if not table_exists(conn, "attachments"):
+        Base.metadata.create_all(conn, tables=[Attachment.__table__])
+        return
+
+    columns = {column["name"] for column in inspect(conn).get_columns("attachments")}
+    if "sha256" not in columns:
+        conn.execute(text("ALTER TABLE attachments ADD COLUMN sha256 VARCHAR(64)"))
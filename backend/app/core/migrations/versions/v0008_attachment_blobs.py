@@ -0,0 +1,22 @@
+"""
+Content-addressed attachment store: create attachment_blobs (one row per
+stored file with its reference count) and index attachments.sha256.
+Existing flat-layout files keep working; `python -m
+app.modules.attachments.cli dedupe` moves them into the store.
+"""
+
+from sqlalchemy.engine import Connection
+
+from app.core.migrations import create_index_online
+
+VERSION = 8
+DESCRIPTION = "create attachment_blobs + index attachments.sha256"
+TRANSACTIONAL = False
+
+
+def upgrade(conn: Connection) -> None:
+    from app.core.db import Base
+    from app.modules.attachments.models import AttachmentBlob
+
+    Base.metadata.create_all(conn, tables=[AttachmentBlob.__table__], checkfirst=True)
+    create_index_online(conn, "ix_attachments_sha256", "attachments", ["sha256"])
@@ -0,0 +1,16 @@
+"""
+Create attachment_file_deletions, the queue of stored files that bulk
+deletes and the orphan sweeper hand to the background reaper.
+"""
+
+from sqlalchemy.engine import Connection
+
+VERSION = 9
+DESCRIPTION = "create attachment_file_deletions queue"
+
+
+def upgrade(conn: Connection) -> None:
+    from app.core.db import Base
+    from app.modules.attachments.models import AttachmentFileDeletion
+
+    Base.metadata.create_all(conn, tables=[AttachmentFileDeletion.__table__], checkfirst=True)
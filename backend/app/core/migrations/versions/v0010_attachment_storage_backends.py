@@ -0,0 +1,33 @@
+"""
+Pluggable attachment storage: record which backend holds each blob
+(attachment_blobs.storage_backend) and prefix every existing
+attachments.storage_path with its backend ("local:").
+"""
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+from app.core.migrations import table_exists
+
+VERSION = 10
+DESCRIPTION = "attachment storage backends (blob backend column, storage_path prefix)"
+
+
+def upgrade(conn: Connection) -> None:
+    if table_exists(conn, "attachment_blobs"):
+        columns = {column["name"] for column in inspect(conn).get_columns("attachment_blobs")}
+        if "storage_backend" not in columns:
+            conn.execute(
+                text(
+                    "ALTER TABLE attachment_blobs "
+                    "ADD COLUMN storage_backend VARCHAR(16) NOT NULL DEFAULT 'local'"
+                )
+            )
+
+    if table_exists(conn, "attachments"):
+        conn.execute(
+            text(
+                "UPDATE attachments SET storage_path = 'local:' || storage_path "
+                "WHERE storage_path NOT LIKE '%:%'"
+            )
+        )
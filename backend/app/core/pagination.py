@@ -0,0 +1,79 @@
+# app/core/pagination.py
+
+"""
+Keyset (cursor) pagination helpers.
+
+Cursors are opaque, URL-safe strings encoding the sort key of the last row
+on the previous page. Each page is one indexed range scan, so page N costs
+the same as page 1 regardless of table size (unlike OFFSET).
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from typing import Any, Iterable, List, Optional, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([str(v) if v is not None else None for v in values])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeDecodeError):
+        values = None
+
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+    return values
+
+
+def keyset_after(columns: Sequence[ColumnElement], values: Sequence[Any]) -> ColumnElement:
+    """
+    Build "(c1, c2, ...) > (v1, v2, ...)" as portable AND/OR SQL.
+    """
+    clauses = []
+    for i, col in enumerate(columns):
+        equal_prefix = [columns[j] == values[j] for j in range(i)]
+        clauses.append(and_(*equal_prefix, col > values[i]))
+    return or_(*clauses)
+
+
+def parse_fields(
+    fields: Optional[str],
+    allowed: Iterable[str],
+    always: Sequence[str] = ("id",),
+) -> Optional[List[str]]:
+    """
+    Parse a "fields=a,b,c" projection. Returns None when no projection was
+    requested; raises 400 for unknown field names.
+    """
+    if not fields:
+        return None
+
+    allowed = set(allowed)
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = sorted(set(requested) - allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}",
+        )
+
+    selected = list(always)
+    selected.extend(f for f in requested if f not in selected)
+    return selected
@@ -0,0 +1,184 @@
+# app/core/passwords.py
+
+"""
+Password hashing for the Military Leaders backend.
+
+bcrypt costs ~250 ms of CPU per call, so request handlers never run it
+inline. The async helpers below hand the work to a dedicated, bounded
+process pool:
+
+- at most `password_hash_workers` hashes run at once
+- at most `password_hash_max_queue` more may wait; beyond that callers get
+  a 503 with Retry-After instead of piling up behind the login rush
+- every call records queue wait and hash time in `hash_stats`
+
+This module avoids importing models or the DB layer so pool workers
+start quickly.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from app.core.settings import get_settings
+
+
+# -------------------------------------------------------------------------
+# CONTEXT + SYNC PRIMITIVES
+# -------------------------------------------------------------------------
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=get_settings().password_bcrypt_rounds,
+)
+
+
+def hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def verify_password(plain_password: str, password_hash: str) -> bool:
+    return pwd_context.verify(plain_password, password_hash)
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """
+    True when the stored hash was made with a different work factor (or a
+    deprecated scheme) than the one currently configured.
+    """
+    try:
+        if pwd_context.needs_update(password_hash):
+            return True
+        rounds = pwd_context.handler().from_string(password_hash).rounds
+    except (ValueError, TypeError):
+        return True
+    return rounds != get_settings().password_bcrypt_rounds
+
+
+def _timed(func: Callable[..., Any], *args: Any) -> Tuple[Any, float]:
+    # Runs inside the worker process; returns (result, cpu seconds)
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+# -------------------------------------------------------------------------
+# METRICS
+# -------------------------------------------------------------------------
+
+@dataclass
+class HashStats:
+    """Running totals for password hashing; read via snapshot()."""
+
+    calls: int = 0
+    rejected: int = 0
+    hash_seconds_total: float = 0.0
+    hash_seconds_max: float = 0.0
+    wait_seconds_total: float = 0.0
+    in_flight: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def try_acquire(self, limit: int) -> bool:
+        """Count one more call in flight, unless `limit` are already; then count a rejection."""
+        with self._lock:
+            if self.in_flight >= limit:
+                self.rejected += 1
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def record(self, hash_seconds: float, wait_seconds: float) -> None:
+        with self._lock:
+            self.calls += 1
+            self.hash_seconds_total += hash_seconds
+            self.hash_seconds_max = max(self.hash_seconds_max, hash_seconds)
+            self.wait_seconds_total += wait_seconds
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            calls = self.calls or 1
+            return {
+                "calls": self.calls,
+                "rejected": self.rejected,
+                "in_flight": self.in_flight,
+                "hash_seconds_total": self.hash_seconds_total,
+                "hash_seconds_avg": self.hash_seconds_total / calls,
+                "hash_seconds_max": self.hash_seconds_max,
+                "wait_seconds_avg": self.wait_seconds_total / calls,
+            }
+
+
+hash_stats = HashStats()
+
+
+# -------------------------------------------------------------------------
+# BOUNDED PROCESS POOL
+# -------------------------------------------------------------------------
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = get_settings().password_hash_workers or (os.cpu_count() or 1)
+            _executor = ProcessPoolExecutor(max_workers=workers)
+        return _executor
+
+
+def shutdown_password_pool() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+async def _run_in_pool(func: Callable[..., Any], *args: Any) -> Any:
+    settings = get_settings()
+    workers = settings.password_hash_workers or (os.cpu_count() or 1)
+    limit = workers + settings.password_hash_max_queue
+
+    if not hash_stats.try_acquire(limit):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service busy, retry shortly",
+            headers={"Retry-After": str(settings.password_hash_retry_after_seconds)},
+        )
+
+    submitted = time.perf_counter()
+    try:
+        loop = asyncio.get_running_loop()
+        result, hash_seconds = await loop.run_in_executor(
+            _get_executor(), _timed, func, *args
+        )
+    finally:
+        hash_stats.release()
+
+    total = time.perf_counter() - submitted
+    hash_stats.record(hash_seconds, max(total - hash_seconds, 0.0))
+    return result
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_in_pool(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, password_hash: str) -> bool:
+    return await _run_in_pool(verify_password, plain_password, password_hash)
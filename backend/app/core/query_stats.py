@@ -0,0 +1,191 @@
+# app/core/query_stats.py
+
+"""
+Per-request SQL statistics.
+
+QueryStatsMiddleware opens a RequestQueryStats for every HTTP request in a
+ContextVar; global SQLAlchemy event hooks (sync and async engines alike,
+including work run in the threadpool) add to it:
+
+- statements executed and total time spent in the DB driver
+- rows: ORM objects loaded plus rows changed by INSERT/UPDATE/DELETE
+  (DB-API cursors do not report SELECT row counts before they are fetched)
+- executions per statement shape (literals and IN-lists collapsed)
+
+Each response gets a Server-Timing header, e.g.
+
+    Server-Timing: db;dur=4.2;desc="13 queries, 40 rows", app;dur=11.8
+
+and one "mlt.sql" log record with the same numbers (also attached as
+`extra={"sql": {...}}` for JSON log formatters). When one request runs
+the same statement shape more than sql_n_plus_one_threshold times, a
+warning names the route and the statement - the usual N+1 signature.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Mapper
+
+from app.core.settings import get_settings
+
+logger = logging.getLogger("mlt.sql")
+
+# "IN (?, ?, ?)" / "IN (__[POSTCOMPILE_x])" / "VALUES (...), (...)" -> one shape
+_IN_LIST = re.compile(r"\(\s*(?:\?|%\(\w+\)s|\$\d+|:\w+)(?:\s*,\s*(?:\?|%\(\w+\)s|\$\d+|:\w+))+\s*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+_SPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    shape = _IN_LIST.sub("(?+)", statement)
+    shape = _NUMBER.sub("N", shape)
+    return _SPACE.sub(" ", shape).strip()
+
+
+@dataclass
+class RequestQueryStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+    rows: int = 0
+    shapes: Counter = field(default_factory=Counter)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "queries": self.queries,
+            "db_ms": round(self.db_seconds * 1000, 2),
+            "rows": self.rows,
+        }
+
+
+_current: ContextVar[Optional[RequestQueryStats]] = ContextVar("mlt_query_stats", default=None)
+
+
+def current_query_stats() -> Optional[RequestQueryStats]:
+    return _current.get()
+
+
+# ---------------------------------------------------------------------------
+# SQLALCHEMY HOOKS
+# ---------------------------------------------------------------------------
+
+_hooks_installed = False
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current.get() is not None:
+        conn.info.setdefault("mlt_query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current.get()
+    if stats is None:
+        return
+    started = conn.info.get("mlt_query_started")
+    if started:
+        stats.db_seconds += time.perf_counter() - started.pop()
+    stats.queries += 1
+    stats.shapes[statement_shape(statement)] += 1
+    if context is not None and (context.isinsert or context.isupdate or context.isdelete):
+        stats.rows += max(cursor.rowcount, 0)
+
+
+def _on_load(target, context) -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats.rows += 1
+
+
+def install_query_hooks() -> None:
+    """
+    Listen on every Engine (the async engine runs its sync_engine) and on
+    every mapped class. Idempotent.
+    """
+    global _hooks_installed
+    if _hooks_installed:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Mapper, "load", _on_load)
+    _hooks_installed = True
+
+
+# ---------------------------------------------------------------------------
+# MIDDLEWARE
+# ---------------------------------------------------------------------------
+
+class QueryStatsMiddleware:
+    """
+    Pure ASGI middleware (no extra task per request, streaming untouched).
+    """
+
+    def __init__(self, app, n_plus_one_threshold: Optional[int] = None) -> None:
+        self.app = app
+        self.threshold = (
+            n_plus_one_threshold
+            if n_plus_one_threshold is not None
+            else get_settings().sql_n_plus_one_threshold
+        )
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                timing = (
+                    f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries, {stats.rows} rows", '
+                    f"app;dur={(time.perf_counter() - started) * 1000:.1f}"
+                )
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"server-timing", timing.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            self._report(scope, status, stats, time.perf_counter() - started)
+
+    def _report(self, scope, status: int, stats: RequestQueryStats, seconds: float) -> None:
+        method, path = scope.get("method", ""), scope.get("path", "")
+        route = getattr(scope.get("route"), "path", path)
+        summary = {
+            "method": method,
+            "route": route,
+            "status": status,
+            "ms": round(seconds * 1000, 2),
+            **stats.as_dict(),
+        }
+        logger.info(
+            "sql %s %s status=%d queries=%d db_ms=%.1f rows=%d ms=%.1f",
+            method, route, status, stats.queries, stats.db_seconds * 1000, stats.rows, seconds * 1000,
+            extra={"sql": summary},
+        )
+
+        if not self.threshold:
+            return
+        for shape, count in stats.shapes.items():
+            if count > self.threshold:
+                logger.warning(
+                    "possible N+1: %s %s ran the same statement %d times: %s",
+                    method, route, count, shape[:300],
+                    extra={"sql": {**summary, "repeated": count, "statement": shape}},
+                )
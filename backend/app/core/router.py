@@ -1,20 +1,216 @@
 # app/core/router.py
 
-from fastapi import APIRouter
+"""
+Router registration for feature modules.
+
+Two startup modes (Settings.router_mode):
+
+- "eager": import every app.modules.<name>.api at startup (default)
+- "lazy":  register module prefixes from a generated manifest and import a
+           module's models + handlers on the first request under its prefix
+
+Generate / refresh the manifest (from backend/):
+    python -m app.core.router
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timezone
 from importlib import import_module
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter
+
 from app.modules import MODULES
 
+logger = logging.getLogger("mlt.startup")
+
+DEFAULT_MANIFEST_PATH = Path(__file__).resolve().with_name("router_manifest.json")
+
+# Paths that need every module's routes present (OpenAPI schema + docs UI)
+_ALL_MODULE_PATHS = ("/openapi.json", "/docs", "/redoc")
+
+
+def _import_router(name: str) -> Optional[APIRouter]:
+    """
+    Import app.modules.<name>.api and return its router (or None).
+    """
+    module_path = f"app.modules.{name}.api"
+    try:
+        api_module = import_module(module_path)
+    except ModuleNotFoundError:
+        return None
+
+    if not hasattr(api_module, "get_router"):
+        return None
+
+    return api_module.get_router()
+
+
+def _timed_import_router(app, name: str) -> Optional[APIRouter]:
+    started = time.perf_counter()
+    router = _import_router(name)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    app.state.module_import_ms[name] = round(elapsed_ms, 2)
+    logger.info("module %s imported in %.1f ms", name, elapsed_ms)
+    return router
+
+
+def _ensure_import_state(app) -> None:
+    if not hasattr(app.state, "module_import_ms"):
+        app.state.module_import_ms = {}
+
 
 def include_all_routers(app):
+    _ensure_import_state(app)
+
+    for name in MODULES:
+        router = _timed_import_router(app, name)
+        if router is None:
+            continue
+        app.include_router(router)
+
+
+# ---------------------------------------------------------------------------
+# MANIFEST
+# ---------------------------------------------------------------------------
+
+def build_router_manifest() -> Dict:
+    """
+    Import every module once and describe its routes.
+
+    A module whose router has no prefix cannot be matched lazily and is
+    marked eager.
+    """
+    modules: List[Dict] = []
+
     for name in MODULES:
-        module_path = f"app.modules.{name}.api"
-        try:
-            api_module = import_module(module_path)
-        except ModuleNotFoundError:
+        router = _import_router(name)
+        if router is None:
             continue
 
-        if not hasattr(api_module, "get_router"):
+        modules.append(
+            {
+                "name": name,
+                "prefix": router.prefix,
+                "eager": not router.prefix,
+                "routes": [
+                    {"path": route.path, "methods": sorted(getattr(route, "methods", []) or [])}
+                    for route in router.routes
+                ],
+            }
+        )
+
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "modules": modules,
+    }
+
+
+def write_router_manifest(path: Path = DEFAULT_MANIFEST_PATH) -> Dict:
+    manifest = build_router_manifest()
+    path.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    return manifest
+
+
+def load_router_manifest(path: Path = DEFAULT_MANIFEST_PATH) -> Optional[Dict]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+
+
+# ---------------------------------------------------------------------------
+# LAZY REGISTRATION
+# ---------------------------------------------------------------------------
+
+class LazyRouterMiddleware:
+    """
+    ASGI middleware that includes a module's router right before the first
+    request under its prefix is routed.
+
+    The import runs in a worker thread so the event loop keeps serving
+    other requests meanwhile; the asyncio.Lock makes concurrent first
+    requests for a module wait for one import instead of repeating it.
+    The router is included back on the loop, so the route list is never
+    changed while another request is being matched against it.
+    """
+
+    def __init__(self, app, fastapi_app, pending: Dict[str, str]) -> None:
+        self.app = app
+        self.fastapi_app = fastapi_app
+        # prefix -> module name, longest prefix first
+        self.pending = dict(sorted(pending.items(), key=lambda kv: -len(kv[0])))
+        self._lock = asyncio.Lock()
+
+    async def _load(self, names: List[str]) -> None:
+        async with self._lock:
+            for name in names:
+                prefix = next((p for p, n in self.pending.items() if n == name), None)
+                if prefix is None:
+                    continue  # another request loaded it first
+
+                router = await asyncio.to_thread(_timed_import_router, self.fastapi_app, name)
+                if router is not None:
+                    self.fastapi_app.include_router(router)
+                del self.pending[prefix]
+
+            # Routes changed; rebuild the OpenAPI schema on next request
+            self.fastapi_app.openapi_schema = None
+
+    def _modules_for_path(self, path: str) -> List[str]:
+        if path in _ALL_MODULE_PATHS:
+            return list(self.pending.values())
+
+        for prefix, name in self.pending.items():
+            if path == prefix or path.startswith(prefix + "/"):
+                return [name]
+        return []
+
+    async def __call__(self, scope, receive, send):
+        if self.pending and scope["type"] in ("http", "websocket"):
+            names = self._modules_for_path(scope["path"])
+            if names:
+                await self._load(names)
+
+        await self.app(scope, receive, send)
+
+
+def include_lazy_routers(app, manifest_path: Path = DEFAULT_MANIFEST_PATH) -> bool:
+    """
+    Register routers from the manifest, deferring imports until first use.
+
+    Returns False (and registers nothing) when no manifest exists, so the
+    caller can fall back to include_all_routers().
+    """
+    manifest = load_router_manifest(manifest_path)
+    if manifest is None:
+        logger.warning("router manifest %s not found; loading modules eagerly", manifest_path)
+        return False
+
+    _ensure_import_state(app)
+    pending: Dict[str, str] = {}
+
+    for entry in manifest["modules"]:
+        if entry["name"] not in MODULES:
+            continue
+        if entry.get("eager"):
+            router = _timed_import_router(app, entry["name"])
+            if router is not None:
+                app.include_router(router)
             continue
+        pending[entry["prefix"]] = entry["name"]
 
-        router = api_module.get_router()
-        app.include_router(router)
+    app.add_middleware(LazyRouterMiddleware, fastapi_app=app, pending=pending)
+    return True
+
+
+if __name__ == "__main__":
+    written = write_router_manifest()
+    print(f"[router] wrote {len(written['modules'])} modules to {DEFAULT_MANIFEST_PATH}")
@@ -1,34 +1,50 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional
 from uuid import UUID
 
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+# Password hashing lives in app.core.passwords; re-exported for callers
+from app.core.passwords import (
+    hash_password,
+    hash_password_async,
+    needs_rehash,
+    pwd_context,
+    verify_password,
+    verify_password_async,
+)
 from app.core.settings import get_settings
-from app.core.db import get_db
+from app.core.db import get_async_db
 from app.modules.auth.models import UserAccount
 
-# -------------------------------------------------------------------------
-# PASSWORD HASHING
-# -------------------------------------------------------------------------
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
-
-
-def verify_password(plain_password: str, password_hash: str) -> bool:
-    return pwd_context.verify(plain_password, password_hash)
-
+__all__ = [
+    "CurrentUser",
+    "cache_user",
+    "clear_user_cache",
+    "create_access_token",
+    "create_refresh_token",
+    "decode_token",
+    "fetch_current_user",
+    "get_cached_user",
+    "get_current_user",
+    "hash_password",
+    "hash_password_async",
+    "invalidate_user",
+    "needs_rehash",
+    "oauth2_scheme",
+    "pwd_context",
+    "verify_password",
+    "verify_password_async",
+]
 
 # -------------------------------------------------------------------------
 # JWT HELPERS
@@ -78,6 +94,81 @@ def decode_token(token: str) -> Dict[str, Any]:
     return jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
 
 
+# -------------------------------------------------------------------------
+# AUTHENTICATED USER CACHE
+#
+# Maps a raw access token to the CurrentUser it resolved to, so repeat
+# requests skip both the JWT signature check and the user SELECT. Entries
+# are plain frozen dataclasses (never ORM instances, which would be shared
+# across requests and sessions) and live at most
+# auth_user_cache_ttl_seconds, bounding how long another worker can serve a
+# stale role or a deleted account. They never outlive the token's "exp".
+# -------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """The authenticated account as seen by request handlers."""
+
+    id: UUID
+    username: str
+    email: str
+    role: str
+    is_deleted: bool
+
+
+_CURRENT_USER_COLUMNS = (
+    UserAccount.id,
+    UserAccount.username,
+    UserAccount.email,
+    UserAccount.role,
+    UserAccount.is_deleted,
+)
+
+_user_cache: TTLCache[CurrentUser] = TTLCache(
+    max_entries=get_settings().auth_user_cache_max_entries,
+    default_ttl=get_settings().auth_user_cache_ttl_seconds,
+)
+
+
+async def fetch_current_user(db: AsyncSession, user_id: UUID) -> Optional[CurrentUser]:
+    row = (await db.execute(select(*_CURRENT_USER_COLUMNS).where(UserAccount.id == user_id))).first()
+    return CurrentUser(**row._mapping) if row is not None else None
+
+
+def get_cached_user(token: str) -> Optional[CurrentUser]:
+    return _user_cache.get(token)
+
+
+def cache_user(token: str, payload: Dict[str, Any], user: CurrentUser) -> None:
+    exp = payload.get("exp")
+    if exp is None:
+        return
+    remaining = exp - datetime.now(timezone.utc).timestamp()
+    _user_cache.set(token, user, ttl=remaining)
+
+
+def invalidate_user(user_id: UUID) -> int:
+    """
+    Drop every cached token for a user in this process.
+
+    Called automatically on ORM updates/deletes of UserAccount (role change,
+    soft delete, password change). Call it by hand after bulk UPDATE/DELETE
+    statements, which bypass ORM events. Other workers catch up within
+    auth_user_cache_ttl_seconds.
+    """
+    return _user_cache.remove_where(lambda _token, user: user.id == user_id)
+
+
+def clear_user_cache() -> None:
+    _user_cache.clear()
+
+
+@event.listens_for(UserAccount, "after_update")
+@event.listens_for(UserAccount, "after_delete")
+def _invalidate_cached_user(mapper, connection, target: UserAccount) -> None:
+    invalidate_user(target.id)
+
+
 # -------------------------------------------------------------------------
 # AUTH DEPENDENCY: get_current_user
 # -------------------------------------------------------------------------
@@ -85,12 +176,16 @@ def decode_token(token: str) -> Dict[str, Any]:
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
-def get_current_user(
+async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> UserAccount:
+    db: AsyncSession = Depends(get_async_db),
+) -> CurrentUser:
     unauthorized = HTTPException(status_code=401, detail="Invalid or expired token")
 
+    cached = get_cached_user(token)
+    if cached is not None:
+        return cached
+
     try:
         payload = decode_token(token)
     except JWTError:
@@ -114,8 +209,9 @@ def get_current_user(
     # -----------------------
     # FETCH USER
     # -----------------------
-    user = db.query(UserAccount).filter(UserAccount.id == user_id).first()
-    if not user:
+    user = await fetch_current_user(db, user_id)
+    if user is None:
         raise unauthorized
 
+    cache_user(token, payload, user)
     return user
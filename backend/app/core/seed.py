@@ -0,0 +1,932 @@
+# app/core/seed.py
+
+"""
+Synthetic dataset generator for load testing and benchmarks.
+
+Fills the soldier roster and every per-soldier tracker with plausible data
+at unit scale:
+
+    company     150 soldiers
+    battalion   800
+    brigade     5,000
+    division    50,000   (about 1.6M rows with the currently loadable modules)
+
+Usage (from backend/, against a scratch database):
+    python -m app.core.seed --scale brigade --password ... [--seed 7] [--truncate]
+    python -m app.core.seed --soldiers 12000 --only hr_metric_entries --password ...
+
+Rows are built column-at-a-time (one rng.choices / list comprehension per
+column for a whole batch), bound column-at-a-time and loaded with one
+DB-API executemany per SEED_BATCH_ROWS rows inside a single transaction
+per table, so neither the ORM nor per-row parameter handling is involved.
+The same --seed always produces the same data, ids included.
+
+Each table is described by a SeedSpec: its parent table, how many rows per
+parent, and generators for the columns that need realistic values. Any
+other column is filled from its type (enum members, dates in the last few
+years, short strings within the column length); columns with a default are
+left to it. Models are imported lazily - a module that cannot be imported
+is skipped with a warning, as in app.core.status_colors.
+
+Modules outside app.modules.MODULES have no migration, so their tables are
+created here if missing. Status colors and dashboard mirrors are derived
+data and are recomputed after the load.
+
+One UnitAdmin account is created per company (seed-co0001, ...) owning
+that company's soldiers, plus seed-admin; all share --password, which has
+no default because seed-admin is an OwnerDeveloperAdmin.
+
+--truncate only runs on a scratch database: it refuses when any soldier
+is owned by an account other than the seed-* ones.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import math
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, time as dt_time, timedelta
+from importlib import import_module
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Boolean, Date, DateTime, Enum as SAEnum, Integer, String, Table, Time, Uuid, func, inspect, select
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.db import engine as default_engine
+from app.core.models_base import Branch, Component, Role
+
+logger = logging.getLogger("mlt.seed")
+
+SCALES: Dict[str, int] = {
+    "company": 150,
+    "battalion": 800,
+    "brigade": 5_000,
+    "division": 50_000,
+}
+
+SEED_BATCH_ROWS = 10_000
+COMPANY_SIZE = 150
+
+ColumnGen = Callable[["Batch", int], List[Any]]
+
+
+# ---------------------------------------------------------------------------
+# VALUE POOLS
+# ---------------------------------------------------------------------------
+
+FIRST_NAMES = (
+    "James", "Michael", "Robert", "John", "David", "William", "Richard", "Joseph", "Thomas", "Christopher",
+    "Daniel", "Matthew", "Anthony", "Mark", "Andrew", "Joshua", "Kevin", "Brian", "Tyler", "Jacob",
+    "Nicholas", "Eric", "Jonathan", "Justin", "Brandon", "Samuel", "Benjamin", "Aaron", "Adam", "Nathan",
+    "Jose", "Luis", "Carlos", "Juan", "Miguel", "Angel", "Marcus", "Andre", "Darius", "Malik",
+    "Mary", "Jennifer", "Jessica", "Sarah", "Ashley", "Emily", "Amanda", "Melissa", "Stephanie", "Nicole",
+    "Elizabeth", "Megan", "Rachel", "Lauren", "Maria", "Ana", "Gabriela", "Keisha", "Aaliyah", "Mei",
+)
+LAST_NAMES = (
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+    "Lee", "Perez", "Thompson", "White", "Harris", "Sanchez", "Clark", "Ramirez", "Lewis", "Robinson",
+    "Walker", "Young", "Allen", "King", "Wright", "Scott", "Torres", "Nguyen", "Hill", "Flores",
+    "Green", "Adams", "Nelson", "Baker", "Hall", "Rivera", "Campbell", "Mitchell", "Carter", "Roberts",
+    "Gomez", "Phillips", "Evans", "Turner", "Diaz", "Parker", "Cruz", "Edwards", "Collins", "Reyes",
+    "Stewart", "Morris", "Morales", "Murphy", "Cook", "Rogers", "Gutierrez", "Ortiz", "Morgan", "Cooper",
+    "Peterson", "Bailey", "Reed", "Kelly", "Howard", "Ramos", "Kim", "Cox", "Ward", "Richardson",
+)
+
+# (rank, grade, weight) - roughly the shape of an Army BCT
+RANKS: Tuple[Tuple[str, str, float], ...] = (
+    ("PVT", "E1", 3), ("PV2", "E2", 7), ("PFC", "E3", 15), ("SPC", "E4", 26),
+    ("SGT", "E5", 14), ("SSG", "E6", 10), ("SFC", "E7", 6), ("MSG", "E8", 1), ("1SG", "E8", 0.7),
+    ("SGM", "E9", 0.3), ("CSM", "E9", 0.2),
+    ("WO1", "W1", 0.6), ("CW2", "W2", 0.8), ("CW3", "W3", 0.4),
+    ("2LT", "O1", 2), ("1LT", "O2", 2.5), ("CPT", "O3", 3), ("MAJ", "O4", 1.4), ("LTC", "O5", 0.5),
+    ("COL", "O6", 0.1),
+)
+MOS = (
+    "11B Infantryman", "11C Indirect Fire Infantryman", "19D Cavalry Scout", "19K Armor Crewman",
+    "13B Cannon Crewmember", "12B Combat Engineer", "25U Signal Support Systems Specialist",
+    "68W Combat Medic", "88M Motor Transport Operator", "91B Wheeled Vehicle Mechanic",
+    "92Y Unit Supply Specialist", "92G Culinary Specialist", "42A Human Resources Specialist",
+    "35F Intelligence Analyst", "31B Military Police",
+)
+DUTY_TITLES = (
+    "Rifleman", "Team Leader", "Squad Leader", "Platoon Sergeant", "Platoon Leader", "Gunner", "Driver",
+    "Radio Operator", "Supply Sergeant", "Training NCO", "Operations NCO", "Executive Officer",
+    "Company Commander", "First Sergeant", "Medic", "Mechanic", "HR Specialist",
+)
+INSTALLATIONS = (
+    "Fort Bragg, NC", "Fort Campbell, KY", "Fort Hood, TX", "Fort Stewart, GA", "Fort Carson, CO",
+    "Fort Drum, NY", "Fort Riley, KS", "Fort Bliss, TX", "JB Lewis-McChord, WA", "Schofield Barracks, HI",
+)
+COUNTRIES = ("Kuwait", "Iraq", "Afghanistan", "Poland", "Germany", "South Korea", "Jordan", "Syria", "Qatar")
+LANGUAGES = ("Spanish", "Arabic", "French", "German", "Korean", "Russian", "Tagalog", "Pashto", "Chinese")
+NOTES = (
+    None, None, None, "Verified by S1.", "Follow up at next counseling.", "Copy uploaded to iPERMS.",
+    "Rescheduled due to field exercise.", "Pending supporting documents.", "Completed during NTC rotation.",
+)
+
+
+# ---------------------------------------------------------------------------
+# ROSTER
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Roster:
+    """
+    Per-soldier attributes shared by every table that mirrors them
+    (admin_data repeats names, rank and unit; flag titles use them too).
+    Everything is a list indexed by soldier position.
+    """
+
+    ids: List[uuid.UUID]
+    first_name: List[str]
+    last_name: List[str]
+    middle_initial: List[str]
+    rank: List[str]
+    grade: List[str]
+    component: List[Component]
+    unit: List[str]
+    uic: List[str]
+    owner_user_id: List[uuid.UUID]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def _uuids(rng: random.Random, n: int) -> List[uuid.UUID]:
+    return [uuid.UUID(int=rng.getrandbits(128), version=4) for _ in range(n)]
+
+
+def _unit_name(company: int) -> Tuple[str, str]:
+    battalion, letter = divmod(company, 5)
+    brigade, battalion_no = divmod(battalion, 6)
+    name = f"{'ABCDE'[letter]} Co, {battalion_no + 1}-{brigade * 6 + battalion_no + 1} IN, {brigade + 1} BDE"
+    return name, f"W{company:04X}{'ABCDE'[letter]}"
+
+
+def build_roster(rng: random.Random, soldiers: int, company_owner_ids: Sequence[uuid.UUID]) -> Roster:
+    ranks = rng.choices(RANKS, weights=[weight for _, _, weight in RANKS], k=soldiers)
+    units = [_unit_name(company) for company in range(len(company_owner_ids))]
+    companies = [i // COMPANY_SIZE for i in range(soldiers)]
+    return Roster(
+        ids=_uuids(rng, soldiers),
+        first_name=rng.choices(FIRST_NAMES, k=soldiers),
+        last_name=rng.choices(LAST_NAMES, k=soldiers),
+        middle_initial=rng.choices("ABCDEFGHJKLMNPRSTW", k=soldiers),
+        rank=[rank for rank, _, _ in ranks],
+        grade=[grade for _, grade, _ in ranks],
+        component=rng.choices(
+            [Component.Active, Component.Reserve, Component.NationalGuard], weights=[80, 10, 10], k=soldiers
+        ),
+        unit=[units[c][0] for c in companies],
+        uic=[units[c][1] for c in companies],
+        owner_user_id=[company_owner_ids[c] for c in companies],
+    )
+
+
+# ---------------------------------------------------------------------------
+# BATCH CONTEXT + COLUMN GENERATORS
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Batch:
+    """
+    One batch of rows being built. `parents` holds the parent row position
+    for each row (a soldier position when the parent is service_members),
+    `sequence` its ordinal among its parent's rows, and `values` the
+    columns generated so far, so later generators can derive from them.
+    """
+
+    rng: random.Random
+    today: date
+    roster: Roster
+    ids: Dict[str, List[uuid.UUID]]
+    parents: List[int]
+    sequence: List[int]
+    values: Dict[str, List[Any]] = field(default_factory=dict)
+
+    def soldier(self, attr: str) -> List[Any]:
+        column = getattr(self.roster, attr)
+        return [column[p] for p in self.parents]
+
+
+def pick(values: Sequence[Any], weights: Optional[Sequence[float]] = None) -> ColumnGen:
+    return lambda b, n: b.rng.choices(values, weights=weights, k=n)
+
+
+def chance(p: float) -> ColumnGen:
+    return lambda b, n: [r < p for r in (b.rng.random() for _ in range(n))]
+
+
+def ints(low: int, high: int) -> ColumnGen:
+    return lambda b, n: [b.rng.randint(low, high) for _ in range(n)]
+
+
+def days_ago(newest: int, oldest: int) -> ColumnGen:
+    """Dates between `oldest` and `newest` days before today (negative = future)."""
+
+    def gen(b: Batch, n: int) -> List[date]:
+        base, span, rnd = b.today.toordinal() - oldest, oldest - newest, b.rng.random
+        return [date.fromordinal(base + int(rnd() * span)) for _ in range(n)]
+
+    return gen
+
+
+def after(column: str, low: int, high: int) -> ColumnGen:
+    """`column` (a date) plus low..high days; None stays None."""
+
+    def gen(b: Batch, n: int) -> List[Optional[date]]:
+        span, rnd = high - low, b.rng.random
+        return [
+            None if d is None else d + timedelta(days=low + int(rnd() * span))
+            for d in b.values[column]
+        ]
+
+    return gen
+
+
+def nullable(gen: ColumnGen, p_null: float) -> ColumnGen:
+    def wrapped(b: Batch, n: int) -> List[Any]:
+        values = gen(b, n)
+        rnd = b.rng.random
+        return [None if rnd() < p_null else v for v in values]
+
+    return wrapped
+
+
+def from_soldier(attr: str) -> ColumnGen:
+    return lambda b, n: b.soldier(attr)
+
+
+def cycle(table: str) -> ColumnGen:
+    """Parent's k-th row gets the k-th id of `table` (one row per reference row)."""
+
+    def gen(b: Batch, n: int) -> List[uuid.UUID]:
+        ids = b.ids[table]
+        return [ids[s % len(ids)] for s in b.sequence]
+
+    return gen
+
+
+def sequence_days_ago() -> ColumnGen:
+    """One row per day going back from today (daily status)."""
+    return lambda b, n: [b.today - timedelta(days=s) for s in b.sequence]
+
+
+def fmt(template: str, **gens: ColumnGen) -> ColumnGen:
+    def gen(b: Batch, n: int) -> List[str]:
+        columns = {name: g(b, n) for name, g in gens.items()}
+        keys = list(columns)
+        return [template.format(**dict(zip(keys, row))) for row in zip(*columns.values())]
+
+    return gen
+
+
+def _typed_default(b: Batch, column, n: int) -> Optional[List[Any]]:
+    """Fallback for columns no spec mentions: a plausible value from the type."""
+    col_type = column.type
+    if isinstance(col_type, SAEnum):
+        members = list(col_type.enum_class) if col_type.enum_class else list(col_type.enums)
+        return b.rng.choices(members, k=n)
+    if isinstance(col_type, Boolean):
+        return chance(0.5)(b, n)
+    if isinstance(col_type, Integer):
+        return ints(0, 100)(b, n)
+    if isinstance(col_type, DateTime):
+        return [datetime.combine(d, dt_time(9)) for d in days_ago(-30, 1000)(b, n)]
+    if isinstance(col_type, Date):
+        return days_ago(-365, 1500)(b, n)
+    if isinstance(col_type, Time):
+        return [dt_time(h) for h in ints(7, 17)(b, n)]
+    if isinstance(col_type, String):
+        limit = col_type.length or 200
+        return [None if v is None else v[:limit] for v in pick(NOTES)(b, n)]
+    return None
+
+
+# ---------------------------------------------------------------------------
+# SPECS
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class SeedSpec:
+    table: str
+    model: str                          # "app.modules.<name>.models:<Class>"
+    per_parent: float = 1.0             # average rows per parent row
+    exact: bool = False                 # exactly per_parent rows (else 0..2x)
+    parent: str = "service_members"
+    parent_column: str = "soldier_id"
+    columns: Dict[str, ColumnGen] = field(default_factory=dict)
+    fixed_rows: Tuple[Dict[str, Any], ...] = ()     # reference tables
+
+
+_soldier_name = fmt("{rank} {last}", rank=from_soldier("rank"), last=from_soldier("last_name"))
+
+SPECS: Tuple[SeedSpec, ...] = (
+    # --- reference tables --------------------------------------------------
+    SeedSpec(
+        "hr_metric_definitions", "app.modules.hr_metrics.models:HRMetricDefinition", parent="",
+        fixed_rows=tuple(
+            {"branch": Branch.Army, "kind": kind, "key": key, "display_name": name,
+             "default_expiration_days": days, "green_threshold_days": green, "amber_threshold_days": amber,
+             "is_enabled": True, "is_required": True, "notifications_enabled": True}
+            for kind, key, name, days, green, amber in (
+                ("PHA", "pha", "Periodic Health Assessment", 365, 60, 30),
+                ("SGLI", "sgli", "SGLI Election", 365, 60, 30),
+                ("EMERGENCY_DATA", "dd93", "DD 93 Record of Emergency Data", 365, 60, 30),
+                ("RECORDS_REVIEW", "records_review", "Records Review", 365, 90, 30),
+            )
+        ),
+    ),
+    SeedSpec(
+        "duty_status_categories", "app.modules.duty_roster.models:StatusCategory", parent="",
+        fixed_rows=tuple(
+            {"name": name, "is_default": name == "Present"}
+            for name in ("Present", "Leave", "Pass", "TDY", "School", "Sick Call", "Appointment", "Field", "AWOL")
+        ),
+    ),
+    # --- military_info sections (one row per soldier) ------------------------
+    SeedSpec("admin_data", "app.modules.military_info.models:AdminData", columns={
+        "last_name": from_soldier("last_name"),
+        "first_name": from_soldier("first_name"),
+        "middle_initial": from_soldier("middle_initial"),
+        "rank": from_soldier("rank"),
+        "grade": from_soldier("grade"),
+        "component": from_soldier("component"),
+        "branch": lambda b, n: [Branch.Army] * n,
+        "unit": from_soldier("unit"),
+        "uic_ruc_pas_opfac": from_soldier("uic"),
+        "dodid": lambda b, n: [str(b.rng.randrange(10 ** 9, 10 ** 10)) for _ in range(n)],
+        "ssn_last4": lambda b, n: [f"{b.rng.randrange(10000):04d}" for _ in range(n)],
+        "dob": days_ago(18 * 365, 45 * 365),
+        "gender": pick(("Male", "Female"), (84, 16)),
+        "duty_title": pick(DUTY_TITLES),
+        "duty_location": pick(INSTALLATIONS),
+        "security_clearance": pick((None, "Secret", "Top Secret"), (40, 52, 8)),
+        "clearance_date": days_ago(0, 3000),
+        "marital_status": pick(("Single", "Married", "Divorced"), (50, 44, 6)),
+        "address": fmt("{n} Main St, {post}", n=ints(1, 9999), post=pick(INSTALLATIONS)),
+        "phone": lambda b, n: [f"555-{b.rng.randrange(10000):04d}" for _ in range(n)],
+        "email_mil": fmt("{first}.{last}.mil{i}@army.mil",
+                         first=from_soldier("first_name"), last=from_soldier("last_name"), i=ints(1, 99999)),
+        "email_civ": nullable(fmt("{last}{i}@example.com", last=from_soldier("last_name"), i=ints(1, 9999)), 0.3),
+        "pmos_afsc_rate": pick(MOS),
+    }),
+    SeedSpec("service_data", "app.modules.military_info.models:ServiceData", columns={
+        "basd": days_ago(120, 20 * 365),
+        "pebd": after("basd", 0, 30),
+        "diems": after("basd", 0, 1),
+        "ets_eas_eaos_dos": days_ago(-4 * 365, -30),
+        "tis_years": ints(0, 20),
+        "tig_years": ints(0, 6),
+        "pay_grade": from_soldier("grade"),
+        "promotion_eligibility": pick(("Eligible", "Not eligible", "Promotable", None)),
+        "flag_status": pick((None, "Flagged"), (95, 5)),
+        "component_status": pick(("Active", "AGR", "TPU", "M-Day"), (80, 5, 8, 7)),
+    }),
+    SeedSpec("security_driver_weapons_cbrn", "app.modules.military_info.models:SecurityDriverWeaponsCBRN", columns={
+        "clearance_type": pick((None, "Secret", "Top Secret"), (40, 52, 8)),
+        "investigation_date": days_ago(0, 3000),
+        "clearance_expiration": after("investigation_date", 5 * 365, 10 * 365),
+        "civilian_license_exp": days_ago(-5 * 365, 60),
+        "military_license": pick((None, "OF-346 HMMWV", "OF-346 LMTV", "OF-346 JLTV")),
+        "nvg_qualification": chance(0.4),
+    }),
+    SeedSpec("medical_readiness_snapshot", "app.modules.military_info.models:MedicalReadinessSnapshot", columns={
+        "pha_date": days_ago(0, 450),
+        "dental_class": pick(("1", "2", "3", "4"), (55, 38, 5, 2)),
+        "mrc": pick(("1", "2", "3A", "3B", "4"), (80, 8, 5, 5, 2)),
+        "immunization_summary": pick(("Current", "Influenza due", "Hep B series incomplete")),
+        "hiv_date": days_ago(0, 800),
+        "vision_date": days_ago(0, 900),
+        "hearing_date": days_ago(0, 500),
+        "profile_type": pick((None, "Temporary", "Permanent"), (85, 12, 3)),
+    }),
+    SeedSpec("personal_family_data", "app.modules.military_info.models:PersonalFamilyData", columns={
+        "marital_status": pick(("Single", "Married", "Divorced"), (50, 44, 6)),
+        "efmp_status": pick((None, "Enrolled"), (93, 7)),
+        "family_care_plan": pick((None, "Approved", "Required - pending"), (80, 17, 3)),
+        "bah_bas_status": pick(("BAH with dependents", "BAH without dependents", "Barracks")),
+        "home_of_record": pick(("Texas", "California", "Florida", "Georgia", "Ohio", "New York", "Puerto Rico")),
+        "spouse_military": chance(0.05),
+    }),
+    SeedSpec("additional_soldier_data", "app.modules.military_info.models:AdditionalSoldierData", columns={
+        "gt_score": ints(90, 140),
+    }),
+    # --- military_info sections (many rows per soldier) ----------------------
+    SeedSpec("military_education", "app.modules.military_info.models:MilitaryEducation", per_parent=3, columns={
+        "course_name": pick(("BLC", "ALC", "SLC", "Airborne", "Air Assault", "Combat Lifesaver",
+                             "BOLC", "CCC", "Master Driver", "Unit Armorer")),
+        "start_date": days_ago(30, 15 * 365),
+        "end_date": after("start_date", 10, 60),
+        "resident": chance(0.8),
+    }),
+    SeedSpec("civilian_education", "app.modules.military_info.models:CivilianEducation", columns={
+        "highest_degree": pick(("High School", "Some College", "Associate", "Bachelor", "Master"), (50, 25, 10, 12, 3)),
+        "major": pick((None, "Business", "Criminal Justice", "Nursing", "Engineering", "History")),
+        "school_name": pick(("Central Texas College", "University of Maryland Global", "APUS", "Local High School")),
+        "completion_date": days_ago(0, 20 * 365),
+        "credits": ints(0, 140),
+    }),
+    SeedSpec("award_summary", "app.modules.military_info.models:AwardSummary", per_parent=2, columns={
+        "award_type": pick(("AAM", "ARCOM", "MSM", "AGCM", "NDSM", "GWOTSM", "ASR", "OSR")),
+        "count": ints(1, 4),
+        "last_award_date": days_ago(0, 10 * 365),
+    }),
+    SeedSpec("assignment_history", "app.modules.military_info.models:AssignmentHistory", per_parent=3, columns={
+        "unit": from_soldier("unit"),
+        "station": pick(INSTALLATIONS),
+        "uic_ruc_pas_opfac": from_soldier("uic"),
+        "from_date": days_ago(60, 15 * 365),
+        "to_date": after("from_date", 180, 3 * 365),
+        "duty_title": pick(DUTY_TITLES),
+        "reason_for_change": pick(("PCS", "Reassignment", "Promotion", "Reorganization")),
+        "pcs_tdy_deployment": pick(("PCS", "TDY", "Deployment"), (70, 20, 10)),
+        "country": pick(("United States", "Germany", "South Korea", "Italy"), (80, 10, 8, 2)),
+    }),
+    SeedSpec("deployment_records", "app.modules.military_info.models:DeploymentRecord", per_parent=1, columns={
+        "country": pick(COUNTRIES),
+        "start_date": days_ago(60, 15 * 365),
+        "end_date": after("start_date", 90, 365),
+        "combat_zone_pay": chance(0.6),
+    }),
+    SeedSpec("language_records", "app.modules.military_info.models:LanguageRecord", per_parent=0.25, columns={
+        "language": pick(LANGUAGES),
+        "dlpt_listening": ints(0, 3),
+        "dlpt_reading": ints(0, 3),
+        "dlpt_speaking": ints(0, 3),
+        "dlpt_date": days_ago(0, 5 * 365),
+        "proficiency_pay": chance(0.2),
+    }),
+    # --- trackers -----------------------------------------------------------
+    SeedSpec(
+        "hr_metric_entries", "app.modules.hr_metrics.models:HRMetricEntry",
+        per_parent=4, exact=True, parent_column="service_member_id",
+        columns={
+            "definition_id": cycle("hr_metric_definitions"),
+            "date_completed": days_ago(0, 420),
+            "expiration_date": after("date_completed", 365, 366),
+            "notes": pick(NOTES),
+        },
+    ),
+    SeedSpec("training_entries", "app.modules.training.models:TrainingEntry", per_parent=8, columns={
+        "training_type": pick(("SHARP", "EO", "Cyber Awareness", "TARP", "Suicide Prevention", "OPSEC",
+                               "Antiterrorism Level I", "CTIP", "Resilience", "Weapons Safety")),
+        "training_date": days_ago(0, 500),
+        "expiration_date": after("training_date", 365, 366),
+        "is_required": chance(0.8),
+        "status_color": lambda b, n: [None] * n,
+        "attachment_count": lambda b, n: [0] * n,
+    }),
+    SeedSpec(
+        "duty_daily_status", "app.modules.duty_roster.models:DailyStatus", per_parent=30, exact=True,
+        columns={
+            "date": sequence_days_ago(),
+            "status_category_id": lambda b, n: b.rng.choices(
+                b.ids["duty_status_categories"], weights=[82, 5, 3, 3, 2, 2, 1, 1.9, 0.1], k=n
+            ),
+        },
+    ),
+    SeedSpec("hand_receipt_items", "app.modules.hand_receipt.models:HandReceiptItem", per_parent=3, columns={
+        "item_name": pick(("M4 Carbine", "PVS-14", "ACH Helmet", "IOTV", "AN/PRC-152", "Compass, Lensatic",
+                           "CLS Bag", "Toolkit, General Mechanic", "Room Key")),
+        "serial_number": lambda b, n: [f"SN{b.rng.randrange(10 ** 8):08d}" for _ in range(n)],
+        "date_issued": days_ago(0, 900),
+        "date_returned": lambda b, n: [None] * n,
+        "issued_by_rank": pick(("SSG", "SFC", "SGT")),
+        "issued_by_last": pick(LAST_NAMES),
+        "issued_by_first": pick(FIRST_NAMES),
+        "is_returned": lambda b, n: [False] * n,
+    }),
+    SeedSpec(
+        "physical_fitness_tests", "app.modules.physical_fitness.models:PhysicalFitnessTest",
+        per_parent=2, parent_column="service_member_id",
+        columns={
+            "branch": lambda b, n: [Branch.Army] * n,
+            "test_type": lambda b, n: ["ARMY_AFT"] * n,
+            "test_date": days_ago(0, 400),
+            "expiration_date": after("test_date", 180, 181),
+            "status_color": lambda b, n: [None] * n,
+            "total_score": ints(300, 600),
+            "passed": chance(0.93),
+        },
+    ),
+    SeedSpec("weapon_qualifications", "app.modules.weapons.models:WeaponQualification",
+             per_parent=1.5, parent_column="service_member_id", columns={
+        "weapon_type": pick(("M4", "M17", "M249", "M240B", "M320", "M2"), (70, 10, 8, 6, 4, 2)),
+        "qual_date": days_ago(0, 400),
+        "expiration_date": after("qual_date", 365, 366),
+        "passed": chance(0.95),
+        "score": pick(("Expert", "Sharpshooter", "Marksman"), (20, 35, 45)),
+    }),
+    SeedSpec("medpros_status", "app.modules.medpros.models:MedprosStatus",
+             exact=True, parent_column="service_member_id", columns={
+        "pha_date": days_ago(0, 450),
+        "dental_class": pick(("1", "2", "3", "4"), (55, 38, 5, 2)),
+        "mrc": pick(("1", "2", "3A", "3B", "4"), (80, 8, 5, 5, 2)),
+    }),
+    SeedSpec("medical_profiles", "app.modules.medical_profiles.models:MedicalProfile",
+             per_parent=0.2, parent_column="service_member_id", columns={
+        "profile_type": pick(("Temporary", "Permanent"), (85, 15)),
+        "start_date": days_ago(0, 300),
+        "end_date": after("start_date", 14, 90),
+        "permanent": chance(0.15),
+    }),
+    SeedSpec("license_records", "app.modules.licenses.models:LicenseRecord",
+             per_parent=1, parent_column="service_member_id", columns={
+        "license_type": pick(("Civilian Driver", "OF-346", "Hazmat", "Forklift")),
+        "identifier": lambda b, n: [f"L{b.rng.randrange(10 ** 7):07d}" for _ in range(n)],
+        "issue_date": days_ago(0, 2000),
+        "expiration_date": after("issue_date", 2 * 365, 6 * 365),
+        "is_military": chance(0.4),
+    }),
+    SeedSpec("family_members", "app.modules.family.models:FamilyMember",
+             per_parent=1.5, parent_column="service_member_id", columns={
+        "relationship_type": pick(("Spouse", "Child", "Parent"), (35, 50, 15)),
+        "first_name": pick(FIRST_NAMES),
+        "last_name": from_soldier("last_name"),
+        "phone": lambda b, n: [f"555-{b.rng.randrange(10000):04d}" for _ in range(n)],
+    }),
+    SeedSpec("appointments", "app.modules.appointments.models:Appointment",
+             per_parent=2, parent_column="service_member_id", columns={
+        "appointment_type": pick(("Dental", "Sick Call", "Optometry", "Behavioral Health", "Physical Therapy",
+                                  "Finance", "Legal")),
+        "appointment_date": days_ago(-60, 120),
+        "start_time": lambda b, n: [dt_time(h, m) for h, m in zip(ints(7, 15)(b, n), pick((0, 15, 30, 45))(b, n))],
+        "location": pick(("Troop Medical Clinic", "Dental Clinic 2", "SRP Site", "Finance Office")),
+    }),
+    SeedSpec("appointment_entries", "app.modules.appointments_tracker.models:AppointmentEntry",
+             per_parent=1, parent_column="service_member_id", columns={
+        "category": pick(("Medical", "Dental", "Admin", "Legal")),
+        "description": pick(("Follow-up", "Annual exam", "Records update", "Consultation")),
+        "start_time": lambda b, n: [datetime.combine(d, dt_time(9)) for d in days_ago(-60, 120)(b, n)],
+        "end_time": lambda b, n: [None] * n,
+    }),
+    SeedSpec("battle_events", "app.modules.battle_calendar.models:BattleEvent",
+             per_parent=0.5, parent_column="service_member_id", columns={
+        "title": pick(("Range Week", "Field Training Exercise", "Block Leave", "NTC Rotation", "Motor Stables",
+                       "Company Run", "SHARP Training", "Change of Command")),
+        "start_date": days_ago(-180, 60),
+        "end_date": after("start_date", 0, 14),
+        "location": pick(INSTALLATIONS),
+    }),
+    SeedSpec("flag_actions", "app.modules.flags_ucmj.models:FlagAction",
+             per_parent=0.06, parent_column="service_member_id", columns={
+        "category": pick(("Flag", "Legal Hold", "Article 15", "Command Hold"), (60, 10, 20, 10)),
+        "auto_title": _soldier_name,
+        "start_date": days_ago(0, 365),
+        "expiration_date": after("start_date", 30, 180),
+        "status_color": lambda b, n: [None] * n,
+        "closed_out": chance(0.3),
+    }),
+    SeedSpec("flag_action_attachments", "app.modules.flags_ucmj.models:FlagActionAttachment",
+             per_parent=1, parent="flag_actions", parent_column="flag_action_id", columns={
+        "file_path": lambda b, n: [f"flags/{uuid.UUID(int=b.rng.getrandbits(128))}.pdf" for _ in range(n)],
+        "description": pick(("DA 268", "DA 2627", "Counseling statement")),
+    }),
+)
+
+SPECS_BY_TABLE: Dict[str, SeedSpec] = {spec.table: spec for spec in SPECS}
+
+
+# ---------------------------------------------------------------------------
+# LOADING
+# ---------------------------------------------------------------------------
+
+def load_spec_table(spec: SeedSpec) -> Optional[Table]:
+    module_path, class_name = spec.model.split(":")
+    try:
+        model = getattr(import_module(module_path), class_name)
+    except (ImportError, AttributeError) as exc:
+        logger.warning("seed: skipping %s (%s)", spec.table, exc)
+        return None
+    return model.__table__
+
+
+def _row_counts(rng: random.Random, spec: SeedSpec, table: Table, parents: int) -> List[int]:
+    if spec.exact or (spec.per_parent == 1 and table.c[spec.parent_column].unique):
+        return [int(spec.per_parent)] * parents
+    # Uniform 0..2x keeps the mean at per_parent with a realistic spread
+    top = 2 * spec.per_parent + 1
+    rnd = rng.random
+    return [int(rnd() * top) for _ in range(parents)]
+
+
+def _audit_columns(b: Batch, n: int) -> Dict[str, List[Any]]:
+    # Whole days only, so insert_columns binds each distinct timestamp once
+    created = [datetime.combine(d, dt_time(8)) for d in days_ago(1, 3 * 365)(b, n)]
+    rnd = b.rng.random
+    updated = [c + timedelta(days=int(rnd() * 90)) for c in created]
+    now = datetime.combine(b.today, dt_time(0))
+    return {"created_at": created, "updated_at": [min(u, now) for u in updated]}
+
+
+def _build_batch(b: Batch, table: Table, spec: SeedSpec, parent_ids: Sequence[uuid.UUID]) -> Dict[str, List[Any]]:
+    n = len(b.parents)
+    ids = _uuids(b.rng, n)
+    b.values = {"id": ids}
+    if spec.parent:
+        b.values[spec.parent_column] = [parent_ids[p] for p in b.parents]
+    if "created_at" in table.c:
+        b.values.update(_audit_columns(b, n))
+    if "is_deleted" in table.c:
+        b.values["is_deleted"] = [False] * n
+
+    for name, gen in spec.columns.items():
+        if name in table.c:
+            b.values[name] = gen(b, n)
+
+    for column in table.columns:
+        if column.name in b.values or column.default is not None or column.server_default is not None:
+            continue
+        if column.foreign_keys:
+            target = next(iter(column.foreign_keys)).column.table.name
+            if target in b.ids:
+                b.values[column.name] = b.rng.choices(b.ids[target], k=n)
+            continue
+        values = _typed_default(b, column, n)
+        if values is not None:
+            b.values[column.name] = values
+
+    return b.values
+
+
+def insert_columns(conn: Connection, table: Table, values: Dict[str, List[Any]]) -> int:
+    """
+    INSERT one batch given as {column: [value per row]}.
+
+    Each column goes through its type's bind processor once as a list, and
+    the whole batch is one DB-API executemany, skipping the per-row
+    parameter handling of Connection.execute(insert, [dict, ...]) (most of
+    the load time at division scale). Python-side column defaults are
+    applied here since the compiled statement bypasses them.
+    """
+    n = len(next(iter(values.values())))
+    columns = dict(values)
+    for column in table.columns:
+        default = column.default
+        if column.name in columns or default is None:
+            continue
+        if default.is_scalar:
+            columns[column.name] = [default.arg] * n
+        elif default.is_callable:
+            columns[column.name] = [default.arg(None) for _ in range(n)]
+
+    dialect = conn.dialect
+    for name, column_values in columns.items():
+        col_type = table.c[name].type
+        process = col_type.dialect_impl(dialect).bind_processor(dialect)
+        if process is None:
+            continue
+        if isinstance(col_type, Uuid):
+            columns[name] = [process(v) for v in column_values]
+        else:
+            # Dates, enums and pooled strings repeat a lot: process each once
+            seen: Dict[Any, Any] = {}
+            columns[name] = [seen[v] if v in seen else seen.setdefault(v, process(v)) for v in column_values]
+
+    compiled = table.insert().compile(dialect=dialect, column_keys=list(columns))
+    if compiled.positional:
+        params: List[Any] = list(zip(*(columns[key] for key in compiled.positiontup)))
+    else:
+        keys = list(columns)
+        params = [dict(zip(keys, row)) for row in zip(*columns.values())]
+    conn.exec_driver_sql(str(compiled), params)
+    return n
+
+
+def seed_table(
+    conn: Connection,
+    spec: SeedSpec,
+    table: Table,
+    rng: random.Random,
+    today: date,
+    roster: Roster,
+    ids: Dict[str, List[uuid.UUID]],
+    keep_ids: bool,
+) -> int:
+    """Generate and insert every row of one table; returns the row count."""
+    if spec.fixed_rows:
+        rows = []
+        for row in spec.fixed_rows:
+            rows.append({"id": _uuids(rng, 1)[0], **{k: v for k, v in row.items() if k in table.c}})
+        conn.execute(table.insert(), rows)
+        ids[spec.table] = [row["id"] for row in rows]
+        return len(rows)
+
+    parent_ids = roster.ids if spec.parent == "service_members" else ids.get(spec.parent, [])
+    counts = _row_counts(rng, spec, table, len(parent_ids))
+    kept: List[uuid.UUID] = []
+    total = 0
+
+    parents: List[int] = []
+    sequence: List[int] = []
+
+    def flush() -> None:
+        nonlocal total
+        batch = Batch(rng=rng, today=today, roster=roster, ids=ids, parents=parents, sequence=sequence)
+        values = _build_batch(batch, table, spec, parent_ids)
+        total += insert_columns(conn, table, values)
+        if keep_ids:
+            kept.extend(values["id"])
+
+    for position, count in enumerate(counts):
+        parents.extend([position] * count)
+        sequence.extend(range(count))
+        if len(parents) >= SEED_BATCH_ROWS:
+            flush()
+            parents, sequence = [], []
+    if parents:
+        flush()
+
+    if keep_ids:
+        ids[spec.table] = kept
+    return total
+
+
+def _seed_users(conn: Connection, rng: random.Random, companies: int, password: str) -> List[uuid.UUID]:
+    from app.core.passwords import hash_password
+    from app.modules.auth.models import UserAccount
+
+    table = UserAccount.__table__
+    password_hash = hash_password(password)  # one bcrypt call shared by every account
+    ids = _uuids(rng, companies + 1)
+    now = datetime.utcnow()
+    rows = [
+        {"id": ids[0], "username": "seed-admin", "email": "seed-admin@example.mil",
+         "password_hash": password_hash, "role": Role.OwnerDeveloperAdmin.value,
+         "created_at": now, "updated_at": now, "is_deleted": False}
+    ]
+    rows.extend(
+        {"id": ids[c + 1], "username": f"seed-co{c + 1:04d}", "email": f"seed-co{c + 1:04d}@example.mil",
+         "password_hash": password_hash, "role": Role.UnitAdmin.value,
+         "created_at": now, "updated_at": now, "is_deleted": False}
+        for c in range(companies)
+    )
+    conn.execute(table.insert(), rows)
+    return ids[1:]
+
+
+def _seed_soldiers(conn: Connection, roster: Roster, rng: random.Random, today: date) -> None:
+    from app.modules.soldier_profile.models import ServiceMember
+
+    table = ServiceMember.__table__
+    for start in range(0, len(roster), SEED_BATCH_ROWS):
+        positions = list(range(start, min(start + SEED_BATCH_ROWS, len(roster))))
+        b = Batch(rng=rng, today=today, roster=roster, ids={}, parents=positions, sequence=[0] * len(positions))
+        values = {
+            "id": b.soldier("ids"),
+            "first_name": b.soldier("first_name"),
+            "last_name": b.soldier("last_name"),
+            "middle_initial": b.soldier("middle_initial"),
+            "branch": [Branch.Army] * len(positions),
+            "component": b.soldier("component"),
+            "owner_user_id": b.soldier("owner_user_id"),
+            **_audit_columns(b, len(positions)),
+            "is_deleted": [False] * len(positions),
+        }
+        insert_columns(conn, table, values)
+
+
+def _truncate(bind: Engine, tables: Sequence[Table]) -> None:
+    from app.modules.auth.models import UserAccount
+    from app.modules.dashboard.models import DashboardBoxMirror
+    from app.modules.soldier_profile.models import ServiceMember
+
+    seed_accounts = select(UserAccount.id).where(UserAccount.username.like("seed-%"))
+    with bind.begin() as conn:
+        foreign = conn.execute(
+            select(func.count())
+            .select_from(ServiceMember.__table__)
+            .where(
+                ServiceMember.owner_user_id.is_(None)
+                | ServiceMember.owner_user_id.not_in(seed_accounts)
+            )
+        ).scalar()
+        if foreign:
+            raise SystemExit(
+                f"refusing to truncate: {foreign} soldiers are not owned by seed-* accounts "
+                "(--truncate only runs on a scratch database)"
+            )
+
+        existing = set(inspect(conn).get_table_names())
+        for table in [DashboardBoxMirror.__table__, *reversed(tables), ServiceMember.__table__]:
+            if table.name in existing:
+                conn.execute(table.delete())
+        conn.execute(UserAccount.__table__.delete().where(UserAccount.username.like("seed-%")))
+
+
+def seed(
+    soldiers: int,
+    *,
+    seed_value: int = 7,
+    only: Optional[Sequence[str]] = None,
+    password: str,
+    truncate: bool = False,
+    derived: bool = True,
+    bind: Optional[Engine] = None,
+) -> Dict[str, int]:
+    """
+    Load `soldiers` soldiers and their per-soldier rows. Returns
+    {table: rows inserted}. `only` limits the per-soldier tables (the
+    roster and any reference table they need are always loaded).
+    """
+    from app.core.migrations import upgrade
+    from app.modules.soldier_profile.models import ServiceMember
+
+    bind = bind or default_engine
+    upgrade(bind)
+
+    rng = random.Random(seed_value)
+    today = datetime.utcnow().date()
+
+    wanted = set(only) if only else None
+    loaded: List[Tuple[SeedSpec, Table]] = []
+    for spec in SPECS:
+        if wanted is not None and spec.table not in wanted and not spec.fixed_rows:
+            continue
+        table = load_spec_table(spec)
+        if table is not None:
+            loaded.append((spec, table))
+
+    if truncate:
+        _truncate(bind, [table for _, table in loaded])
+
+    with bind.begin() as conn:
+        existing = conn.execute(select(func.count()).select_from(ServiceMember.__table__)).scalar()
+        if existing:
+            raise SystemExit(f"database already has {existing} soldiers; pass --truncate to replace them")
+        for _, table in loaded:
+            table.create(conn, checkfirst=True)
+
+    parents_needed = {spec.parent for spec, _ in loaded}
+    counts: Dict[str, int] = {}
+
+    started = time.perf_counter()
+    with bind.begin() as conn:
+        companies = math.ceil(soldiers / COMPANY_SIZE)
+        owners = _seed_users(conn, rng, companies, password)
+        counts["user_accounts"] = companies + 1
+        roster = build_roster(rng, soldiers, owners)
+        _seed_soldiers(conn, roster, rng, today)
+        counts["service_members"] = soldiers
+    logger.info("seed: %d soldiers in %.2fs", soldiers, time.perf_counter() - started)
+
+    ids: Dict[str, List[uuid.UUID]] = {}
+    for spec, table in loaded:
+        started = time.perf_counter()
+        with bind.begin() as conn:
+            counts[spec.table] = seed_table(
+                conn, spec, table, rng, today, roster, ids, keep_ids=spec.table in parents_needed
+            )
+        logger.info(
+            "seed: %s %d rows in %.2fs", spec.table, counts[spec.table], time.perf_counter() - started
+        )
+
+    if derived:
+        from app.core.status_colors import recompute_status_colors
+        from app.modules.dashboard.mirror import rebuild_mirrors
+
+        recompute_status_colors(bind=bind)
+        rebuild_mirrors(bind=bind)
+
+    return counts
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.core.seed")
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument("--scale", choices=list(SCALES), default="company")
+    size.add_argument("--soldiers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=7, help="random seed (same seed, same data)")
+    parser.add_argument("--only", action="append", choices=sorted(SPECS_BY_TABLE))
+    parser.add_argument("--truncate", action="store_true", help="delete previously seeded data first")
+    parser.add_argument("--password", required=True, help="password for the seed-* accounts")
+    parser.add_argument("--skip-derived", action="store_true", help="skip status colors and dashboard mirrors")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    soldiers = args.soldiers or SCALES[args.scale]
+
+    started = time.perf_counter()
+    counts = seed(
+        soldiers,
+        seed_value=args.seed,
+        only=args.only,
+        truncate=args.truncate,
+        password=args.password,
+        derived=not args.skip_derived,
+    )
+    total = sum(counts.values())
+    elapsed = time.perf_counter() - started
+    for name, count in counts.items():
+        print(f"[seed] {name}: {count}")
+    print(f"[seed] {total} rows in {elapsed:.2f}s ({total / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,9 @@
 from __future__ import annotations
 
 from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -10,8 +13,35 @@ class Settings(BaseSettings):
     # Environment
     environment: str = "development"
 
+    # Shared JSON config (dashboard layouts, module metadata); defaults to
+    # the repository's top-level config/ directory
+    config_dir: Optional[str] = None
+
+    # Hot reload of config/metadata (watcher poll interval; 0 = no reload)
+    metadata_reload_interval_seconds: float = 5.0
+
+    # Startup: "eager" imports every module at boot, "lazy" registers
+    # prefixes from app/core/router_manifest.json and imports on first request
+    router_mode: str = "eager"
+
     # Database
     database_url: str = "sqlite:///./mlt.db"
+    # Optional explicit async URL; derived from database_url when unset
+    async_database_url: Optional[str] = None
+    db_echo: bool = False
+
+    # Connection pool (ignored for in-memory SQLite)
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_recycle_seconds: int = 1800
+    db_pool_timeout_seconds: int = 30
+    db_pool_pre_ping: bool = True
+
+    # SQLite-only pragmas
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_mmap_size: int = 268_435_456  # 256 MiB
+    sqlite_busy_timeout_ms: int = 5000
 
     # JWT / Auth
     jwt_secret_key: str = "CHANGE_ME_SUPER_SECRET_KEY"
@@ -19,6 +49,67 @@ class Settings(BaseSettings):
     jwt_access_token_expires_minutes: int = 15
     jwt_refresh_token_expires_days: int = 7
 
+    # Per-request SQL stats (Server-Timing header + "mlt.sql" log) and the
+    # repeated-statement count that triggers an N+1 warning (0 = no warning)
+    sql_stats_enabled: bool = True
+    sql_n_plus_one_threshold: int = 10
+
+    # Prometheus-format /metrics endpoint
+    metrics_enabled: bool = True
+
+    # Password hashing (bcrypt work factor + bounded process pool)
+    password_bcrypt_rounds: int = 12
+    password_hash_workers: int = 2  # 0 = one per CPU
+    password_hash_max_queue: int = 32
+    password_hash_retry_after_seconds: int = 2
+    password_rehash_on_login: bool = True
+
+    # Per-process cache of token -> authenticated user; the TTL bounds how
+    # long other workers keep a changed role or deleted account
+    auth_user_cache_ttl_seconds: int = 30
+    auth_user_cache_max_entries: int = 10_000
+
+    # Bulk ingest: rows per executemany + commit
+    bulk_ingest_batch_size: int = 1000
+
+    # Nightly status-color recompute inside the app (UTC hour; None = off,
+    # e.g. when cron runs `python -m app.core.status_colors` instead)
+    status_color_recompute_hour: Optional[int] = None
+
+    # Dashboard box mirrors: quiet period before queued refreshes are written
+    # (restarted by every change), and the longest a change can wait under a
+    # steady stream of writes
+    dashboard_mirror_debounce_seconds: float = 2.0
+    dashboard_mirror_max_delay_seconds: float = 10.0
+
+    # Dashboard snapshots: rollup interval (None = off) and how long hourly
+    # snapshots are kept before compaction to one per day. Every process
+    # with an interval set writes its own snapshots, so enable it in one
+    # worker only (or run `python -m app.modules.dashboard.cli snapshot`
+    # from cron instead)
+    dashboard_snapshot_interval_minutes: Optional[int] = None
+    dashboard_snapshot_hourly_retention_days: int = 7
+
+    # Attachments: streaming copy chunk size and upload cap (0 = no cap)
+    attachment_chunk_size_bytes: int = 1024 * 1024
+    attachment_max_upload_bytes: int = 100 * 1024 * 1024
+    # Attachments: background file reaper interval (None = off) and orphan
+    # sweep interval (None = only via `python -m app.modules.attachments.cli sweep`)
+    attachment_reaper_interval_seconds: Optional[int] = 60
+    attachment_orphan_sweep_hours: Optional[int] = 24
+
+    # Attachment storage backend for new uploads: "local" (MLT_ATTACHMENTS_ROOT)
+    # or "s3" (any S3-compatible store; needs boto3). An endpoint of
+    # "local:///path" uses the in-process S3 stand-in instead of boto3.
+    attachment_storage_backend: str = "local"
+    attachment_s3_bucket: Optional[str] = None
+    attachment_s3_endpoint_url: Optional[str] = None
+    attachment_s3_region: Optional[str] = None
+    attachment_s3_access_key_id: Optional[str] = None
+    attachment_s3_secret_access_key: Optional[str] = None
+    attachment_s3_multipart_part_bytes: int = 8 * 1024 * 1024
+    attachment_presigned_url_seconds: int = 300
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -27,3 +118,11 @@ class Settings(BaseSettings):
 @lru_cache
 def get_settings() -> Settings:
     return Settings()
+
+
+def get_config_dir() -> Path:
+    configured = get_settings().config_dir
+    if configured:
+        return Path(configured)
+    # backend/app/core/settings.py -> <repo>/config
+    return Path(__file__).resolve().parents[3] / "config"
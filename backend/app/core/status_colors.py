@@ -0,0 +1,334 @@
+# app/core/status_colors.py
+
+"""
+Server-side status-color engine.
+
+Every tracker that stores a `status_color` (training, HR metrics, tasks,
+awards, evaluations, fitness tests, flags, PERSTATS) is described by one
+StatusColorRule. A recompute turns each rule into set-based UPDATE
+statements of the form
+
+    UPDATE <table>
+       SET status_color = CASE ... END
+     WHERE status_color IS DISTINCT FROM CASE ... END
+
+so the database evaluates every row in one pass and only rows whose color
+actually changed as of the given date are written.
+
+Colors, with `days_left = <date column> - as_of`:
+
+    closed (completed / closed out / inactive)  -> closed_color (GRAY)
+    no date                                     -> undated_color
+    days_left < 0                               -> expired_color (RED)
+    days_left > green_days                      -> GREEN
+    days_left > amber_days                      -> AMBER
+    otherwise                                   -> RED
+
+HR metrics take green/amber days from their HRMetricDefinition (the rule
+defaults where those are NULL); all other rules use fixed defaults.
+Boundary dates are computed in Python and bound as parameters, so no
+dialect-specific date arithmetic is needed.
+
+Run nightly from cron (from backend/):
+    python -m app.core.status_colors [--as-of 2025-01-31] [--only hr_metrics]
+
+or set Settings.status_color_recompute_hour to run it inside the app.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from importlib import import_module
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import Table, and_, case, cast, inspect, literal, select, true, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.db import engine as default_engine
+
+logger = logging.getLogger("mlt.status_colors")
+
+# (green_days, amber_days, extra WHERE clause) for one UPDATE statement
+ThresholdGroup = Tuple[int, int, ColumnElement]
+
+
+@dataclass(frozen=True)
+class StatusColorRule:
+    name: str
+    model: str                      # "app.modules.<name>.models:<Class>"
+    date_column: str
+    soldier_column: str = "soldier_id"
+    green_days: int = 90
+    amber_days: int = 30
+    undated_color: str = "NEUTRAL"
+    expired_color: str = "RED"
+    closed_color: str = "GRAY"
+    closed: Optional[Callable[[Table], ColumnElement]] = None
+    threshold_groups: Optional[
+        Callable[[Connection, "StatusColorRule", Table], List[ThresholdGroup]]
+    ] = None
+
+
+# ---------------------------------------------------------------------------
+# PER-DEFINITION THRESHOLDS
+# ---------------------------------------------------------------------------
+
+def _hr_metric_threshold_groups(
+    conn: Connection, rule: StatusColorRule, table: Table
+) -> List[ThresholdGroup]:
+    """
+    One group per distinct (green, amber) pair, so a handful of UPDATEs
+    cover every metric definition. Both columns are nullable; a NULL
+    threshold falls back to the rule's default days.
+    """
+    from app.modules.hr_metrics.models import HRMetricDefinition
+
+    definitions = HRMetricDefinition.__table__
+    pairs: Dict[Tuple[int, int], List] = defaultdict(list)
+    for row in conn.execute(
+        select(
+            definitions.c.id,
+            definitions.c.green_threshold_days,
+            definitions.c.amber_threshold_days,
+        )
+    ):
+        green = rule.green_days if row.green_threshold_days is None else row.green_threshold_days
+        amber = rule.amber_days if row.amber_threshold_days is None else row.amber_threshold_days
+        pairs[(green, amber)].append(row.id)
+
+    return [
+        (green, amber, table.c.definition_id.in_(ids))
+        for (green, amber), ids in pairs.items()
+    ]
+
+
+# ---------------------------------------------------------------------------
+# RULES
+# ---------------------------------------------------------------------------
+
+RULES: Tuple[StatusColorRule, ...] = (
+    StatusColorRule(
+        name="training",
+        model="app.modules.training.models:TrainingEntry",
+        date_column="expiration_date",
+        expired_color="EXPIRED",
+    ),
+    StatusColorRule(
+        name="hr_metrics",
+        model="app.modules.hr_metrics.models:HRMetricEntry",
+        date_column="expiration_date",
+        soldier_column="service_member_id",
+        threshold_groups=_hr_metric_threshold_groups,
+    ),
+    StatusColorRule(
+        name="tasking",
+        model="app.modules.tasking.models:TaskEntry",
+        date_column="suspense_date",
+        green_days=7,
+        amber_days=3,
+        undated_color="GRAY",       # TaskStatusColor has no NEUTRAL
+        closed=lambda t: t.c.is_completed.is_(True),
+    ),
+    StatusColorRule(
+        name="awards",
+        model="app.modules.awards.models:AwardEntry",
+        date_column="suspense_date",
+        green_days=14,
+        amber_days=7,
+        undated_color="NONE",
+        closed=lambda t: t.c.approval_status.in_(["APPROVED", "DISAPPROVED", "PRESENTED"]),
+    ),
+    StatusColorRule(
+        name="evaluations",
+        model="app.modules.evaluations.models:EvaluationEntry",
+        date_column="suspense_date",
+        green_days=30,
+        amber_days=14,
+        undated_color="NONE",
+        closed=lambda t: t.c.completed.is_(True) | t.c.approval_status.in_(["APPROVED", "FILED"]),
+    ),
+    StatusColorRule(
+        name="physical_fitness",
+        model="app.modules.physical_fitness.models:PhysicalFitnessTest",
+        date_column="expiration_date",
+        soldier_column="service_member_id",
+        undated_color="GRAY",
+    ),
+    StatusColorRule(
+        name="flags_ucmj",
+        model="app.modules.flags_ucmj.models:FlagAction",
+        date_column="expiration_date",
+        soldier_column="service_member_id",
+        closed=lambda t: t.c.closed_out.is_(True),
+    ),
+    StatusColorRule(
+        name="perstats",
+        model="app.modules.perstats.models:PerstatsEntry",
+        date_column="end_date",
+        soldier_column="service_member_id",
+        green_days=7,
+        amber_days=2,
+        undated_color="GREEN",
+        closed=lambda t: t.c.is_active.is_(False),
+    ),
+)
+
+RULES_BY_NAME: Dict[str, StatusColorRule] = {rule.name: rule for rule in RULES}
+
+
+# ---------------------------------------------------------------------------
+# STATEMENT BUILDING
+# ---------------------------------------------------------------------------
+
+def rule_colors(rule: StatusColorRule) -> Set[str]:
+    colors = {"GREEN", "AMBER", "RED", rule.undated_color, rule.expired_color}
+    if rule.closed is not None:
+        colors.add(rule.closed_color)
+    return colors
+
+
+def load_rule_table(rule: StatusColorRule) -> Optional[Table]:
+    module_path, _, class_name = rule.model.partition(":")
+    try:
+        model = getattr(import_module(module_path), class_name)
+    except (ImportError, AttributeError) as exc:
+        logger.warning("status colors: skipping %s (%s)", rule.name, exc)
+        return None
+
+    # A color outside a native enum fails the whole UPDATE on PostgreSQL
+    allowed = getattr(model.__table__.c.status_color.type, "enums", None)
+    invalid = rule_colors(rule) - set(allowed) if allowed else set()
+    if invalid:
+        logger.error("status colors: skipping %s (not in its enum: %s)", rule.name, sorted(invalid))
+        return None
+    return model.__table__
+
+
+def color_expression(
+    rule: StatusColorRule,
+    table: Table,
+    as_of: date,
+    green_days: int,
+    amber_days: int,
+) -> ColumnElement:
+    column = table.c.status_color
+    due = table.c[rule.date_column]
+
+    def color(value: str) -> ColumnElement:
+        return literal(value, column.type)
+
+    whens = []
+    if rule.closed is not None:
+        whens.append((rule.closed(table), color(rule.closed_color)))
+    whens.extend(
+        [
+            (due.is_(None), color(rule.undated_color)),
+            (due < as_of, color(rule.expired_color)),
+            (due > as_of + timedelta(days=green_days), color("GREEN")),
+            (due > as_of + timedelta(days=amber_days), color("AMBER")),
+        ]
+    )
+    # CAST keeps native enum columns (PostgreSQL) happy with the CASE result
+    return cast(case(*whens, else_=color("RED")), column.type)
+
+
+def build_updates(conn: Connection, rule: StatusColorRule, table: Table, as_of: date):
+    if rule.threshold_groups is not None:
+        groups = rule.threshold_groups(conn, rule, table)
+    else:
+        groups = [(rule.green_days, rule.amber_days, true())]
+
+    for green_days, amber_days, where in groups:
+        expr = color_expression(rule, table, as_of, green_days, amber_days)
+        yield (
+            update(table)
+            .where(and_(where, table.c.status_color.is_distinct_from(expr)))
+            .values(status_color=expr)
+        )
+
+
+# ---------------------------------------------------------------------------
+# PUBLIC API
+# ---------------------------------------------------------------------------
+
+def recompute_status_colors(
+    as_of: Optional[date] = None,
+    *,
+    only: Optional[Iterable[str]] = None,
+    bind: Optional[Engine] = None,
+) -> Dict[str, int]:
+    """
+    Recompute colors for every rule (or just `only`) as of `as_of`
+    (default: today, UTC). Each rule commits on its own.
+
+    Returns {rule name: rows changed}; rules whose model cannot be imported
+    or whose table does not exist yet are left out.
+    """
+    bind = bind or default_engine
+    as_of = as_of or datetime.now(timezone.utc).date()
+    rules: Sequence[StatusColorRule] = (
+        RULES if only is None else [RULES_BY_NAME[name] for name in only]
+    )
+
+    changed: Dict[str, int] = {}
+    for rule in rules:
+        table = load_rule_table(rule)
+        if table is None:
+            continue
+
+        started = time.perf_counter()
+        with bind.begin() as conn:
+            if not inspect(conn).has_table(table.name):
+                continue
+            changed[rule.name] = sum(
+                conn.execute(stmt).rowcount for stmt in build_updates(conn, rule, table, as_of)
+            )
+
+        logger.info(
+            "status colors: %s changed %d rows in %.1f ms",
+            rule.name, changed[rule.name], (time.perf_counter() - started) * 1000,
+        )
+
+    return changed
+
+
+async def run_nightly(hour: int) -> None:
+    """
+    Recompute once a day at `hour`:00 UTC. Started from the app lifespan
+    when Settings.status_color_recompute_hour is set.
+    """
+    while True:
+        now = datetime.now(timezone.utc)
+        next_run = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        await asyncio.sleep((next_run - now).total_seconds())
+
+        try:
+            await asyncio.to_thread(recompute_status_colors)
+        except Exception:  # keep the schedule alive; the next night retries
+            logger.exception("status colors: nightly recompute failed")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.core.status_colors")
+    parser.add_argument("--as-of", type=date.fromisoformat, default=None)
+    parser.add_argument("--only", action="append", choices=sorted(RULES_BY_NAME))
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    changed = recompute_status_colors(args.as_of, only=args.only)
+    for name, count in changed.items():
+        print(f"[status-colors] {name}: {count} rows changed")
+    print(f"[status-colors] done in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+# app/core/upsert.py
+
+"""
+Dialect-specific INSERT for upserts.
+
+INSERT ... ON CONFLICT exists on PostgreSQL and SQLite, but SQLAlchemy
+exposes it only on each dialect's own insert() construct. upsert_insert()
+picks the right one for a Session, Connection or Engine:
+
+    stmt = upsert_insert(db, table)
+    stmt = stmt.on_conflict_do_update(index_elements=["soldier_id"], set_={...})
+"""
+
+from __future__ import annotations
+
+from typing import Union
+
+from sqlalchemy import Table
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+Bind = Union[Session, Connection, Engine]
+
+
+def upsert_insert(bind: Bind, table: Table):
+    """
+    postgresql.insert / sqlite.insert for `bind`'s dialect; raises
+    NotImplementedError on any other database.
+    """
+    engine = bind.get_bind() if isinstance(bind, Session) else bind
+    dialect = engine.dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(table)
+    if dialect == "sqlite":
+        return sqlite.insert(table)
+    raise NotImplementedError(f"Upsert not supported on {dialect!r}")
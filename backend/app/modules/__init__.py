@@ -11,12 +11,12 @@ MODULES = [
     "auth",
     "soldier_profile",
     "military_info",   # <<< REQUIRED
+    "dashboard",
+    "attachments",
 ]
 
-# Ensure model modules are imported so SQLAlchemy sees them
-from . import auth
-from . import soldier_profile
-from . import military_info
+# Modules are imported on demand by app.core.router (eagerly at startup or
+# lazily on first request) and by app.core.db.init_models().
 
 __all__ = [
     "MODULES",
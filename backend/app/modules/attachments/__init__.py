@@ -1,6 +1,7 @@
 from .models import Attachment
 from .service import (
     create_attachment,
+    create_attachment_from_file,
     delete_attachment,
     get_attachment,
     list_attachments_for_owner,
@@ -10,6 +11,7 @@ from .utils import get_attachments_root
 __all__ = [
     "Attachment",
     "create_attachment",
+    "create_attachment_from_file",
     "delete_attachment",
     "get_attachment",
     "list_attachments_for_owner",
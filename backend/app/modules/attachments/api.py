@@ -0,0 +1,254 @@
+# app/modules/attachments/api.py
+
+from __future__ import annotations
+
+import asyncio
+from typing import List
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import FileResponse, RedirectResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.conditional import CACHE_CONTROL, etag_matches
+from app.core.db import get_async_db
+from app.core.security import get_current_user
+
+from .models import Attachment
+from .schemas import AttachmentRead
+from .service import (
+    attach_staged,
+    blob_backend,
+    delete_attachments_for_owner,
+    ensure_stored,
+    release_attachment,
+    store_staged,
+)
+from .storage import (
+    LocalS3Client,
+    S3Storage,
+    backend_for,
+    get_storage_backend,
+    verify_local_presigned,
+)
+from .uploads import UPLOAD_REQUEST_BODY, UploadFormError, receive_upload
+from .utils import UploadTooLarge, discard_staged
+
+
+async def _get_or_404(db: AsyncSession, attachment_id: UUID) -> Attachment:
+    attachment = await db.get(Attachment, attachment_id)
+    if attachment is None or attachment.is_deleted:
+        raise HTTPException(status_code=404, detail="Attachment not found")
+    return attachment
+
+
+def get_router() -> APIRouter:
+    router = APIRouter(
+        prefix="/api/attachments",
+        tags=["attachments"],
+    )
+
+    @router.post(
+        "",
+        response_model=AttachmentRead,
+        status_code=201,
+        openapi_extra=UPLOAD_REQUEST_BODY,
+    )
+    async def upload_attachment(
+        request: Request,
+        db: AsyncSession = Depends(get_async_db),
+        current_user=Depends(get_current_user),
+    ):
+        """
+        Upload one file (multipart/form-data: file, owner_type, owner_id,
+        description).
+
+        The body is parsed from the request stream (see uploads.py): the
+        file part is written once, straight to staging in fixed-size chunks
+        with size and SHA-256 computed during the copy, and an upload over
+        attachment_max_upload_bytes gets 413 as soon as it passes the cap
+        (or before reading, from Content-Length). Content already in the
+        store is referenced, not stored again.
+        """
+        try:
+            upload = await receive_upload(request)
+        except UploadTooLarge as exc:
+            raise HTTPException(status_code=413, detail=str(exc))
+        except UploadFormError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+
+        staged = upload.staged
+        original_name = upload.filename
+        owner_type = upload.fields.get("owner_type")
+        owner_id = upload.fields.get("owner_id")
+        description = upload.fields.get("description")
+
+        try:
+            # The object goes in before the write transaction opens, so the
+            # blob lock (and SQLite's write lock) is only held for the
+            # upsert, insert and commit, never across the upload
+            backend = await db.run_sync(lambda session: blob_backend(session, staged.sha256))
+            await db.commit()
+            await asyncio.to_thread(store_staged, backend, staged)
+
+            attachment = await db.run_sync(
+                lambda session: attach_staged(
+                    session,
+                    staged,
+                    backend=backend,
+                    original_name=original_name,
+                    content_type=upload.content_type,
+                    owner_type=owner_type,
+                    owner_id=owner_id,
+                    description=description,
+                )
+            )
+            await asyncio.to_thread(ensure_stored, attachment, staged)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        finally:
+            await asyncio.to_thread(discard_staged, staged)
+
+        await db.refresh(attachment)
+        return attachment
+
+    @router.get("", response_model=List[AttachmentRead])
+    async def list_attachments(
+        owner_type: str,
+        owner_id: str,
+        db: AsyncSession = Depends(get_async_db),
+        current_user=Depends(get_current_user),
+    ):
+        stmt = (
+            select(Attachment)
+            .where(
+                Attachment.owner_type == owner_type,
+                Attachment.owner_id == owner_id,
+                Attachment.is_deleted.is_(False),
+            )
+            .order_by(Attachment.created_at.asc())
+        )
+        return (await db.scalars(stmt)).all()
+
+    @router.delete("")
+    async def remove_attachments_for_owner(
+        owner_type: str,
+        owner_id: str,
+        db: AsyncSession = Depends(get_async_db),
+        current_user=Depends(get_current_user),
+    ):
+        """
+        Delete every attachment of one owner in a single transaction; files
+        are removed afterwards by the background reaper.
+        """
+        deleted = await db.run_sync(
+            lambda session: delete_attachments_for_owner(
+                session, owner_type=owner_type, owner_id=owner_id
+            )
+        )
+        return {"deleted": deleted}
+
+    @router.get("/{attachment_id}", response_model=AttachmentRead)
+    async def get_attachment_metadata(
+        attachment_id: UUID,
+        db: AsyncSession = Depends(get_async_db),
+        current_user=Depends(get_current_user),
+    ):
+        return await _get_or_404(db, attachment_id)
+
+    @router.api_route("/{attachment_id}/download", methods=["GET", "HEAD"])
+    async def download_attachment(
+        attachment_id: UUID,
+        request: Request,
+        inline: bool = False,
+        db: AsyncSession = Depends(get_async_db),
+        current_user=Depends(get_current_user),
+    ):
+        """
+        Serve the stored file.
+
+        Local storage: FileResponse streams from disk (zero-copy via
+        http.response.pathsend where the server supports it) and honours
+        Range / If-Range, so interrupted downloads resume.
+
+        Object storage: 307 to a short-lived presigned URL, so the bytes go
+        straight from the store to the client.
+
+        The ETag is the content SHA-256.
+        """
+        attachment = await _get_or_404(db, attachment_id)
+
+        headers = {"Cache-Control": CACHE_CONTROL}
+        if attachment.sha256:
+            headers["ETag"] = f'"{attachment.sha256}"'
+            if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+                return Response(status_code=304, headers=headers)
+
+        backend, key = backend_for(attachment.storage_path)
+        path = backend.local_path(key)
+        if path is None:
+            url = await asyncio.to_thread(
+                backend.presigned_url,
+                key,
+                filename=attachment.original_name,
+                content_type=attachment.content_type,
+                inline=inline,
+            )
+            return RedirectResponse(url, status_code=307, headers=headers)
+
+        if not path.is_file():
+            raise HTTPException(status_code=410, detail="Attachment file is missing from storage")
+
+        return FileResponse(
+            path,
+            media_type=attachment.content_type or "application/octet-stream",
+            filename=attachment.original_name,
+            content_disposition_type="inline" if inline else "attachment",
+            headers=headers,
+        )
+
+    @router.api_route("/objects/{bucket}/{key:path}", methods=["GET", "HEAD"], include_in_schema=False)
+    async def get_presigned_object(
+        bucket: str,
+        key: str,
+        expires: int,
+        signature: str,
+        disposition: str = "",
+        content_type: str = "",
+    ):
+        """
+        Presigned downloads for the local S3 stand-in (LocalS3Client); a
+        real object store serves these URLs itself.
+        """
+        backend = get_storage_backend()
+        if not (isinstance(backend, S3Storage) and isinstance(backend.client, LocalS3Client)):
+            raise HTTPException(status_code=404, detail="Not found")
+        if not verify_local_presigned(bucket, key, expires, signature, disposition, content_type):
+            raise HTTPException(status_code=403, detail="Invalid or expired signature")
+
+        path = backend.client.object_path(bucket, key)
+        if not path.is_file():
+            raise HTTPException(status_code=404, detail="Not found")
+
+        headers = {"Content-Disposition": disposition} if disposition else None
+        return FileResponse(path, media_type=content_type or None, headers=headers)
+
+    @router.delete("/{attachment_id}", status_code=204)
+    async def remove_attachment(
+        attachment_id: UUID,
+        db: AsyncSession = Depends(get_async_db),
+        current_user=Depends(get_current_user),
+    ):
+        """
+        Delete the attachment; with the last reference its file is queued
+        for the background reaper, which removes it after this commits.
+        """
+        attachment = await _get_or_404(db, attachment_id)
+        await db.run_sync(lambda session: release_attachment(session, attachment))
+        await db.commit()
+        return Response(status_code=204)
+
+    return router
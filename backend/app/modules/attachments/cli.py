@@ -0,0 +1,122 @@
+# app/modules/attachments/cli.py
+
+"""
+Command-line tools for the attachments module (run from backend/).
+
+    python -m app.modules.attachments.cli dedupe [--limit 1000]
+    python -m app.modules.attachments.cli reap [--all]
+    python -m app.modules.attachments.cli sweep [--grace-seconds 3600]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import List, Optional
+
+
+def _cmd_dedupe(args: argparse.Namespace) -> None:
+    """
+    Move legacy flat-layout files into the content-addressed store, one
+    row per commit so an interrupted run can simply be restarted.
+    """
+    from sqlalchemy import select
+
+    from app.core.db import SessionLocal
+
+    from .models import Attachment
+    from .service import (
+        _acquire_blob,
+        blob_backend,
+        ensure_stored,
+        queue_file_deletions,
+        store_staged,
+    )
+    from .utils import (
+        CAS_PREFIX,
+        build_storage_path,
+        discard_staged,
+        join_storage_path,
+        split_storage_path,
+        stage_stream,
+    )
+
+    started = time.perf_counter()
+    moved = missing = reused = 0
+    with SessionLocal() as db:
+        stmt = select(Attachment).where(~Attachment.storage_path.contains(CAS_PREFIX + "/"))
+        if args.limit:
+            stmt = stmt.limit(args.limit)
+
+        for attachment in db.scalars(stmt).all():
+            legacy_path = attachment.storage_path
+            source = build_storage_path(split_storage_path(legacy_path)[1])
+            if not source.is_file():
+                missing += 1
+                continue
+
+            with open(source, "rb") as f:
+                staged = stage_stream(f, max_bytes=0)
+            try:
+                backend = blob_backend(db, staged.sha256)
+                db.commit()  # no transaction open across the upload
+                if not store_staged(backend, staged):
+                    reused += 1
+                holder = _acquire_blob(db, staged.sha256, staged.file_size, backend)
+                attachment.storage_path = join_storage_path(holder, staged.key)
+                attachment.sha256 = staged.sha256
+                attachment.file_size = staged.file_size
+                ensure_stored(attachment, staged)
+                # The legacy file goes once the new path is committed
+                queue_file_deletions(db, [legacy_path])
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                discard_staged(staged)
+
+            moved += 1
+
+    print(f"[attachments] moved {moved} files into the store ({reused} duplicates), {missing} missing")
+    print(f"[attachments] done in {time.perf_counter() - started:.2f}s")
+
+
+def _cmd_reap(args: argparse.Namespace) -> None:
+    from .reaper import reap_file_deletions
+
+    while True:
+        counts = reap_file_deletions()
+        print(f"[attachments] reaper: {counts}")
+        if not any(counts.values()) or not args.all:
+            break
+
+
+def _cmd_sweep(args: argparse.Namespace) -> None:
+    from .reaper import sweep_orphans
+
+    print(f"[attachments] sweeper: {sweep_orphans(args.grace_seconds)}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.modules.attachments.cli")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    dedupe = sub.add_parser("dedupe", help="move legacy files into the content-addressed store")
+    dedupe.add_argument("--limit", type=int, default=None, help="rows per run (default: all)")
+    dedupe.set_defaults(func=_cmd_dedupe)
+
+    reap = sub.add_parser("reap", help="remove files queued for deletion")
+    reap.add_argument("--all", action="store_true", help="repeat until the queue has nothing due")
+    reap.set_defaults(func=_cmd_reap)
+
+    sweep = sub.add_parser("sweep", help="queue unreferenced files, fix blob reference counts")
+    sweep.add_argument("--grace-seconds", type=int, default=3600)
+    sweep.set_defaults(func=_cmd_sweep)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
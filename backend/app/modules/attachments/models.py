@@ -2,19 +2,25 @@
 
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Integer, String, Text
+from sqlalchemy import DateTime, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
+from app.core.db import Base
 from app.core.models_base import BaseModel
 
 
 class Attachment(BaseModel):
     """
     Generic attachment record using hybrid storage:
-    - Files stored on disk under ../storage/attachments/
-    - Database stores metadata + relative path
+    - Files stored by a storage backend (local disk or S3-compatible)
+    - Database stores metadata + storage path
+
+    New uploads are content-addressed: storage_path is the shared blob
+    (<backend>:cas/ab/cd/<sha256>, see storage.py) and AttachmentBlob
+    counts the rows pointing at it.
     """
 
     __tablename__ = "attachments"
@@ -55,7 +61,7 @@ class Attachment(BaseModel):
     storage_path: Mapped[str] = mapped_column(
         String(512),
         nullable=False,
-        doc="Relative path under the attachments root (e.g., 'stored_name.ext').",
+        doc="<backend>:<key>, e.g. 'local:cas/ab/cd/<sha256>' or 's3:cas/ab/cd/<sha256>'.",
     )
 
     content_type: Mapped[Optional[str]] = mapped_column(
@@ -71,6 +77,13 @@ class Attachment(BaseModel):
         doc="File size in bytes.",
     )
 
+    sha256: Mapped[Optional[str]] = mapped_column(
+        String(64),
+        nullable=True,
+        index=True,
+        doc="Hex SHA-256 of the stored bytes; also the download ETag.",
+    )
+
     description: Mapped[Optional[str]] = mapped_column(
         Text,
         nullable=True,
@@ -86,3 +99,68 @@ class Attachment(BaseModel):
             f"owner_type={self.owner_type!r} owner_id={self.owner_id!r}>"
         )
 
+
+class AttachmentBlob(Base):
+    """
+    One stored file in the content-addressed store, shared by every
+    Attachment row with the same sha256. The file is removed when
+    ref_count drops to zero.
+    """
+
+    __tablename__ = "attachment_blobs"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+
+    file_size: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    storage_backend: Mapped[str] = mapped_column(
+        String(16),
+        nullable=False,
+        default="local",
+        server_default="local",
+        doc="Storage backend holding the bytes ('local', 's3').",
+    )
+
+    ref_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        doc="Number of attachments rows referencing this blob.",
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"<AttachmentBlob sha256={self.sha256[:12]} ref_count={self.ref_count}>"
+
+
+class AttachmentFileDeletion(Base):
+    """
+    Queue of stored files to remove, filled by bulk deletes and the orphan
+    sweeper and drained (with retries) by the reaper.
+    """
+
+    __tablename__ = "attachment_file_deletions"
+
+    storage_path: Mapped[str] = mapped_column(String(512), primary_key=True)
+
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        nullable=False,
+        index=True,
+    )
+
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        nullable=False,
+    )
@@ -0,0 +1,316 @@
+# app/modules/attachments/reaper.py
+
+"""
+Background removal of attachment files.
+
+Deletes (release_attachment, delete_attachments_for_owner) only queue file
+paths in attachment_file_deletions; the reaper drains that queue after the
+delete commits, outside the request:
+
+- an object is deleted only if nothing references it any more (no blob row
+  for a content-addressed path, no attachments row for a legacy path), so
+  content re-uploaded after the delete is kept. The check and the delete
+  run in one transaction under service.lock_blob(), which uploads also
+  hold from taking their blob reference until commit
+- each entry is claimed with a conditional UPDATE before it is processed
+  (due rows are selected with SKIP LOCKED on PostgreSQL), so reapers in
+  several worker processes never handle the same entry twice
+- failures are retried with exponential backoff, capped at
+  REAPER_MAX_BACKOFF_SECONDS
+
+The orphan sweeper reconciles disk against the database:
+
+- objects in the local and configured storage backends that no row
+  references (older than the grace period, so in-flight uploads are left
+  alone) are queued
+- abandoned .staging uploads are removed
+- blob reference counts are reset to the actual number of rows, one
+  blob at a time under lock_blob(), and blobs left at zero are dropped
+
+Both run from the app lifespan (attachment_reaper_interval_seconds,
+attachment_orphan_sweep_hours) or by hand:
+
+    python -m app.modules.attachments.cli reap [--all]
+    python -m app.modules.attachments.cli sweep
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.db import SessionLocal
+
+from .models import Attachment, AttachmentBlob, AttachmentFileDeletion
+from .service import lock_blob, queue_file_deletions
+from .storage import LocalStorage, backend_for, get_storage_backend
+from .utils import (
+    CAS_PREFIX,
+    STAGING_DIR,
+    cas_relative_path,
+    get_attachments_root,
+    is_cas_path,
+    join_storage_path,
+    split_storage_path,
+)
+
+logger = logging.getLogger("mlt.attachments.reaper")
+
+REAPER_BATCH_SIZE = 500
+REAPER_BASE_BACKOFF_SECONDS = 30
+REAPER_MAX_BACKOFF_SECONDS = 6 * 3600
+
+# Files younger than this are never treated as orphans
+ORPHAN_GRACE_SECONDS = 3600
+
+# How long a claimed entry stays invisible to other reapers if this one dies
+REAPER_CLAIM_SECONDS = 300
+
+
+def _backoff(attempts: int) -> timedelta:
+    return timedelta(
+        seconds=min(REAPER_BASE_BACKOFF_SECONDS * 2 ** (attempts - 1), REAPER_MAX_BACKOFF_SECONDS)
+    )
+
+
+def _still_referenced(db: Session, storage_path: str) -> bool:
+    if is_cas_path(storage_path):
+        backend, key = split_storage_path(storage_path)
+        blob = db.get(AttachmentBlob, key.rsplit("/", 1)[-1])
+        return blob is not None and blob.storage_backend == backend
+    return db.scalar(
+        select(func.count()).select_from(Attachment).where(Attachment.storage_path == storage_path)
+    ) > 0
+
+
+# ---------------------------------------------------------------------------
+# REAPER
+# ---------------------------------------------------------------------------
+
+def _claim(db: Session, storage_path: str, now: datetime) -> Optional[int]:
+    """
+    Claim one due entry for this transaction by pushing its next attempt
+    out; returns its attempt count, or None when another reaper got there
+    first. The UPDATE holds the row (PostgreSQL) or the database write
+    lock (SQLite) until commit.
+    """
+    queue = AttachmentFileDeletion.__table__
+    claimed = db.execute(
+        update(queue)
+        .where(queue.c.storage_path == storage_path, queue.c.next_attempt_at <= now)
+        .values(next_attempt_at=now + timedelta(seconds=REAPER_CLAIM_SECONDS))
+    ).rowcount
+    if not claimed:
+        return None
+    return db.scalar(select(queue.c.attempts).where(queue.c.storage_path == storage_path))
+
+
+def _reap_one(storage_path: str) -> Optional[str]:
+    """
+    Claim, check and delete one queue entry in its own transaction.
+    Returns "removed", "kept", "retry", or None when it was not ours.
+    """
+    queue = AttachmentFileDeletion.__table__
+    with SessionLocal() as db:
+        attempts = _claim(db, storage_path, datetime.utcnow())
+        if attempts is None:
+            db.rollback()
+            return None
+
+        if is_cas_path(storage_path):
+            lock_blob(db, split_storage_path(storage_path)[1].rsplit("/", 1)[-1])
+
+        outcome = "kept"
+        if not _still_referenced(db, storage_path):
+            try:
+                backend, key = backend_for(storage_path)
+                backend.delete(key)
+                outcome = "removed"
+            except Exception as exc:
+                attempts += 1
+                db.execute(
+                    update(queue)
+                    .where(queue.c.storage_path == storage_path)
+                    .values(
+                        attempts=attempts,
+                        last_error=str(exc),
+                        next_attempt_at=datetime.utcnow() + _backoff(attempts),
+                    )
+                )
+                db.commit()
+                logger.warning(
+                    "attachments reaper: %s failed (attempt %d): %s",
+                    storage_path, attempts, exc,
+                )
+                return "retry"
+
+        db.execute(delete(queue).where(queue.c.storage_path == storage_path))
+        db.commit()
+        return outcome
+
+
+def reap_file_deletions(limit: int = REAPER_BATCH_SIZE) -> Dict[str, int]:
+    """
+    Process up to `limit` due queue entries, one transaction each. Returns
+    counts of files removed, entries dropped because the file is
+    referenced again, and entries rescheduled after an error.
+    """
+    counts = {"removed": 0, "kept": 0, "retry": 0}
+
+    with SessionLocal() as db:
+        stmt = (
+            select(AttachmentFileDeletion.storage_path)
+            .where(AttachmentFileDeletion.next_attempt_at <= datetime.utcnow())
+            .order_by(AttachmentFileDeletion.next_attempt_at)
+            .limit(limit)
+        )
+        if db.get_bind().dialect.name == "postgresql":
+            stmt = stmt.with_for_update(skip_locked=True)
+        due = db.scalars(stmt).all()
+        db.rollback()
+
+    for storage_path in due:
+        outcome = _reap_one(storage_path)
+        if outcome is not None:
+            counts[outcome] += 1
+
+    if due:
+        logger.info("attachments reaper: %s", counts)
+    return counts
+
+
+# ---------------------------------------------------------------------------
+# ORPHAN SWEEPER
+# ---------------------------------------------------------------------------
+
+def _referenced_paths(db: Session) -> Set[str]:
+    referenced = {
+        join_storage_path(row.storage_backend, cas_relative_path(row.sha256))
+        for row in db.execute(select(AttachmentBlob.sha256, AttachmentBlob.storage_backend))
+    }
+    referenced.update(
+        db.scalars(
+            select(Attachment.storage_path).where(~Attachment.storage_path.contains(CAS_PREFIX + "/"))
+        )
+    )
+    return referenced
+
+
+def _actual_ref_count():
+    return (
+        select(func.count())
+        .select_from(Attachment)
+        .where(Attachment.sha256 == AttachmentBlob.sha256)
+        .where(Attachment.storage_path.contains(CAS_PREFIX + "/"))
+        .scalar_subquery()
+    )
+
+
+def _repair_blob(sha256: str) -> bool:
+    """
+    Reset one blob's ref_count to its attachment rows, dropping the blob
+    (and queuing its file) when none are left. Returns True if it changed.
+
+    lock_blob() first: an upload holds it from taking its reference until
+    commit, so by the time the count runs every such row is committed and
+    counted (a statement snapshot on READ COMMITTED would otherwise miss
+    it and undercount). The count and the write are one UPDATE, so on
+    SQLite the database write lock covers both.
+    """
+    with SessionLocal() as db:
+        lock_blob(db, sha256)
+        changed = db.execute(
+            update(AttachmentBlob)
+            .where(AttachmentBlob.sha256 == sha256, AttachmentBlob.ref_count != _actual_ref_count())
+            .values(ref_count=_actual_ref_count())
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        blob = db.execute(
+            select(AttachmentBlob.ref_count, AttachmentBlob.storage_backend)
+            .where(AttachmentBlob.sha256 == sha256)
+        ).first()
+        if blob is not None and blob.ref_count <= 0:
+            queue_file_deletions(
+                db, [join_storage_path(blob.storage_backend, cas_relative_path(sha256))]
+            )
+            db.execute(delete(AttachmentBlob).where(AttachmentBlob.sha256 == sha256))
+            changed = 1
+        db.commit()
+    return bool(changed)
+
+
+def sweep_orphans(grace_seconds: int = ORPHAN_GRACE_SECONDS) -> Dict[str, int]:
+    """
+    Reconcile the attachments root against the database (see module
+    docstring). Orphans are queued rather than unlinked, so the reaper's
+    reference check is the single place files are removed.
+    """
+    cutoff = time.time() - grace_seconds
+    counts = {"orphans": 0, "staging_removed": 0, "ref_counts_fixed": 0}
+
+    for path in (get_attachments_root() / STAGING_DIR).glob("*"):
+        if path.is_file() and path.stat().st_mtime <= cutoff:
+            path.unlink(missing_ok=True)
+            counts["staging_removed"] += 1
+
+    backends = {LocalStorage.name: get_storage_backend(LocalStorage.name)}
+    backends.setdefault(get_storage_backend().name, get_storage_backend())
+
+    with SessionLocal() as db:
+        referenced = _referenced_paths(db)
+
+        orphans: List[str] = []
+        for name, backend in backends.items():
+            for key, modified in backend.iter_objects():
+                if modified > cutoff or key.startswith(STAGING_DIR + "/"):
+                    continue
+                storage_path = join_storage_path(name, key)
+                if storage_path not in referenced:
+                    orphans.append(storage_path)
+        counts["orphans"] = queue_file_deletions(db, orphans)
+        db.commit()
+
+    # Reference counts drift only if a delete bypassed the service layer.
+    # The unlocked scan only nominates blobs; each is recounted under its
+    # lock (see _repair_blob)
+    with SessionLocal() as db:
+        suspects = db.scalars(
+            select(AttachmentBlob.sha256).where(
+                (AttachmentBlob.ref_count != _actual_ref_count()) | (AttachmentBlob.ref_count <= 0)
+            )
+        ).all()
+        db.rollback()
+
+    for sha256 in suspects:
+        if _repair_blob(sha256):
+            counts["ref_counts_fixed"] += 1
+
+    logger.info("attachments sweeper: %s", counts)
+    return counts
+
+
+# ---------------------------------------------------------------------------
+# SCHEDULE
+# ---------------------------------------------------------------------------
+
+async def run_reaper_schedule(interval_seconds: int, sweep_hours: Optional[int] = None) -> None:
+    """
+    Drain the deletion queue every `interval_seconds` and sweep for orphans
+    every `sweep_hours`. Started from the app lifespan.
+    """
+    next_sweep = time.monotonic() + sweep_hours * 3600 if sweep_hours else None
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            if next_sweep is not None and time.monotonic() >= next_sweep:
+                next_sweep = time.monotonic() + sweep_hours * 3600
+                await asyncio.to_thread(sweep_orphans)
+            await asyncio.to_thread(reap_file_deletions)
+        except Exception:  # keep the schedule alive; the next pass retries
+            logger.exception("attachments reaper: pass failed")
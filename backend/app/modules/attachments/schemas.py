@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class AttachmentRead(BaseModel):
+    id: UUID
+    owner_type: Optional[str] = None
+    owner_id: Optional[str] = None
+    original_name: str
+    content_type: Optional[str] = None
+    file_size: int
+    sha256: Optional[str] = None
+    description: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
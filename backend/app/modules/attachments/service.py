@@ -3,17 +3,32 @@
 from __future__ import annotations
 
 import uuid
-from typing import Iterable, List, Optional, Union
+from io import BytesIO
+from typing import BinaryIO, Dict, Iterable, List, Optional, Union
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, delete, func, select, update
 from sqlalchemy.orm import Session
 
-from .models import Attachment
-from .utils import delete_file_if_exists, save_bytes
+from app.core.upsert import upsert_insert
+
+from .models import Attachment, AttachmentBlob, AttachmentFileDeletion
+from .storage import backend_for, get_storage_backend
+from .utils import (
+    StagedFile,
+    cas_relative_path,
+    discard_staged,
+    generate_stored_filename,
+    is_cas_path,
+    join_storage_path,
+    stage_stream,
+)
 
 
 OwnerIdType = Union[str, uuid.UUID]
 
+# Keys per IN (...) list in set-based statements
+IN_CHUNK_SIZE = 500
+
 
 # ------------------------------------------------------------
 # Helper: normalize owner_id to string
@@ -28,13 +43,114 @@ def _normalize_owner_id(owner_id: Optional[OwnerIdType]) -> Optional[str]:
     return str(owner_id)
 
 
+# ------------------------------------------------------------
+# BLOB REFERENCE COUNTS
+# ------------------------------------------------------------
+def _chunks(values: List, size: int = IN_CHUNK_SIZE):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def lock_blob(db: Session, sha256: str) -> None:
+    """
+    Serialize uploads of one blob against the reaper until the caller's
+    transaction ends. Once an upload holds it, ensure_stored()'s check is
+    final: the reaper either already removed the object (and the upload
+    puts it back) or runs after the commit and sees the reference.
+
+    PostgreSQL: a transaction-scoped advisory lock keyed on the hash (a
+    row lock would not cover a blob row that is still being inserted).
+    SQLite: nothing to do, as both sides write before they check and the
+    database write lock already serializes them.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(select(func.pg_advisory_xact_lock(func.hashtextextended(sha256, 0))))
+
+
+def _acquire_blob(db: Session, sha256: str, file_size: int, backend: str) -> str:
+    """
+    Add one reference to a blob, creating its row (in `backend`) on first
+    use. Returns the backend that holds the blob, which for existing
+    content may differ from `backend`. Holds lock_blob() until commit.
+    """
+    table = AttachmentBlob.__table__
+    lock_blob(db, sha256)
+    stmt = upsert_insert(db, table)
+
+    db.execute(
+        stmt.values(sha256=sha256, file_size=file_size, ref_count=1, storage_backend=backend)
+        .on_conflict_do_update(
+            index_elements=["sha256"],
+            set_={"ref_count": table.c.ref_count + 1},
+        )
+    )
+    return db.execute(
+        select(table.c.storage_backend).where(table.c.sha256 == sha256)
+    ).scalar_one()
+
+
+def _release_blob(db: Session, sha256: str) -> bool:
+    """
+    Drop one reference to a blob. Returns True when that was the last one
+    (the blob row is deleted and the caller removes the file).
+
+    The UPDATE locks the blob row until commit, so a concurrent upload of
+    the same content waits and then re-creates the row and file.
+    """
+    table = AttachmentBlob.__table__
+    db.execute(
+        update(table)
+        .where(table.c.sha256 == sha256)
+        .values(ref_count=table.c.ref_count - 1)
+    )
+    remaining = db.execute(
+        select(table.c.ref_count).where(table.c.sha256 == sha256)
+    ).scalar_one_or_none()
+    if remaining is None or remaining > 0:
+        return False
+
+    db.execute(delete(table).where(table.c.sha256 == sha256))
+    return True
+
+
 # ------------------------------------------------------------
 # CREATE
+#
+# Storing the bytes can take a while (a large S3 multipart upload), so it
+# happens before the write transaction: content-addressed puts are
+# idempotent. The transaction then only takes the blob reference, inserts
+# the row and commits:
+#
+#     backend = blob_backend(db, staged.sha256); commit (ends the read)
+#     store_staged(backend, staged)                  # no locks held
+#     attachment = attach_staged(db, staged, backend=backend, ...)
+#     ensure_stored(attachment, staged)              # under lock_blob
+#     commit; discard_staged(staged)
 # ------------------------------------------------------------
-def create_attachment(
+def blob_backend(db: Session, sha256: str) -> str:
+    """
+    Backend already holding this content, else the configured one.
+    """
+    existing = db.scalar(
+        select(AttachmentBlob.storage_backend).where(AttachmentBlob.sha256 == sha256)
+    )
+    return existing or get_storage_backend().name
+
+
+def store_staged(backend: str, staged: StagedFile) -> bool:
+    """
+    Put a staged upload at its content address in `backend`, keeping the
+    staged copy for ensure_stored(). Returns False when identical content
+    was already stored there. Call outside any transaction.
+    """
+    return get_storage_backend(backend).put_staged(staged, staged.key, keep=True)
+
+
+def attach_staged(
     db: Session,
+    staged: StagedFile,
     *,
-    data: bytes,
+    backend: str,
     original_name: str,
     content_type: Optional[str] = None,
     owner_type: Optional[str] = None,
@@ -42,30 +158,112 @@ def create_attachment(
     description: Optional[str] = None,
 ) -> Attachment:
     """
-    Persist a new attachment:
-      1) Save bytes to disk via hybrid storage layer.
-      2) Insert metadata row into attachments table.
+    Add the metadata row for an upload already put into `backend` and
+    take a reference on its blob, flushed but not committed. The blob row
+    decides where the content lives, which may not be `backend` when
+    another upload created it meanwhile; ensure_stored() covers that.
     """
-    stored_name, relative_path, file_size = save_bytes(data, original_name)
-    normalized_owner_id = _normalize_owner_id(owner_id)
-
+    holder = _acquire_blob(db, staged.sha256, staged.file_size, backend)
     attachment = Attachment(
         owner_type=owner_type,
-        owner_id=normalized_owner_id,
+        owner_id=_normalize_owner_id(owner_id),
         original_name=original_name,
-        stored_name=stored_name,
-        storage_path=relative_path,
+        stored_name=generate_stored_filename(original_name),
+        storage_path=join_storage_path(holder, staged.key),
         content_type=content_type,
-        file_size=file_size,
+        file_size=staged.file_size,
+        sha256=staged.sha256,
         description=description,
     )
-
     db.add(attachment)
-    db.commit()
+    db.flush()
+    return attachment
+
+
+def ensure_stored(attachment: Attachment, staged: StagedFile) -> bool:
+    """
+    Check, between attach_staged() and commit, that the attachment's
+    object exists, and put it again from the staged copy if not (the
+    reaper removed it after store_staged(), or the blob row points at a
+    backend this upload did not write to). lock_blob() is held by then, so
+    the check cannot go stale before the commit. Returns True when it had
+    to put the object.
+    """
+    backend, key = backend_for(attachment.storage_path)
+    if backend.exists(key):
+        return False
+    return backend.put_staged(staged, key, keep=True)
+
+
+def create_attachment_from_file(
+    db: Session,
+    *,
+    fileobj: BinaryIO,
+    original_name: str,
+    content_type: Optional[str] = None,
+    owner_type: Optional[str] = None,
+    owner_id: Optional[OwnerIdType] = None,
+    description: Optional[str] = None,
+) -> Attachment:
+    """
+    Persist a new attachment from a file-like object:
+      1) Stream it to staging in chunks (size + SHA-256 computed on the way).
+      2) Put it at its content address, outside any transaction.
+      3) Insert metadata row and bump the blob reference count.
+      4) Commit.
+    """
+    staged = stage_stream(fileobj)
+    try:
+        backend = blob_backend(db, staged.sha256)
+        db.commit()  # end the read transaction before the upload
+        store_staged(backend, staged)
+        attachment = attach_staged(
+            db,
+            staged,
+            backend=backend,
+            original_name=original_name,
+            content_type=content_type,
+            owner_type=owner_type,
+            owner_id=owner_id,
+            description=description,
+        )
+        ensure_stored(attachment, staged)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        discard_staged(staged)
+
     db.refresh(attachment)
     return attachment
 
 
+def create_attachment(
+    db: Session,
+    *,
+    data: bytes,
+    original_name: str,
+    content_type: Optional[str] = None,
+    owner_type: Optional[str] = None,
+    owner_id: Optional[OwnerIdType] = None,
+    description: Optional[str] = None,
+) -> Attachment:
+    """
+    Persist a new attachment from in-memory bytes. Prefer
+    create_attachment_from_file for uploads.
+    """
+    return create_attachment_from_file(
+        db,
+        fileobj=BytesIO(data),
+        original_name=original_name,
+        content_type=content_type,
+        owner_type=owner_type,
+        owner_id=owner_id,
+        description=description,
+    )
+
+
 # ------------------------------------------------------------
 # READ
 # ------------------------------------------------------------
@@ -107,24 +305,56 @@ def list_attachments_for_owner(
 # ------------------------------------------------------------
 # DELETE SINGLE
 # ------------------------------------------------------------
-def delete_attachment(
-    db: Session,
-    attachment: Attachment,
-    *,
-    delete_file: bool = True,
-) -> None:
+def release_attachment(db: Session, attachment: Attachment) -> Optional[str]:
     """
-    Delete a single attachment row.
-
-    If delete_file=True, also remove the stored file.
+    Delete an attachment row and drop its blob reference, without
+    committing. When this was the last reference (legacy uncounted files:
+    always) the file is queued for the reaper in the same transaction, so
+    it is only removed once the delete has committed. Returns the queued
+    storage_path, else None.
     """
-    if delete_file and attachment.storage_path:
-        delete_file_if_exists(attachment.storage_path)
+    storage_path = attachment.storage_path
+    if is_cas_path(storage_path):
+        last_reference = _release_blob(db, attachment.sha256)
+    else:
+        last_reference = bool(storage_path)
 
     db.delete(attachment)
+    if last_reference:
+        queue_file_deletions(db, [storage_path])
+    db.flush()
+    return storage_path if last_reference else None
+
+
+def delete_attachment(db: Session, attachment: Attachment) -> None:
+    """
+    Delete a single attachment row.
+
+    The stored file is queued for the reaper only when no other attachment
+    shares it. There is no way to keep an unreferenced file: the orphan
+    sweeper would queue it anyway.
+    """
+    release_attachment(db, attachment)
     db.commit()
 
 
+# ------------------------------------------------------------
+# FILE DELETION QUEUE
+# ------------------------------------------------------------
+def queue_file_deletions(db: Session, storage_paths: Iterable[str]) -> int:
+    """
+    Queue stored files for removal by the reaper (see reaper.py), in the
+    caller's transaction. Already-queued paths are ignored.
+    """
+    rows = [{"storage_path": path} for path in set(storage_paths) if path]
+    if rows:
+        stmt = upsert_insert(db, AttachmentFileDeletion.__table__).on_conflict_do_nothing(
+            index_elements=["storage_path"]
+        )
+        db.execute(stmt, rows)
+    return len(rows)
+
+
 # ------------------------------------------------------------
 # DELETE ALL FOR OWNER
 # ------------------------------------------------------------
@@ -133,24 +363,63 @@ def delete_attachments_for_owner(
     *,
     owner_type: str,
     owner_id: OwnerIdType,
-    delete_files: bool = True,
 ) -> int:
     """
-    Delete all attachments associated with a given owner.
+    Delete all attachments associated with a given owner in one
+    transaction:
+      1) one grouped SELECT of the blobs they reference
+      2) one DELETE of the attachment rows
+      3) one executemany decrementing blob reference counts, then a DELETE
+         of blobs left unreferenced
+      4) queue the orphaned files for the background reaper
+
+    No file is touched in the request.
 
     Returns:
         number of rows deleted
     """
-    attachments = list_attachments_for_owner(
-        db,
-        owner_type=owner_type,
-        owner_id=owner_id,
+    owned = (
+        Attachment.owner_type == owner_type,
+        Attachment.owner_id == _normalize_owner_id(owner_id),
     )
 
-    count = 0
-    for att in attachments:
-        delete_attachment(db, att, delete_file=delete_files)
-        count += 1
+    blob_refs: Dict[str, int] = {}
+    legacy_paths: List[str] = []
+    for storage_path, sha256, refs in db.execute(
+        select(Attachment.storage_path, Attachment.sha256, func.count())
+        .where(*owned)
+        .group_by(Attachment.storage_path, Attachment.sha256)
+    ):
+        if is_cas_path(storage_path):
+            blob_refs[sha256] = refs
+        else:
+            legacy_paths.append(storage_path)
 
-    return count
+    count = db.execute(delete(Attachment).where(*owned)).rowcount
+    if not count:
+        db.rollback()
+        return 0
+
+    blobs = AttachmentBlob.__table__
+    orphaned: List[str] = []
+    if blob_refs:
+        db.execute(
+            update(blobs)
+            .where(blobs.c.sha256 == bindparam("b_sha256"))
+            .values(ref_count=blobs.c.ref_count - bindparam("b_refs")),
+            [{"b_sha256": sha, "b_refs": refs} for sha, refs in blob_refs.items()],
+        )
+        for chunk in _chunks(list(blob_refs)):
+            unreferenced = (blobs.c.sha256.in_(chunk), blobs.c.ref_count <= 0)
+            orphaned.extend(
+                join_storage_path(row.storage_backend, cas_relative_path(row.sha256))
+                for row in db.execute(
+                    select(blobs.c.sha256, blobs.c.storage_backend).where(*unreferenced)
+                )
+            )
+            db.execute(delete(blobs).where(*unreferenced))
 
+    queue_file_deletions(db, orphaned + legacy_paths)
+
+    db.commit()
+    return count
@@ -0,0 +1,446 @@
+# app/modules/attachments/storage.py
+
+"""
+Pluggable object storage for attachment files.
+
+Attachment.storage_path carries the backend that holds the bytes:
+
+    local:cas/ab/cd/<sha256>        file under MLT_ATTACHMENTS_ROOT
+    s3:cas/ab/cd/<sha256>           object in attachment_s3_bucket
+
+(rows written before backends existed have no prefix and are local).
+
+Backends:
+- LocalStorage: the attachments root on this node's disk. Downloads are
+  served by FileResponse.
+- S3Storage: any S3-compatible store (AWS S3, MinIO, Ceph RGW) through
+  boto3. Uploads go up in attachment_s3_multipart_part_bytes parts, and
+  downloads are redirected to a presigned URL so the bytes never pass
+  through an API worker. boto3 is only imported when this backend is used.
+- LocalS3Client: a MinIO-style stand-in for the boto3 client that keeps
+  buckets in a local directory. Set attachment_s3_endpoint_url to
+  "local:///some/dir" to run the S3 code path (multipart, presigned URLs
+  served by /api/attachments/objects/...) without an object store.
+
+New uploads go to attachment_storage_backend; existing blobs stay where
+they are.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import logging
+import os
+import shutil
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Tuple
+from urllib.parse import quote, urlencode
+from uuid import uuid4
+
+from app.core.settings import get_settings
+
+from .utils import (
+    StagedFile,
+    build_storage_path,
+    get_attachments_root,
+    place_staged,
+    split_storage_path,
+)
+
+logger = logging.getLogger("mlt.attachments.storage")
+
+LOCAL_ENDPOINT_SCHEME = "local://"
+
+
+class StorageError(RuntimeError):
+    """A storage backend is misconfigured or an operation failed."""
+
+
+class StorageBackend(ABC):
+    name: str
+
+    @abstractmethod
+    def put_staged(self, staged: StagedFile, key: str, *, keep: bool = False) -> bool:
+        """
+        Store a staged upload at `key` and drop the staged copy (unless
+        `keep`). Returns False when an object already existed there.
+        """
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove `key`; a missing object is not an error."""
+
+    @abstractmethod
+    def iter_objects(self) -> Iterator[Tuple[str, float]]:
+        """(key, modified epoch seconds) for every stored object."""
+
+    def local_path(self, key: str) -> Optional[Path]:
+        """Filesystem path when the bytes are on this node's disk."""
+        return None
+
+    def presigned_url(
+        self,
+        key: str,
+        *,
+        filename: str,
+        content_type: Optional[str],
+        inline: bool = False,
+    ) -> Optional[str]:
+        """Time-limited download URL that bypasses the API, if supported."""
+        return None
+
+
+# ---------------------------------------------------------------------------
+# LOCAL FILESYSTEM
+# ---------------------------------------------------------------------------
+
+class LocalStorage(StorageBackend):
+    name = "local"
+
+    def put_staged(self, staged: StagedFile, key: str, *, keep: bool = False) -> bool:
+        return place_staged(staged, key, keep=keep)
+
+    def exists(self, key: str) -> bool:
+        return build_storage_path(key).is_file()
+
+    def delete(self, key: str) -> None:
+        build_storage_path(key).unlink(missing_ok=True)
+
+    def iter_objects(self) -> Iterator[Tuple[str, float]]:
+        root = get_attachments_root()
+        for path in root.rglob("*"):
+            if path.is_file():
+                yield path.relative_to(root).as_posix(), path.stat().st_mtime
+
+    def local_path(self, key: str) -> Optional[Path]:
+        return build_storage_path(key)
+
+
+# ---------------------------------------------------------------------------
+# S3-COMPATIBLE
+# ---------------------------------------------------------------------------
+
+def _content_disposition(filename: str, inline: bool) -> str:
+    kind = "inline" if inline else "attachment"
+    return f"{kind}; filename*=utf-8''{quote(filename)}"
+
+
+class S3Storage(StorageBackend):
+    name = "s3"
+
+    def __init__(self, client: Any, bucket: str, part_size: int, url_seconds: int) -> None:
+        self.client = client
+        self.bucket = bucket
+        self.part_size = part_size
+        self.url_seconds = url_seconds
+
+    @staticmethod
+    def _is_not_found(exc: Exception) -> bool:
+        code = getattr(exc, "response", {}).get("Error", {}).get("Code")
+        return code in ("404", "NoSuchKey", "NotFound")
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+        except Exception as exc:
+            if self._is_not_found(exc):
+                return False
+            raise
+        return True
+
+    def put_staged(self, staged: StagedFile, key: str, *, keep: bool = False) -> bool:
+        try:
+            if self.exists(key):
+                return False
+            with open(staged.temp_path, "rb") as f:
+                if staged.file_size <= self.part_size:
+                    self.client.put_object(Bucket=self.bucket, Key=key, Body=f.read())
+                else:
+                    self._multipart_upload(f, key)
+            return True
+        finally:
+            if not keep:
+                staged.temp_path.unlink(missing_ok=True)
+
+    def _multipart_upload(self, source: BinaryIO, key: str) -> None:
+        """
+        Upload in part_size pieces, one part in memory at a time. A failed
+        upload is aborted so the store does not keep orphaned parts.
+        """
+        upload_id = self.client.create_multipart_upload(Bucket=self.bucket, Key=key)["UploadId"]
+        parts = []
+        try:
+            part_number = 1
+            while True:
+                chunk = source.read(self.part_size)
+                if not chunk:
+                    break
+                result = self.client.upload_part(
+                    Bucket=self.bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=chunk,
+                )
+                parts.append({"PartNumber": part_number, "ETag": result["ETag"]})
+                part_number += 1
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            self.client.abort_multipart_upload(Bucket=self.bucket, Key=key, UploadId=upload_id)
+            raise
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def iter_objects(self) -> Iterator[Tuple[str, float]]:
+        token = None
+        while True:
+            kwargs = {"Bucket": self.bucket}
+            if token:
+                kwargs["ContinuationToken"] = token
+            page = self.client.list_objects_v2(**kwargs)
+            for item in page.get("Contents", []):
+                yield item["Key"], item["LastModified"].timestamp()
+            if not page.get("IsTruncated"):
+                return
+            token = page["NextContinuationToken"]
+
+    def presigned_url(
+        self,
+        key: str,
+        *,
+        filename: str,
+        content_type: Optional[str],
+        inline: bool = False,
+    ) -> Optional[str]:
+        params = {
+            "Bucket": self.bucket,
+            "Key": key,
+            "ResponseContentDisposition": _content_disposition(filename, inline),
+        }
+        if content_type:
+            params["ResponseContentType"] = content_type
+        return self.client.generate_presigned_url(
+            "get_object", Params=params, ExpiresIn=self.url_seconds
+        )
+
+
+# ---------------------------------------------------------------------------
+# LOCAL S3 STAND-IN
+# ---------------------------------------------------------------------------
+
+class LocalS3Error(Exception):
+    """Mirrors botocore's ClientError shape ({"Error": {"Code": ...}})."""
+
+    def __init__(self, code: str, message: str = "") -> None:
+        super().__init__(f"{code}: {message}" if message else code)
+        self.response = {"Error": {"Code": code, "Message": message}}
+
+
+def _presign_signature(bucket: str, key: str, expires: int, disposition: str, content_type: str) -> str:
+    secret = get_settings().jwt_secret_key.encode("utf-8")
+    message = "\n".join([bucket, key, str(expires), disposition, content_type]).encode("utf-8")
+    return hmac.new(secret, message, hashlib.sha256).hexdigest()
+
+
+def verify_local_presigned(
+    bucket: str,
+    key: str,
+    expires: int,
+    signature: str,
+    disposition: str = "",
+    content_type: str = "",
+) -> bool:
+    if expires < time.time():
+        return False
+    expected = _presign_signature(bucket, key, expires, disposition, content_type)
+    return hmac.compare_digest(expected, signature)
+
+
+class LocalS3Client:
+    """
+    Subset of the boto3 S3 client API backed by <root>/<bucket>/<key>
+    files. Multipart parts are kept under <root>/.uploads/ until completed.
+    """
+
+    def __init__(self, root: Path, url_prefix: str = "/api/attachments/objects") -> None:
+        self.root = root
+        self.url_prefix = url_prefix
+
+    def _path(self, bucket: str, key: str) -> Path:
+        path = (self.root / bucket / key).resolve()
+        if self.root.resolve() not in path.parents:
+            raise LocalS3Error("InvalidKey", key)
+        return path
+
+    def object_path(self, bucket: str, key: str) -> Path:
+        return self._path(bucket, key)
+
+    def _write(self, path: Path, source) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_name(f"{path.name}.{uuid4().hex}.tmp")
+        with open(temp, "wb") as f:
+            if isinstance(source, (bytes, bytearray)):
+                f.write(source)
+            else:
+                shutil.copyfileobj(source, f)
+        os.replace(temp, path)
+
+    def put_object(self, *, Bucket: str, Key: str, Body) -> Dict[str, Any]:
+        self._write(self._path(Bucket, Key), Body)
+        return {}
+
+    def head_object(self, *, Bucket: str, Key: str) -> Dict[str, Any]:
+        path = self._path(Bucket, Key)
+        if not path.is_file():
+            raise LocalS3Error("404", Key)
+        return {"ContentLength": path.stat().st_size}
+
+    def get_object(self, *, Bucket: str, Key: str) -> Dict[str, Any]:
+        self.head_object(Bucket=Bucket, Key=Key)
+        return {"Body": open(self._path(Bucket, Key), "rb")}
+
+    def delete_object(self, *, Bucket: str, Key: str) -> Dict[str, Any]:
+        self._path(Bucket, Key).unlink(missing_ok=True)
+        return {}
+
+    def create_multipart_upload(self, *, Bucket: str, Key: str) -> Dict[str, Any]:
+        upload_id = uuid4().hex
+        (self.root / ".uploads" / upload_id).mkdir(parents=True)
+        return {"UploadId": upload_id}
+
+    def upload_part(self, *, Bucket: str, Key: str, UploadId: str, PartNumber: int, Body) -> Dict[str, Any]:
+        part = self.root / ".uploads" / UploadId / f"{PartNumber:05d}"
+        self._write(part, Body)
+        return {"ETag": f'"{hashlib.md5(part.read_bytes()).hexdigest()}"'}
+
+    def complete_multipart_upload(
+        self, *, Bucket: str, Key: str, UploadId: str, MultipartUpload: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        upload_dir = self.root / ".uploads" / UploadId
+        target = self._path(Bucket, Key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp = target.with_name(f"{target.name}.{UploadId}.tmp")
+        with open(temp, "wb") as out:
+            for part in sorted(MultipartUpload["Parts"], key=lambda p: p["PartNumber"]):
+                with open(upload_dir / f"{part['PartNumber']:05d}", "rb") as f:
+                    shutil.copyfileobj(f, out)
+        os.replace(temp, target)
+        shutil.rmtree(upload_dir, ignore_errors=True)
+        return {}
+
+    def abort_multipart_upload(self, *, Bucket: str, Key: str, UploadId: str) -> Dict[str, Any]:
+        shutil.rmtree(self.root / ".uploads" / UploadId, ignore_errors=True)
+        return {}
+
+    def list_objects_v2(self, *, Bucket: str, ContinuationToken: Optional[str] = None) -> Dict[str, Any]:
+        bucket_root = self.root / Bucket
+        contents = [
+            {
+                "Key": path.relative_to(bucket_root).as_posix(),
+                "LastModified": datetime.fromtimestamp(path.stat().st_mtime, tz=timezone.utc),
+            }
+            for path in sorted(bucket_root.rglob("*"))
+            if path.is_file() and not path.name.endswith(".tmp")
+        ]
+        return {"Contents": contents, "IsTruncated": False}
+
+    def generate_presigned_url(self, operation: str, *, Params: Dict[str, Any], ExpiresIn: int) -> str:
+        if operation != "get_object":
+            raise LocalS3Error("NotImplemented", operation)
+        bucket, key = Params["Bucket"], Params["Key"]
+        disposition = Params.get("ResponseContentDisposition", "")
+        content_type = Params.get("ResponseContentType", "")
+        expires = int(time.time()) + ExpiresIn
+        query = {
+            "expires": expires,
+            "signature": _presign_signature(bucket, key, expires, disposition, content_type),
+        }
+        if disposition:
+            query["disposition"] = disposition
+        if content_type:
+            query["content_type"] = content_type
+        return f"{self.url_prefix}/{bucket}/{quote(key)}?{urlencode(query)}"
+
+
+# ---------------------------------------------------------------------------
+# REGISTRY
+# ---------------------------------------------------------------------------
+
+def _s3_client() -> Any:
+    settings = get_settings()
+    endpoint = settings.attachment_s3_endpoint_url
+    if endpoint and endpoint.startswith(LOCAL_ENDPOINT_SCHEME):
+        return LocalS3Client(Path(endpoint[len(LOCAL_ENDPOINT_SCHEME):]))
+
+    try:
+        import boto3
+    except ImportError as exc:
+        raise StorageError(
+            "attachment_storage_backend='s3' needs boto3 (pip install boto3)"
+        ) from exc
+
+    return boto3.client(
+        "s3",
+        endpoint_url=endpoint,
+        region_name=settings.attachment_s3_region,
+        aws_access_key_id=settings.attachment_s3_access_key_id,
+        aws_secret_access_key=settings.attachment_s3_secret_access_key,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_storage_backend(name: Optional[str] = None) -> StorageBackend:
+    """
+    Backend by storage_path prefix; None = attachment_storage_backend.
+    """
+    settings = get_settings()
+    name = name or settings.attachment_storage_backend
+    if name == LocalStorage.name:
+        return LocalStorage()
+    if name == S3Storage.name:
+        if not settings.attachment_s3_bucket:
+            raise StorageError("attachment_s3_bucket is required for the s3 backend")
+        return S3Storage(
+            _s3_client(),
+            settings.attachment_s3_bucket,
+            part_size=settings.attachment_s3_multipart_part_bytes,
+            url_seconds=settings.attachment_presigned_url_seconds,
+        )
+    raise StorageError(f"Unknown attachment storage backend {name!r}")
+
+
+def backend_for(storage_path: str) -> Tuple[StorageBackend, str]:
+    """
+    (backend, key) for an Attachment.storage_path.
+    """
+    name, key = split_storage_path(storage_path)
+    return get_storage_backend(name), key
+
+
+def delete_stored(storage_path: Optional[str]) -> None:
+    """
+    Remove a stored object. Errors are logged, not raised: DB state is the
+    source of truth and the orphan sweeper (reaper.py) retries later.
+    """
+    if not storage_path:
+        return
+    try:
+        backend, key = backend_for(storage_path)
+        backend.delete(key)
+    except Exception:
+        logger.warning("attachments: could not delete %s", storage_path, exc_info=True)
@@ -0,0 +1,219 @@
+# app/modules/attachments/uploads.py
+
+"""
+Streaming multipart/form-data parser for attachment uploads.
+
+FastAPI's File()/Form() parameters make Starlette spool the whole body to
+a temporary file before the endpoint runs, so a size cap could only be
+checked after the full upload had arrived and every byte was written to
+disk twice. receive_upload() instead reads request.stream() itself:
+
+- a Content-Length beyond the cap (plus room for the form fields) is
+  rejected before any of the body is read
+- the "file" part goes straight into a StagingWriter (size + SHA-256 on
+  the way), flushed to disk on a worker thread every
+  attachment_chunk_size_bytes, and the upload is cut off with
+  UploadTooLarge as soon as it passes attachment_max_upload_bytes
+- other parts are small text fields kept in memory
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from fastapi import Request
+
+from app.core.settings import get_settings
+
+from .utils import StagedFile, StagingWriter, UploadTooLarge
+
+try:
+    from python_multipart import MultipartParser
+    from python_multipart.multipart import parse_options_header
+except ModuleNotFoundError:  # python-multipart < 0.0.13
+    from multipart import MultipartParser
+    from multipart.multipart import parse_options_header
+
+FILE_FIELD = "file"
+
+# Multipart framing and text fields on top of the file itself
+FORM_OVERHEAD_BYTES = 64 * 1024
+MAX_FIELD_BYTES = 16 * 1024
+MAX_FIELDS = 16
+
+# OpenAPI description of the body receive_upload() accepts
+UPLOAD_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": [FILE_FIELD],
+                    "properties": {
+                        FILE_FIELD: {"type": "string", "format": "binary"},
+                        "owner_type": {"type": "string"},
+                        "owner_id": {"type": "string"},
+                        "description": {"type": "string"},
+                    },
+                }
+            }
+        },
+    }
+}
+
+
+class UploadFormError(ValueError):
+    """The request body is not a usable multipart upload."""
+
+
+@dataclass
+class ReceivedUpload:
+    staged: StagedFile
+    filename: str
+    content_type: Optional[str]
+    fields: Dict[str, str]
+
+
+@dataclass
+class _Part:
+    name: str = ""
+    filename: Optional[str] = None
+    content_type: Optional[str] = None
+    data: bytearray = field(default_factory=bytearray)
+
+
+class _UploadForm:
+    """python-multipart callbacks; file bytes are buffered for the caller to flush."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.file_bytes = 0
+        self.part = _Part()
+        self.fields: Dict[str, str] = {}
+        self.file_part: Optional[_Part] = None
+        self.pending: List[bytes] = []
+        self.pending_bytes = 0
+        self._header_name = b""
+        self._header_value = b""
+        self._disposition = b""
+
+    def on_part_begin(self) -> None:
+        self.part = _Part()
+        self._disposition = b""
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        name = self._header_name.lower()
+        if name == b"content-disposition":
+            self._disposition = self._header_value
+        elif name == b"content-type":
+            self.part.content_type = self._header_value.decode("latin-1")
+        self._header_name = self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._disposition)
+        if b"name" not in options:
+            raise UploadFormError('Every part needs a Content-Disposition "name"')
+        self.part.name = options[b"name"].decode("utf-8", "replace")
+        if self.part.name == FILE_FIELD:
+            if self.file_part is not None:
+                raise UploadFormError("Only one file per upload")
+            self.part.filename = options.get(b"filename", b"upload").decode("utf-8", "replace")
+            self.file_part = self.part
+        elif len(self.fields) >= MAX_FIELDS:
+            raise UploadFormError("Too many form fields")
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self.part is self.file_part:
+            self.file_bytes += end - start
+            if self.max_bytes and self.file_bytes > self.max_bytes:
+                raise UploadTooLarge(f"Attachment exceeds {self.max_bytes} bytes")
+            self.pending.append(data[start:end])
+            self.pending_bytes += end - start
+            return
+        if len(self.part.data) + end - start > MAX_FIELD_BYTES:
+            raise UploadFormError(f"Form field {self.part.name!r} is too long")
+        self.part.data.extend(data[start:end])
+
+    def on_part_end(self) -> None:
+        if self.part is not self.file_part:
+            self.fields[self.part.name] = self.part.data.decode("utf-8", "replace")
+
+    def take_pending(self) -> bytes:
+        chunk = b"".join(self.pending)
+        self.pending.clear()
+        self.pending_bytes = 0
+        return chunk
+
+
+async def receive_upload(request: Request, max_bytes: Optional[int] = None) -> ReceivedUpload:
+    """
+    Parse a multipart upload from the request stream into a staged file.
+
+    Raises UploadTooLarge (before reading, when Content-Length already
+    says so) and UploadFormError for malformed or fileless bodies. Nothing
+    is left in staging on failure.
+    """
+    settings = get_settings()
+    if max_bytes is None:
+        max_bytes = settings.attachment_max_upload_bytes
+
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise UploadFormError("Expected multipart/form-data with a boundary")
+
+    declared = request.headers.get("content-length")
+    if max_bytes and declared and declared.isdigit() and int(declared) > max_bytes + FORM_OVERHEAD_BYTES:
+        raise UploadTooLarge(f"Attachment exceeds {max_bytes} bytes")
+
+    form = _UploadForm(max_bytes)
+    parser = MultipartParser(
+        params[b"boundary"],
+        {
+            "on_part_begin": form.on_part_begin,
+            "on_header_field": form.on_header_field,
+            "on_header_value": form.on_header_value,
+            "on_header_end": form.on_header_end,
+            "on_headers_finished": form.on_headers_finished,
+            "on_part_data": form.on_part_data,
+            "on_part_end": form.on_part_end,
+        },
+    )
+    writer = await asyncio.to_thread(StagingWriter, max_bytes)
+    try:
+        async for chunk in request.stream():
+            if not chunk:
+                continue
+            try:
+                parser.write(chunk)
+            except (UploadFormError, UploadTooLarge):
+                raise
+            except Exception as exc:
+                raise UploadFormError(f"Malformed multipart body: {exc}") from exc
+            if form.pending_bytes >= settings.attachment_chunk_size_bytes:
+                await asyncio.to_thread(writer.write, form.take_pending())
+        parser.finalize()
+
+        if form.file_part is None:
+            raise UploadFormError(f"Missing {FILE_FIELD!r} part")
+        if form.pending_bytes:
+            await asyncio.to_thread(writer.write, form.take_pending())
+        staged = await asyncio.to_thread(writer.finish)
+    except BaseException:
+        writer.abort()
+        raise
+
+    return ReceivedUpload(
+        staged=staged,
+        filename=form.file_part.filename or "upload",
+        content_type=form.file_part.content_type,
+        fields=form.fields,
+    )
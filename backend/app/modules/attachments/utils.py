@@ -2,11 +2,16 @@
 
 from __future__ import annotations
 
+import hashlib
 import os
+import shutil
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Tuple
+from typing import BinaryIO, Optional, Tuple
 from uuid import uuid4
 
+from app.core.settings import get_settings
+
 
 # ----------------------------------------------------------------------
 # Resolve project root safely (3 parents up from this file):
@@ -88,6 +93,162 @@ def save_bytes(data: bytes, original_name: str) -> Tuple[str, str, int]:
     return stored_name, relative_path, file_size
 
 
+# ----------------------------------------------------------------------
+# Content-addressed store
+#
+# Blobs live at cas/<h[0:2]>/<h[2:4]>/<sha256> under the attachments root,
+# so identical uploads share one file and no directory holds more than a
+# few thousand entries even past a million blobs. Uploads are staged under
+# .staging/ while hashing, then moved into place (or dropped, when the
+# blob already exists).
+# ----------------------------------------------------------------------
+CAS_PREFIX = "cas"
+STAGING_DIR = ".staging"
+
+# Backend of storage_path values written before backends had prefixes
+DEFAULT_STORAGE_BACKEND = "local"
+
+
+def cas_relative_path(sha256: str) -> str:
+    """
+    Storage key of the blob with the given hex SHA-256.
+    """
+    return f"{CAS_PREFIX}/{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+
+def split_storage_path(storage_path: str) -> Tuple[str, str]:
+    """
+    "s3:cas/ab/cd/<sha>" -> ("s3", "cas/ab/cd/<sha>"); unprefixed -> local.
+    """
+    backend, sep, key = storage_path.partition(":")
+    if not sep:
+        return DEFAULT_STORAGE_BACKEND, storage_path
+    return backend, key
+
+
+def join_storage_path(backend: str, key: str) -> str:
+    return f"{backend}:{key}"
+
+
+def is_cas_path(storage_path: Optional[str]) -> bool:
+    return bool(storage_path) and split_storage_path(storage_path)[1].startswith(CAS_PREFIX + "/")
+
+
+@dataclass(frozen=True)
+class StagedFile:
+    temp_path: Path
+    file_size: int
+    sha256: str
+
+    @property
+    def key(self) -> str:
+        return cas_relative_path(self.sha256)
+
+
+class UploadTooLarge(ValueError):
+    """The stream exceeded the configured maximum attachment size."""
+
+
+class StagingWriter:
+    """
+    Incremental staging: write() chunks as they arrive, then finish() for
+    the StagedFile or abort() to remove the partial file. Size and SHA-256
+    are computed on the way; a chunk that takes the total past `max_bytes`
+    raises UploadTooLarge before it is written.
+    """
+
+    def __init__(self, max_bytes: int = 0) -> None:
+        staging = get_attachments_root() / STAGING_DIR
+        staging.mkdir(exist_ok=True)
+        self.temp_path = staging / f"{uuid4().hex}.part"
+        self.max_bytes = max_bytes
+        self.file_size = 0
+        self._digest = hashlib.sha256()
+        self._file = open(self.temp_path, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        self.file_size += len(chunk)
+        if self.max_bytes and self.file_size > self.max_bytes:
+            raise UploadTooLarge(f"Attachment exceeds {self.max_bytes} bytes")
+        self._digest.update(chunk)
+        self._file.write(chunk)
+
+    def finish(self) -> StagedFile:
+        self._file.close()
+        return StagedFile(
+            temp_path=self.temp_path, file_size=self.file_size, sha256=self._digest.hexdigest()
+        )
+
+    def abort(self) -> None:
+        self._file.close()
+        self.temp_path.unlink(missing_ok=True)
+
+
+def stage_stream(
+    source: BinaryIO,
+    *,
+    chunk_size: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+) -> StagedFile:
+    """
+    Copy a file-like object to a staging file in fixed-size chunks.
+
+    Size and SHA-256 are computed as the data arrives, so memory use is one
+    chunk regardless of file size. A failed or oversized upload leaves
+    nothing behind.
+    """
+    settings = get_settings()
+    chunk_size = chunk_size or settings.attachment_chunk_size_bytes
+    if max_bytes is None:
+        max_bytes = settings.attachment_max_upload_bytes
+
+    writer = StagingWriter(max_bytes)
+    try:
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            writer.write(chunk)
+    except BaseException:
+        writer.abort()
+        raise
+
+    return writer.finish()
+
+
+def place_staged(staged: StagedFile, key: Optional[str] = None, *, keep: bool = False) -> bool:
+    """
+    Move a staged file to its content address (or `key`) under the
+    attachments root. Returns False when the blob was already stored (the
+    staged copy is dropped). With `keep` the staged copy stays (hard link,
+    or a copy across filesystems) for the caller to discard.
+    """
+    target = build_storage_path(key or staged.key)
+    if target.exists():
+        if not keep:
+            staged.temp_path.unlink(missing_ok=True)
+        return False
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if not keep:
+        os.replace(staged.temp_path, target)
+        return True
+
+    try:
+        os.link(staged.temp_path, target)
+    except FileExistsError:
+        return False
+    except OSError:
+        temp = target.with_name(f"{target.name}.{uuid4().hex}.tmp")
+        shutil.copyfile(staged.temp_path, temp)
+        os.replace(temp, target)
+    return True
+
+
+def discard_staged(staged: StagedFile) -> None:
+    staged.temp_path.unlink(missing_ok=True)
+
+
 def delete_file_if_exists(relative_path: str) -> None:
     """
     Delete a stored file if it exists.
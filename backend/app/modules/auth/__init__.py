@@ -1,2 +1,11 @@
-from .api import get_router
+# app.core.security imports auth.models, and auth.api imports app.core.security,
+# so the router is resolved on call rather than at package import.
+
+
+def get_router():
+    from .api import get_router as _get_router
+
+    return _get_router()
+
+
 __all__ = ['get_router']
@@ -1,21 +1,34 @@
 from __future__ import annotations
 
-from typing import List
-
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-
-from app.core.db import get_db
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import get_async_db
+from app.core.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    decode_cursor,
+    encode_cursor,
+    keyset_after,
+)
 from app.core.security import (
-    hash_password,
-    verify_password,
+    hash_password_async,
+    needs_rehash,
+    verify_password_async,
     create_access_token,
     create_refresh_token,
+    CurrentUser,
 )
+from app.core.settings import get_settings
 from .models import UserAccount
 from .schemas import (
     UserCreate,
     UserRead,
+    UserPage,
     LoginRequest,
     RefreshRequest,
     TokenPair,
@@ -32,30 +45,36 @@ router = APIRouter(
 # Create user (registration core function)
 # -------------------------------------------------
 @router.post("/users", response_model=UserRead)
-def create_user(data: UserCreate, db: Session = Depends(get_db)) -> UserRead:
+async def create_user(
+    data: UserCreate,
+    db: AsyncSession = Depends(get_async_db),
+) -> UserRead:
     username = data.username.lower()
     email = data.email.lower()
 
-    existing = (
-        db.query(UserAccount)
-        .filter(
+    existing = await db.scalar(
+        select(UserAccount).where(
             (UserAccount.username == username)
             | (UserAccount.email == email)
         )
-        .first()
     )
     if existing:
         raise HTTPException(status_code=400, detail="User already exists")
 
+    # bcrypt runs on the bounded password pool, off the event loop; end the
+    # read transaction first so the wait does not hold a pooled connection
+    await db.rollback()
+    password_hash = await hash_password_async(data.password)
+
     new_user = UserAccount(
         username=username,
         email=email,
-        password_hash=hash_password(data.password),
+        password_hash=password_hash,
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     return new_user
 
 
@@ -63,42 +82,89 @@ def create_user(data: UserCreate, db: Session = Depends(get_db)) -> UserRead:
 # Register (clean endpoint)  <-- NEW
 # -------------------------------------------------
 @router.post("/register", response_model=UserRead)
-def register_user(data: UserCreate, db: Session = Depends(get_db)) -> UserRead:
-    return create_user(data, db)
+async def register_user(
+    data: UserCreate,
+    db: AsyncSession = Depends(get_async_db),
+) -> UserRead:
+    return await create_user(data, db)
 
 
 # -------------------------------------------------
 # List users (temporary, open)
 # -------------------------------------------------
-@router.get("/users", response_model=List[UserRead])
-def list_users(db: Session = Depends(get_db)) -> List[UserRead]:
-    return db.query(UserAccount).all()
+@router.get("/users", response_model=UserPage)
+async def list_users(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+) -> UserPage:
+    """
+    Keyset-paginated user list ordered by (username, id). Returns
+    {items, next_cursor} rather than a bare list; pass next_cursor back
+    as ?cursor= for the next page (null on the last).
+    """
+    sort_columns = (UserAccount.username, UserAccount.id)
+    stmt = select(UserAccount).order_by(*sort_columns).limit(limit + 1)
+
+    if cursor:
+        username, raw_id = decode_cursor(cursor, len(sort_columns))
+        try:
+            last_id = UUID(raw_id)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        stmt = stmt.where(keyset_after(sort_columns, [username, last_id]))
+
+    users = (await db.scalars(stmt)).all()
+    next_cursor = None
+    if len(users) > limit:
+        users = users[:limit]
+        next_cursor = encode_cursor([users[-1].username, users[-1].id])
+
+    return UserPage(
+        items=[UserRead.model_validate(u) for u in users],
+        next_cursor=next_cursor,
+    )
 
 
 # -------------------------------------------------
 # Login -> access + refresh tokens
 # -------------------------------------------------
 @router.post("/login", response_model=TokenPair)
-def login(data: LoginRequest, db: Session = Depends(get_db)) -> TokenPair:
+async def login(
+    data: LoginRequest,
+    db: AsyncSession = Depends(get_async_db),
+) -> TokenPair:
     identifier = data.username_or_email.lower()
 
-    user = (
-        db.query(UserAccount)
-        .filter(
+    user = await db.scalar(
+        select(UserAccount).where(
             (UserAccount.username == identifier)
             | (UserAccount.email == identifier)
         )
-        .first()
     )
+    user_id = user.id if user else None
+    password_hash = user.password_hash if user else None
+
+    # End the read transaction before bcrypt: a queued hash can take
+    # seconds, and must not hold a pooled connection while it waits
+    await db.rollback()
 
-    if not user or not verify_password(data.password, user.password_hash):
+    if not user_id or not await verify_password_async(data.password, password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
         )
 
-    access_token = create_access_token(str(user.id))
-    refresh_token = create_refresh_token(str(user.id))
+    # Upgrade the stored hash when the bcrypt work factor has changed
+    if get_settings().password_rehash_on_login and needs_rehash(password_hash):
+        new_hash = await hash_password_async(data.password)
+        await db.execute(
+            update(UserAccount).where(UserAccount.id == user_id).values(password_hash=new_hash)
+        )
+        await db.commit()
+
+    access_token = create_access_token(str(user_id))
+    refresh_token = create_refresh_token(str(user_id))
 
     return TokenPair(
         access_token=access_token,
@@ -114,7 +180,10 @@ from app.core.security import decode_token
 
 
 @router.post("/refresh", response_model=TokenPair)
-def refresh_tokens(data: RefreshRequest, db: Session = Depends(get_db)) -> TokenPair:
+async def refresh_tokens(
+    data: RefreshRequest,
+    db: AsyncSession = Depends(get_async_db),
+) -> TokenPair:
     try:
         payload = decode_token(data.refresh_token)
     except JWTError:
@@ -129,14 +198,15 @@ def refresh_tokens(data: RefreshRequest, db: Session = Depends(get_db)) -> Token
             detail="Invalid token type",
         )
 
-    user_id = payload.get("sub")
-    if not user_id:
+    try:
+        user_id = UUID(payload.get("sub") or "")
+    except ValueError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token payload",
         )
 
-    user = db.query(UserAccount).filter(UserAccount.id == user_id).first()
+    user = await db.scalar(select(UserAccount).where(UserAccount.id == user_id))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -156,7 +226,7 @@ def refresh_tokens(data: RefreshRequest, db: Session = Depends(get_db)) -> Token
 # Get current user (/me)
 # -------------------------------------------------
 @router.get("/me", response_model=UserRead)
-def read_current_user(current_user: UserAccount = Depends(get_current_user)) -> UserRead:
+async def read_current_user(current_user: CurrentUser = Depends(get_current_user)) -> UserRead:
     return current_user
 
 
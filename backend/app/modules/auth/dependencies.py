@@ -3,29 +3,39 @@
 from __future__ import annotations
 
 from typing import Annotated
+from uuid import UUID
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db
-from app.core.security import decode_token
-from .models import UserAccount
+from app.core.db import get_async_db
+from app.core.security import (
+    CurrentUser,
+    cache_user,
+    decode_token,
+    fetch_current_user,
+    get_cached_user,
+)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
-def get_current_user(
-    db: Annotated[Session, Depends(get_db)],
+async def get_current_user(
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     token: Annotated[str, Depends(oauth2_scheme)],
-) -> UserAccount:
+) -> CurrentUser:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    cached = get_cached_user(token)
+    if cached is not None:
+        return cached
+
     try:
         payload = decode_token(token)
     except JWTError:
@@ -34,12 +44,18 @@ def get_current_user(
     if payload.get("type") != "access":
         raise credentials_exception
 
-    user_id = payload.get("sub")
-    if not user_id:
+    raw_sub = payload.get("sub")
+    if not raw_sub:
+        raise credentials_exception
+
+    try:
+        user_id = UUID(raw_sub)
+    except ValueError:
         raise credentials_exception
 
-    user = db.query(UserAccount).filter(UserAccount.id == user_id).first()
-    if not user:
+    user = await fetch_current_user(db, user_id)
+    if user is None:
         raise credentials_exception
 
+    cache_user(token, payload, user)
     return user
@@ -1,2 +1,11 @@
-from .api import get_router
+# dashboard.api imports every box module; resolve the router on call so the
+# mirror and rollup helpers can be imported without it (see main.lifespan).
+
+
+def get_router():
+    from .api import get_router as _get_router
+
+    return _get_router()
+
+
 __all__ = ['get_router']
@@ -1,11 +1,178 @@
-from fastapi import APIRouter
+# app/modules/dashboard/api.py
+
+from __future__ import annotations
+
+from typing import Dict, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.conditional import CACHE_CONTROL, etag_matches
+from app.core.db import get_async_db
+from app.core.models_base import Branch
+from app.core.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    decode_cursor,
+    encode_cursor,
+    keyset_after,
+)
+from app.core.security import get_current_user
+from app.modules.soldier_profile.models import ServiceMember
+
+from .mirror import BOXES_BY_NAME
+from .layout import LayoutError, resolve_layout
+from .models import DashboardBoxMirror
+from .rollup import latest_snapshot_statement
+from .schemas import DashboardSnapshotRead, DashboardSoldierPage, DashboardSoldierRow
+
+# Same sort key (and index) as the soldier-profile list
+_SORT_COLUMNS = (ServiceMember.last_name, ServiceMember.id)
 
 
 def get_router() -> APIRouter:
-    router = APIRouter()
+    router = APIRouter(
+        prefix="/api/dashboard",
+        tags=["dashboard"],
+    )
 
     @router.get("/ping")
     async def ping() -> dict:
         return {"module": "dashboard", "status": "ok"}
 
+    @router.get("/layout")
+    async def get_dashboard_layout(
+        request: Request,
+        unit_id: Optional[str] = None,
+        current_user=Depends(get_current_user),
+    ):
+        """
+        Precompiled dashboard layout (master + unit + user overrides).
+
+        Served from the resolver cache; If-None-Match with the returned
+        ETag gets 304 until a source layout changes.
+        """
+        try:
+            layout = resolve_layout(unit_id=unit_id, user_id=str(current_user.id))
+        except LayoutError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+
+        etag = f'"{layout["etag"]}"'
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        return JSONResponse(layout, headers=headers)
+
+    @router.get("/soldiers", response_model=DashboardSoldierPage)
+    async def list_dashboard_soldiers(
+        cursor: Optional[str] = None,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        branch: Optional[Branch] = None,
+        boxes: Optional[str] = Query(
+            None,
+            description="Comma-separated box names (default: all), e.g. boxes=weapons,medpros",
+        ),
+        db: AsyncSession = Depends(get_async_db),
+        current_user=Depends(get_current_user),
+    ):
+        """
+        Soldier List View: one keyset page of soldiers plus their box
+        summaries, read from dashboard_box_mirrors in a single IN query.
+        """
+        box_names = list(BOXES_BY_NAME)
+        if boxes:
+            box_names = [b.strip() for b in boxes.split(",") if b.strip()]
+            unknown = sorted(set(box_names) - set(BOXES_BY_NAME))
+            if unknown:
+                raise HTTPException(status_code=400, detail=f"Unknown boxes: {', '.join(unknown)}")
+
+        stmt = (
+            select(
+                ServiceMember.id,
+                ServiceMember.first_name,
+                ServiceMember.last_name,
+                ServiceMember.branch,
+            )
+            .order_by(*_SORT_COLUMNS)
+            .limit(limit + 1)
+        )
+        if branch is not None:
+            stmt = stmt.where(ServiceMember.branch == branch)
+        if cursor:
+            last_name, raw_id = decode_cursor(cursor, len(_SORT_COLUMNS))
+            try:
+                last_id = UUID(raw_id)
+            except (TypeError, ValueError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            stmt = stmt.where(keyset_after(_SORT_COLUMNS, [last_name, last_id]))
+
+        rows = (await db.execute(stmt)).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        summaries: Dict[UUID, Dict[str, dict]] = {row.id: {} for row in rows}
+        if rows:
+            mirrors = await db.execute(
+                select(
+                    DashboardBoxMirror.soldier_id,
+                    DashboardBoxMirror.box_name,
+                    DashboardBoxMirror.summary,
+                ).where(
+                    DashboardBoxMirror.soldier_id.in_(list(summaries)),
+                    DashboardBoxMirror.box_name.in_(box_names),
+                    DashboardBoxMirror.is_active.is_(True),
+                )
+            )
+            for soldier_id, box_name, summary in mirrors:
+                summaries[soldier_id][box_name] = summary
+
+        items = [
+            DashboardSoldierRow(
+                id=row.id,
+                first_name=row.first_name,
+                last_name=row.last_name,
+                branch=row.branch,
+                boxes=summaries[row.id],
+            )
+            for row in rows
+        ]
+        next_cursor = None
+        if has_more:
+            next_cursor = encode_cursor([rows[-1].last_name, rows[-1].id])
+
+        return DashboardSoldierPage(items=items, next_cursor=next_cursor)
+
+    @router.get("/snapshot", response_model=DashboardSnapshotRead)
+    async def get_dashboard_snapshot(
+        request: Request,
+        response: Response,
+        db: AsyncSession = Depends(get_async_db),
+        current_user=Depends(get_current_user),
+    ):
+        """
+        Latest precomputed rollup for the current user's soldiers.
+
+        Snapshots are immutable, so the ETag is the snapshot id; clients
+        sending it back in If-None-Match get 304 until the next rollup.
+        Snapshots are only written by the rollup schedule or CLI, never
+        by this read; 404 until the first pass has covered this user.
+        """
+        snapshot = await db.scalar(latest_snapshot_statement(current_user.id))
+        if snapshot is None:
+            raise HTTPException(status_code=404, detail="No dashboard snapshot yet")
+
+        headers = {
+            "ETag": f'"{snapshot.id.hex}"',
+            "Last-Modified": snapshot.snapshot_timestamp.strftime("%a, %d %b %Y %H:%M:%S GMT"),
+            "Cache-Control": CACHE_CONTROL,
+        }
+        if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+
+        response.headers.update(headers)
+        return snapshot
+
     return router
@@ -0,0 +1,60 @@
+# app/modules/dashboard/cli.py
+
+"""
+Command-line tools for the dashboard module (run from backend/).
+
+    python -m app.modules.dashboard.cli rebuild-mirrors [--box weapons]
+    python -m app.modules.dashboard.cli snapshot [--compact]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import date
+from typing import List, Optional
+
+
+def _cmd_rebuild_mirrors(args: argparse.Namespace) -> None:
+    from .mirror import rebuild_mirrors
+
+    started = time.perf_counter()
+    written = rebuild_mirrors(args.box)
+    for name, count in written.items():
+        print(f"[mirrors] {name}: {count} soldiers")
+    print(f"[mirrors] rebuilt in {time.perf_counter() - started:.2f}s")
+
+
+def _cmd_snapshot(args: argparse.Namespace) -> None:
+    from app.core.db import engine
+
+    from .rollup import compact_snapshots, write_snapshots
+
+    with engine.begin() as conn:
+        written = write_snapshots(conn, args.as_of)
+        print(f"[snapshots] wrote {written}")
+        if args.compact:
+            print(f"[snapshots] compacted {compact_snapshots(conn)}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from .mirror import BOXES_BY_NAME
+
+    parser = argparse.ArgumentParser(prog="python -m app.modules.dashboard.cli")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = sub.add_parser("rebuild-mirrors", help="recompute every DashboardBoxMirror")
+    rebuild.add_argument("--box", action="append", choices=sorted(BOXES_BY_NAME))
+    rebuild.set_defaults(func=_cmd_rebuild_mirrors)
+
+    snapshot = sub.add_parser("snapshot", help="write a DashboardSnapshot per user now")
+    snapshot.add_argument("--as-of", type=date.fromisoformat, default=None)
+    snapshot.add_argument("--compact", action="store_true", help="also compact old hourly snapshots")
+    snapshot.set_defaults(func=_cmd_snapshot)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
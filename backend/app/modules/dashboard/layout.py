@@ -0,0 +1,206 @@
+# app/modules/dashboard/layout.py
+
+"""
+Dashboard layout resolver.
+
+Merges three JSON sources into one compiled layout:
+
+    config/dashboard_master.json                       master (all boxes)
+    config/dashboard_layouts/units/<unit_id>.json      unit overrides
+    config/dashboard_layouts/users/<user_id>.json      user preferences
+
+(see config/example_unit_dashboard_layout.json and
+config/example_user_dashboard_layout.json for the file shapes)
+
+Merge rules:
+- box order is the master order, replaced by a unit then user "order" list
+- unit "overrides" and user "preferences" patch box settings by name
+- a box locked by the master cannot be changed by the unit; a box locked by
+  the master or the unit cannot be changed by the user
+- "hidden": true removes a box
+
+Compiled layouts are cached per (unit, user), keyed by the source versions
+and file signatures (mtime + size), so an edit to any source file produces
+a new key and the next request recompiles.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.cache import TTLCache
+from app.core.settings import get_config_dir
+
+LAYOUT_CACHE_MAX_ENTRIES = 1024
+LAYOUT_CACHE_TTL_SECONDS = 24 * 3600
+
+# Unit / user ids become file names; keep them to a safe alphabet
+_SAFE_ID = re.compile(r"^[A-Za-z0-9_.-]{1,64}$")
+
+Signature = Tuple[int, int]  # (mtime_ns, size); (0, 0) when the file is absent
+
+
+class LayoutError(ValueError):
+    """A layout source file is not valid JSON or has the wrong shape."""
+
+
+# ---------------------------------------------------------------------------
+# SOURCES
+# ---------------------------------------------------------------------------
+
+def master_path() -> Path:
+    return get_config_dir() / "dashboard_master.json"
+
+
+def override_path(kind: str, owner_id: Optional[str]) -> Optional[Path]:
+    if not owner_id:
+        return None
+    if not _SAFE_ID.match(owner_id):
+        raise LayoutError(f"Invalid {kind} id {owner_id!r}")
+    return get_config_dir() / "dashboard_layouts" / f"{kind}s" / f"{owner_id}.json"
+
+
+def _signature(path: Optional[Path]) -> Signature:
+    if path is None:
+        return (0, 0)
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return (0, 0)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+# Parsed files, keyed by (path, signature) so edits are picked up
+_file_cache: Dict[Tuple[Path, Signature], Dict[str, Any]] = {}
+_file_lock = threading.Lock()
+
+
+def _read_json(path: Optional[Path], signature: Signature) -> Dict[str, Any]:
+    if path is None or signature == (0, 0):
+        return {}
+
+    with _file_lock:
+        cached = _file_cache.get((path, signature))
+    if cached is not None:
+        return cached
+
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as exc:
+        raise LayoutError(f"{path.name}: {exc}") from exc
+    if not isinstance(data, dict):
+        raise LayoutError(f"{path.name}: expected a JSON object")
+
+    with _file_lock:
+        # Drop older parses of the same file
+        for key in [k for k in _file_cache if k[0] == path]:
+            del _file_cache[key]
+        _file_cache[(path, signature)] = data
+    return data
+
+
+# ---------------------------------------------------------------------------
+# MERGE
+# ---------------------------------------------------------------------------
+
+def _apply_layer(
+    boxes: Dict[str, Dict[str, Any]],
+    order: List[str],
+    patches: Dict[str, Any],
+    layer_order: Optional[List[str]],
+    layer: str,
+) -> List[str]:
+    for name, patch in (patches or {}).items():
+        box = boxes.get(name)
+        if box is None or not isinstance(patch, dict) or box.get("locked"):
+            continue
+        box.update({k: v for k, v in patch.items() if k != "locked" or layer == "unit"})
+
+    if layer_order:
+        known = [name for name in layer_order if name in boxes]
+        order = known + [name for name in order if name not in known]
+    return order
+
+
+def compile_layout(
+    master: Dict[str, Any],
+    unit: Dict[str, Any],
+    user: Dict[str, Any],
+) -> Dict[str, Any]:
+    master_boxes = master.get("boxes")
+    if not isinstance(master_boxes, dict):
+        raise LayoutError("dashboard_master.json: 'boxes' must be an object")
+
+    boxes = {name: dict(settings) for name, settings in master_boxes.items()}
+    order = list(boxes)
+
+    order = _apply_layer(boxes, order, unit.get("overrides"), unit.get("order"), "unit")
+    order = _apply_layer(boxes, order, user.get("preferences"), user.get("order"), "user")
+
+    compiled_boxes = [
+        {"name": name, **boxes[name]}
+        for name in order
+        if not boxes[name].get("hidden")
+    ]
+    versions = {
+        "master": master.get("version", 0),
+        "unit": unit.get("version", 0),
+        "user": user.get("version", 0),
+    }
+    body = json.dumps({"versions": versions, "boxes": compiled_boxes}, sort_keys=True)
+
+    return {
+        "versions": versions,
+        "unit_id": unit.get("unit_id"),
+        "user_id": user.get("user_id"),
+        "boxes": compiled_boxes,
+        "etag": hashlib.sha256(body.encode("utf-8")).hexdigest()[:32],
+    }
+
+
+# ---------------------------------------------------------------------------
+# CACHED RESOLVER
+# ---------------------------------------------------------------------------
+
+_layout_cache: TTLCache[Dict[str, Any]] = TTLCache(
+    max_entries=LAYOUT_CACHE_MAX_ENTRIES,
+    default_ttl=LAYOUT_CACHE_TTL_SECONDS,
+)
+
+
+def resolve_layout(unit_id: Optional[str] = None, user_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Compiled layout for (unit_id, user_id). Each call stats the three source
+    files; parsing and merging only happen when a version or file changed.
+    """
+    paths = (master_path(), override_path("unit", unit_id), override_path("user", user_id))
+    signatures = tuple(_signature(path) for path in paths)
+    if signatures[0] == (0, 0):
+        raise LayoutError(f"{paths[0]} not found")
+
+    master, unit, user = (_read_json(p, s) for p, s in zip(paths, signatures))
+    key = (
+        unit_id,
+        user_id,
+        master.get("version", 0),
+        unit.get("version", 0),
+        user.get("version", 0),
+        signatures,
+    )
+
+    compiled = _layout_cache.get(key)
+    if compiled is None:
+        compiled = compile_layout(master, unit, user)
+        _layout_cache.set(key, compiled)
+    return compiled
+
+
+def clear_layout_cache() -> None:
+    _layout_cache.clear()
+    with _file_lock:
+        _file_cache.clear()
@@ -0,0 +1,453 @@
+# app/modules/dashboard/mirror.py
+
+"""
+Incremental refresh of DashboardBoxMirror (per-soldier box summaries).
+
+The Soldier List View reads one indexed table (dashboard_box_mirrors)
+instead of joining every module. Mirrors are kept current by:
+
+- session hooks: when a committed ORM flush touches a source table
+  (fitness, weapons, medpros, tasks, training) the affected
+  (soldier_id, box_name) pairs are queued
+- MirrorRefreshQueue: collects pairs until writes have been quiet for
+  `dashboard_mirror_debounce_seconds` (capped at
+  `dashboard_mirror_max_delay_seconds`), then recomputes each box for all
+  queued soldiers with one grouped query per chunk and writes the results
+  with one upsert (executemany)
+- rebuild_mirrors(): full rebuild, one transaction per box
+
+Core/bulk writers that bypass the ORM call mark_dirty(box, soldier_ids).
+
+Full rebuild (from backend/):
+    python -m app.modules.dashboard.cli rebuild-mirrors [--box weapons]
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
+from importlib import import_module
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import Table, case, delete, event, func, inspect, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.core.db import engine as default_engine
+from app.core.settings import get_settings
+from app.core.upsert import upsert_insert
+
+from .models import DashboardBoxMirror
+
+logger = logging.getLogger("mlt.dashboard.mirror")
+
+MIRROR_CHUNK_SIZE = 500
+
+Summarizer = Callable[[Connection, Table, List[UUID]], Dict[UUID, Dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class MirrorBox:
+    name: str
+    model: str                  # "app.modules.<name>.models:<Class>"
+    table_name: str             # matched against flushed instances
+    soldier_column: str
+    summarize: Summarizer
+
+
+# ---------------------------------------------------------------------------
+# SUMMARIZERS (one grouped query per chunk of soldiers)
+# ---------------------------------------------------------------------------
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _latest_rows(
+    conn: Connection,
+    table: Table,
+    soldier_column: str,
+    soldier_ids: List[UUID],
+    order_column: str,
+    fields: Tuple[str, ...],
+) -> Dict[UUID, Dict[str, Any]]:
+    """
+    Latest row per soldier (ROW_NUMBER over soldier ORDER BY order_column).
+    """
+    soldier = table.c[soldier_column]
+    ranked = (
+        select(
+            soldier.label("soldier_id"),
+            *(table.c[name] for name in fields),
+            func.row_number()
+            .over(
+                partition_by=soldier,
+                order_by=(table.c[order_column].desc(), table.c.created_at.desc()),
+            )
+            .label("rn"),
+        )
+        .where(soldier.in_(soldier_ids), table.c.is_deleted.is_(False))
+        .subquery()
+    )
+    rows = conn.execute(select(ranked).where(ranked.c.rn == 1))
+    return {
+        row.soldier_id: {name: _jsonable(row._mapping[name]) for name in fields}
+        for row in rows
+    }
+
+
+def _color_counts(
+    conn: Connection,
+    table: Table,
+    soldier_column: str,
+    soldier_ids: List[UUID],
+    date_column: str,
+    open_filter=None,
+) -> Dict[UUID, Dict[str, Any]]:
+    """
+    Per-soldier count by status_color plus the nearest date.
+    """
+    soldier = table.c[soldier_column]
+    stmt = (
+        select(
+            soldier.label("soldier_id"),
+            table.c.status_color,
+            func.count().label("n"),
+            func.min(table.c[date_column]).label("next_date"),
+        )
+        .where(soldier.in_(soldier_ids), table.c.is_deleted.is_(False))
+        .group_by(soldier, table.c.status_color)
+    )
+    if open_filter is not None:
+        stmt = stmt.where(open_filter(table))
+
+    summaries: Dict[UUID, Dict[str, Any]] = {}
+    for row in conn.execute(stmt):
+        summary = summaries.setdefault(
+            row.soldier_id, {"total": 0, "by_color": {}, f"next_{date_column}": None}
+        )
+        color = _jsonable(row.status_color) or "NONE"
+        summary["by_color"][color] = summary["by_color"].get(color, 0) + row.n
+        summary["total"] += row.n
+        next_key = f"next_{date_column}"
+        if row.next_date is not None and (
+            summary[next_key] is None or row.next_date.isoformat() < summary[next_key]
+        ):
+            summary[next_key] = row.next_date.isoformat()
+    return summaries
+
+
+def _summarize_fitness(conn, table, soldier_ids):
+    return _latest_rows(
+        conn, table, "service_member_id", soldier_ids, "test_date",
+        ("test_type", "test_date", "total_score", "passed", "expiration_date", "status_color"),
+    )
+
+
+def _summarize_medpros(conn, table, soldier_ids):
+    return _latest_rows(
+        conn, table, "service_member_id", soldier_ids, "updated_at",
+        ("pha_date", "dental_class", "mrc"),
+    )
+
+
+def _summarize_weapons(conn, table, soldier_ids):
+    soldier = table.c.service_member_id
+    stmt = (
+        select(
+            soldier.label("soldier_id"),
+            func.count().label("qualifications"),
+            func.sum(case((table.c.passed.is_(False), 1), else_=0)).label("failed"),
+            func.max(table.c.qual_date).label("last_qual_date"),
+            func.min(table.c.expiration_date).label("next_expiration_date"),
+        )
+        .where(soldier.in_(soldier_ids), table.c.is_deleted.is_(False))
+        .group_by(soldier)
+    )
+    return {
+        row.soldier_id: {
+            name: _jsonable(row._mapping[name])
+            for name in ("qualifications", "failed", "last_qual_date", "next_expiration_date")
+        }
+        for row in conn.execute(stmt)
+    }
+
+
+def _summarize_tasks(conn, table, soldier_ids):
+    return _color_counts(
+        conn, table, "soldier_id", soldier_ids, "suspense_date",
+        open_filter=lambda t: t.c.is_completed.is_(False),
+    )
+
+
+def _summarize_training(conn, table, soldier_ids):
+    return _color_counts(conn, table, "soldier_id", soldier_ids, "expiration_date")
+
+
+BOXES: Tuple[MirrorBox, ...] = (
+    MirrorBox(
+        name="physical_fitness",
+        model="app.modules.physical_fitness.models:PhysicalFitnessTest",
+        table_name="physical_fitness_tests",
+        soldier_column="service_member_id",
+        summarize=_summarize_fitness,
+    ),
+    MirrorBox(
+        name="weapons",
+        model="app.modules.weapons.models:WeaponQualification",
+        table_name="weapon_qualifications",
+        soldier_column="service_member_id",
+        summarize=_summarize_weapons,
+    ),
+    MirrorBox(
+        name="medpros",
+        model="app.modules.medpros.models:MedprosStatus",
+        table_name="medpros_status",
+        soldier_column="service_member_id",
+        summarize=_summarize_medpros,
+    ),
+    MirrorBox(
+        name="tasking",
+        model="app.modules.tasking.models:TaskEntry",
+        table_name="task_entries",
+        soldier_column="soldier_id",
+        summarize=_summarize_tasks,
+    ),
+    MirrorBox(
+        name="training",
+        model="app.modules.training.models:TrainingEntry",
+        table_name="training_entries",
+        soldier_column="soldier_id",
+        summarize=_summarize_training,
+    ),
+)
+
+BOXES_BY_NAME: Dict[str, MirrorBox] = {box.name: box for box in BOXES}
+_BOXES_BY_TABLE: Dict[str, MirrorBox] = {box.table_name: box for box in BOXES}
+
+
+# ---------------------------------------------------------------------------
+# REFRESH
+# ---------------------------------------------------------------------------
+
+def _load_table(box: MirrorBox) -> Optional[Table]:
+    module_path, _, class_name = box.model.partition(":")
+    try:
+        model = getattr(import_module(module_path), class_name)
+    except (ImportError, AttributeError) as exc:
+        logger.warning("mirror: skipping box %s (%s)", box.name, exc)
+        return None
+    return model.__table__
+
+
+def _upsert_mirrors(conn: Connection, box_name: str, summaries: Dict[UUID, Dict[str, Any]]) -> None:
+    stmt = upsert_insert(conn, DashboardBoxMirror.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["soldier_id", "box_name"],
+        set_={"summary": stmt.excluded.summary, "is_active": True, "updated_at": datetime.utcnow()},
+    )
+    conn.execute(
+        stmt,
+        [
+            {"soldier_id": soldier_id, "box_name": box_name, "summary": summary}
+            for soldier_id, summary in summaries.items()
+        ],
+    )
+
+
+def refresh_mirrors(conn: Connection, box_name: str, soldier_ids: Iterable[UUID]) -> int:
+    """
+    Recompute one box for the given soldiers. Soldiers with no source rows
+    lose their mirror. Returns the number of mirrors written.
+    """
+    box = BOXES_BY_NAME[box_name]
+    table = _load_table(box)
+    if table is None or not inspect(conn).has_table(table.name):
+        return 0
+
+    mirrors = DashboardBoxMirror.__table__
+    ids = list(soldier_ids)
+    written = 0
+
+    for start in range(0, len(ids), MIRROR_CHUNK_SIZE):
+        chunk = ids[start:start + MIRROR_CHUNK_SIZE]
+        summaries = box.summarize(conn, table, chunk)
+
+        gone = [sid for sid in chunk if sid not in summaries]
+        if gone:
+            conn.execute(
+                delete(mirrors).where(mirrors.c.box_name == box_name, mirrors.c.soldier_id.in_(gone))
+            )
+        if summaries:
+            _upsert_mirrors(conn, box_name, summaries)
+            written += len(summaries)
+
+    return written
+
+
+def rebuild_mirrors(box_names: Optional[Iterable[str]] = None, *, bind: Optional[Engine] = None) -> Dict[str, int]:
+    """
+    Drop and recompute every mirror of each box, one transaction per box so
+    readers never see a half-built box.
+    """
+    bind = bind or default_engine
+    mirrors = DashboardBoxMirror.__table__
+    written: Dict[str, int] = {}
+
+    for name in box_names or BOXES_BY_NAME:
+        box = BOXES_BY_NAME[name]
+        table = _load_table(box)
+        if table is None:
+            continue
+
+        with bind.begin() as conn:
+            if not inspect(conn).has_table(table.name):
+                continue
+            conn.execute(delete(mirrors).where(mirrors.c.box_name == name))
+            soldier_ids = list(
+                conn.execute(select(table.c[box.soldier_column]).distinct()).scalars()
+            )
+            written[name] = refresh_mirrors(conn, name, soldier_ids)
+
+    return written
+
+
+# ---------------------------------------------------------------------------
+# DEBOUNCED QUEUE
+# ---------------------------------------------------------------------------
+
+class MirrorRefreshQueue:
+    """
+    Collects dirty (box_name, soldier_id) pairs and refreshes them in one
+    batch once no change has arrived for `dashboard_mirror_debounce_seconds`
+    (or `dashboard_mirror_max_delay_seconds` after the first pending change,
+    whichever is sooner), so a burst of edits to one soldier (or a
+    roster-wide import) costs one recompute per box rather than one per row.
+
+    One timer thread is armed per batch; a mark only records the time, and
+    the timer re-arms itself until the quiet period has actually passed.
+    """
+
+    def __init__(self, bind: Optional[Engine] = None) -> None:
+        self.bind = bind
+        self._pending: Dict[str, Set[UUID]] = {}
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._first_mark = 0.0
+        self._last_mark = 0.0
+
+    def _arm(self, delay: float) -> None:
+        self._timer = threading.Timer(max(delay, 0.0), self._on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _due(self) -> float:
+        settings = get_settings()
+        return min(
+            self._last_mark + settings.dashboard_mirror_debounce_seconds,
+            self._first_mark + settings.dashboard_mirror_max_delay_seconds,
+        )
+
+    def mark_dirty(self, box_name: str, soldier_ids: Iterable[UUID]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._pending.setdefault(box_name, set()).update(soldier_ids)
+            self._last_mark = now
+            if self._timer is None:
+                self._first_mark = now
+                self._arm(self._due() - now)
+
+    def _on_timer(self) -> None:
+        with self._lock:
+            remaining = self._due() - time.monotonic()
+            if remaining > 0:
+                self._arm(remaining)
+                return
+        self.flush()
+
+    def flush(self) -> Dict[str, int]:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        written: Dict[str, int] = {}
+        if not pending:
+            return written
+
+        try:
+            with (self.bind or default_engine).begin() as conn:
+                for box_name, soldier_ids in pending.items():
+                    written[box_name] = refresh_mirrors(conn, box_name, soldier_ids)
+        except Exception:
+            logger.exception("mirror: refresh failed; %d boxes left stale", len(pending))
+        return written
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(ids) for ids in self._pending.values())
+
+
+mirror_queue = MirrorRefreshQueue()
+
+
+def mark_dirty(box_name: str, soldier_ids: Iterable[UUID]) -> None:
+    mirror_queue.mark_dirty(box_name, soldier_ids)
+
+
+# ---------------------------------------------------------------------------
+# SESSION HOOKS
+# ---------------------------------------------------------------------------
+
+_INFO_KEY = "dashboard_mirror_dirty"
+
+
+def _collect_dirty(session: Session, flush_context, instances) -> None:
+    dirty = session.info.setdefault(_INFO_KEY, set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        box = _BOXES_BY_TABLE.get(getattr(obj, "__tablename__", None))
+        if box is None:
+            continue
+        # Current owner plus the previous one if the row moved soldiers
+        history = inspect(obj).attrs[box.soldier_column].history
+        for soldier_id in (*history.unchanged, *history.added, *history.deleted):
+            if soldier_id is not None:
+                dirty.add((box.name, soldier_id))
+
+
+def _enqueue_dirty(session: Session) -> None:
+    by_box: Dict[str, Set[UUID]] = {}
+    for box_name, soldier_id in session.info.pop(_INFO_KEY, ()):
+        by_box.setdefault(box_name, set()).add(soldier_id)
+    for box_name, soldier_ids in by_box.items():
+        mirror_queue.mark_dirty(box_name, soldier_ids)
+
+
+def _discard_dirty(session: Session) -> None:
+    session.info.pop(_INFO_KEY, None)
+
+
+_hooks_installed = False
+
+
+def install_mirror_hooks() -> None:
+    """
+    Listen on every Session (sync and async) for source-table changes.
+    """
+    global _hooks_installed
+    if _hooks_installed:
+        return
+    event.listen(Session, "before_flush", _collect_dirty)
+    event.listen(Session, "after_commit", _enqueue_dirty)
+    event.listen(Session, "after_soft_rollback", lambda session, previous: _discard_dirty(session))
+    _hooks_installed = True
@@ -13,19 +13,21 @@ from sqlalchemy import (
     ForeignKey,
     JSON,
     Boolean,
+    Index,
+    UniqueConstraint,
 )
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 
-from app.core.db import Base
-from app.core.models_base import BaseModelMixin, Branch, Role
+from app.core.models_base import BaseModel, Branch, Role
+from app.modules.soldier_profile.models import ServiceMember
 
 
 # ---------------------------------------------------------------------------
 # MODEL: DashboardSnapshot
 # ---------------------------------------------------------------------------
 
-class DashboardSnapshot(BaseModelMixin, Base):
+class DashboardSnapshot(BaseModel):
     """
     Stores computed summary metrics for a user.
     Cached per (user_id, unit_id, timestamp).
@@ -69,6 +71,11 @@ class DashboardSnapshot(BaseModelMixin, Base):
         default=dict,
     )
 
+    # Latest-snapshot lookups and daily compaction scan this key
+    __table_args__ = (
+        Index("ix_dashboard_snapshots_user_ts", "user_id", "snapshot_timestamp"),
+    )
+
     def __repr__(self) -> str:
         return f"<DashboardSnapshot id={self.id} user={self.user_id}>"
 
@@ -77,7 +84,7 @@ class DashboardSnapshot(BaseModelMixin, Base):
 # MODEL: DashboardBoxMirror
 # ---------------------------------------------------------------------------
 
-class DashboardBoxMirror(BaseModelMixin, Base):
+class DashboardBoxMirror(BaseModel):
     """
     Per-soldier cached summary blob for each box.
 
@@ -95,7 +102,7 @@ class DashboardBoxMirror(BaseModelMixin, Base):
 
     soldier_id: Mapped[uuid.UUID] = mapped_column(
         PGUUID(as_uuid=True),
-        ForeignKey("soldiers.id", ondelete="CASCADE"),
+        ForeignKey(ServiceMember.id, ondelete="CASCADE"),
         index=True,
         nullable=False,
     )
@@ -118,5 +125,10 @@ class DashboardBoxMirror(BaseModelMixin, Base):
         default=True,
     )
 
+    # One mirror per (soldier, box); refreshes upsert on this key
+    __table_args__ = (
+        UniqueConstraint("soldier_id", "box_name", name="uq_dashboard_box_mirror_soldier_box"),
+    )
+
     def __repr__(self) -> str:
         return f"<DashboardBoxMirror id={self.id} soldier={self.soldier_id} box={self.box_name}>"
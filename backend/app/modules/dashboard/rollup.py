@@ -0,0 +1,247 @@
+# app/modules/dashboard/rollup.py
+
+"""
+DashboardSnapshot rollups.
+
+Commander dashboards read a precomputed snapshot instead of aggregating
+every module table on each refresh. One rollup pass runs a grouped
+aggregate per status-color tracker (see app.core.status_colors.RULES),
+grouped by the soldiers' owning user, and writes one snapshot per user:
+
+    metrics = {
+        "as_of": "2025-06-01",
+        "soldiers": 42,
+        "ready_soldiers": 37,
+        "readiness_pct": 88.1,          # soldiers with no RED/EXPIRED item
+        "overdue_total": 9,
+        "trackers": {
+            "hr_metrics": {"total": 120, "by_color": {...}, "overdue": 4, "green_pct": 71.7},
+            ...
+        },
+    }
+
+Snapshots are written every `dashboard_snapshot_interval_minutes` (off by
+default; enable it in a single process, or run the CLI below from cron)
+and never on read. Those older than
+`dashboard_snapshot_hourly_retention_days` are compacted to the last
+snapshot of each day.
+
+Manual run (from backend/):
+    python -m app.modules.dashboard.cli snapshot [--compact]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import case, delete, exists, func, insert, inspect, select, union
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.db import engine as default_engine
+from app.core.settings import get_settings
+from app.core.status_colors import RULES, load_rule_table
+from app.modules.soldier_profile.models import ServiceMember
+
+from .models import DashboardSnapshot
+
+logger = logging.getLogger("mlt.dashboard.rollup")
+
+NOT_READY_COLORS = ("RED", "EXPIRED")
+
+
+def _pct(part: int, whole: int) -> float:
+    return round(100.0 * part / whole, 1) if whole else 0.0
+
+
+def _color_name(value: Any) -> str:
+    if value is None:
+        return "NONE"
+    return getattr(value, "value", value)
+
+
+# ---------------------------------------------------------------------------
+# ROLLUP
+# ---------------------------------------------------------------------------
+
+def compute_rollups(
+    conn: Connection,
+    as_of: Optional[date] = None,
+    owner_ids: Optional[Iterable[UUID]] = None,
+) -> Dict[UUID, Dict[str, Any]]:
+    """
+    Compute metrics for every owning user (or just `owner_ids`) with one
+    grouped query per tracker, one for soldier totals and one for readiness.
+    """
+    as_of = as_of or datetime.now(timezone.utc).date()
+    owner = ServiceMember.__table__.c.owner_user_id
+    soldiers = ServiceMember.__table__
+
+    def scoped(stmt):
+        stmt = stmt.where(owner.is_not(None))
+        if owner_ids is not None:
+            stmt = stmt.where(owner.in_(list(owner_ids)))
+        return stmt
+
+    metrics: Dict[UUID, Dict[str, Any]] = {}
+    totals = conn.execute(
+        scoped(select(owner, func.count().label("n")).group_by(owner))
+    )
+    for row in totals:
+        metrics[row.owner_user_id] = {
+            "as_of": as_of.isoformat(),
+            "soldiers": row.n,
+            "ready_soldiers": row.n,
+            "readiness_pct": 100.0,
+            "overdue_total": 0,
+            "trackers": {},
+        }
+
+    not_ready = []
+    for rule in RULES:
+        table = load_rule_table(rule)
+        if table is None or not inspect(conn).has_table(table.name):
+            continue
+
+        soldier = table.c[rule.soldier_column]
+        overdue = table.c[rule.date_column] < as_of
+        if rule.closed is not None:
+            overdue = overdue & ~rule.closed(table)
+
+        stmt = scoped(
+            select(
+                owner,
+                table.c.status_color,
+                func.count().label("n"),
+                func.sum(case((overdue, 1), else_=0)).label("overdue"),
+            )
+            .select_from(table.join(soldiers, soldiers.c.id == soldier))
+            .where(table.c.is_deleted.is_(False))
+            .group_by(owner, table.c.status_color)
+        )
+        for row in conn.execute(stmt):
+            user_metrics = metrics.get(row.owner_user_id)
+            if user_metrics is None:
+                continue
+            tracker = user_metrics["trackers"].setdefault(
+                rule.name, {"total": 0, "by_color": {}, "overdue": 0, "green_pct": 0.0}
+            )
+            color = _color_name(row.status_color)
+            tracker["by_color"][color] = tracker["by_color"].get(color, 0) + row.n
+            tracker["total"] += row.n
+            tracker["overdue"] += row.overdue or 0
+            user_metrics["overdue_total"] += row.overdue or 0
+
+        not_ready.append(
+            scoped(
+                select(owner.label("owner_user_id"), soldier.label("soldier_id"))
+                .select_from(table.join(soldiers, soldiers.c.id == soldier))
+                .where(
+                    table.c.is_deleted.is_(False),
+                    table.c.status_color.in_(NOT_READY_COLORS),
+                )
+            )
+        )
+
+    if not_ready:
+        flagged = union(*not_ready).subquery()
+        counts = conn.execute(
+            select(flagged.c.owner_user_id, func.count().label("n"))
+            .group_by(flagged.c.owner_user_id)
+        )
+        for row in counts:
+            user_metrics = metrics.get(row.owner_user_id)
+            if user_metrics is not None:
+                user_metrics["ready_soldiers"] = user_metrics["soldiers"] - row.n
+
+    for user_metrics in metrics.values():
+        user_metrics["readiness_pct"] = _pct(user_metrics["ready_soldiers"], user_metrics["soldiers"])
+        for tracker in user_metrics["trackers"].values():
+            tracker["green_pct"] = _pct(tracker["by_color"].get("GREEN", 0), tracker["total"])
+
+    return metrics
+
+
+def write_snapshots(
+    conn: Connection,
+    as_of: Optional[date] = None,
+    owner_ids: Optional[Iterable[UUID]] = None,
+) -> int:
+    """
+    Compute rollups and insert one snapshot per user (single executemany).
+    """
+    metrics = compute_rollups(conn, as_of, owner_ids)
+    if metrics:
+        now = datetime.utcnow()
+        conn.execute(
+            insert(DashboardSnapshot.__table__),
+            [
+                {"user_id": user_id, "snapshot_timestamp": now, "metrics": user_metrics}
+                for user_id, user_metrics in metrics.items()
+            ],
+        )
+    return len(metrics)
+
+
+def compact_snapshots(conn: Connection, older_than: Optional[datetime] = None) -> int:
+    """
+    Keep only the last snapshot per (user, unit, day) for snapshots older
+    than `older_than` (default: now - dashboard_snapshot_hourly_retention_days).
+    """
+    if older_than is None:
+        days = get_settings().dashboard_snapshot_hourly_retention_days
+        older_than = datetime.utcnow() - timedelta(days=days)
+
+    snapshots = DashboardSnapshot.__table__
+    later = snapshots.alias("later")
+    stmt = delete(snapshots).where(
+        snapshots.c.snapshot_timestamp < older_than,
+        exists().where(
+            later.c.user_id == snapshots.c.user_id,
+            later.c.unit_id.is_not_distinct_from(snapshots.c.unit_id),
+            func.date(later.c.snapshot_timestamp) == func.date(snapshots.c.snapshot_timestamp),
+            later.c.snapshot_timestamp > snapshots.c.snapshot_timestamp,
+        ),
+    )
+    return conn.execute(stmt).rowcount
+
+
+def latest_snapshot_statement(user_id: UUID, unit_id: Optional[UUID] = None):
+    snapshots = DashboardSnapshot
+    return (
+        select(snapshots)
+        .where(
+            snapshots.user_id == user_id,
+            snapshots.unit_id.is_not_distinct_from(unit_id),
+        )
+        .order_by(snapshots.snapshot_timestamp.desc())
+        .limit(1)
+    )
+
+
+# ---------------------------------------------------------------------------
+# SCHEDULE
+# ---------------------------------------------------------------------------
+
+def run_snapshot_pass(bind: Optional[Engine] = None) -> Dict[str, int]:
+    with (bind or default_engine).begin() as conn:
+        written = write_snapshots(conn)
+        compacted = compact_snapshots(conn)
+    logger.info("dashboard snapshots: wrote %d, compacted %d", written, compacted)
+    return {"written": written, "compacted": compacted}
+
+
+async def run_snapshot_schedule(interval_minutes: int) -> None:
+    """
+    Write snapshots every `interval_minutes`. Started from the app lifespan
+    when Settings.dashboard_snapshot_interval_minutes is set.
+    """
+    while True:
+        await asyncio.sleep(interval_minutes * 60)
+        try:
+            await asyncio.to_thread(run_snapshot_pass)
+        except Exception:  # keep the schedule alive; the next pass retries
+            logger.exception("dashboard snapshots: pass failed")
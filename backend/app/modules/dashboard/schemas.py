@@ -3,8 +3,13 @@
 Define request/response DTOs here in later implementation phases.
 """
 
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
 from pydantic import BaseModel, Field
-from typing import Dict, Any
+
+from app.core.models_base import Branch
 
 
 class DashboardCreate(BaseModel):
@@ -18,3 +23,31 @@ class DashboardRead(BaseModel):
 
     id: str
     data: Dict[str, Any]
+
+
+class DashboardSoldierRow(BaseModel):
+    """
+    One Soldier List View row: identity plus the mirrored box summaries.
+    """
+
+    id: UUID
+    first_name: str
+    last_name: str
+    branch: Branch
+    boxes: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
+
+
+class DashboardSoldierPage(BaseModel):
+    items: List[DashboardSoldierRow]
+    next_cursor: Optional[str] = None
+
+
+class DashboardSnapshotRead(BaseModel):
+    id: UUID
+    user_id: UUID
+    unit_id: Optional[UUID] = None
+    snapshot_timestamp: datetime
+    metrics: Dict[str, Any]
+
+    class Config:
+        from_attributes = True
@@ -6,43 +6,34 @@ from datetime import date
 from typing import Optional, List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db
+from app.core.conditional import load_version, not_modified, version_select
+from app.core.db import get_async_db
 from app.core.security import get_current_user
 from app.modules.soldier_profile.models import ServiceMember
 from app.core.models_base import Branch, Component
 
-from .models import (
-    AdminData,
-    ServiceData,
-    MilitaryEducation,
-    CivilianEducation,
-    AwardSummary,
-    AssignmentHistory,
-    SecurityDriverWeaponsCBRN,
-    DeploymentRecord,
-    LanguageRecord,
-    MedicalReadinessSnapshot,
-    PersonalFamilyData,
-    AdditionalSoldierData,
+from .bulk import SECTIONS_BY_FIELD, BulkRowError, ingest_section_rows
+from .models import AdminData, ServiceData
+from .export import EXPORT_FORMATS, MEDIA_TYPES, stream_export
+from .loader import (
+    BUNDLE_SECTIONS,
+    load_military_info_bundle_async,
+    load_military_info_bundles_async,
 )
 from .schemas import (
     MilitaryInfoBundle,
+    MilitaryInfoBundleBatchRequest,
+    MilitaryInfoBulkIngestRequest,
+    MilitaryInfoBulkIngestResult,
     AdminDataRead,
     ServiceDataRead,
-    MilitaryEducationRead,
-    CivilianEducationRead,
-    AwardSummaryRead,
-    AssignmentHistoryRead,
-    SecurityDriverWeaponsCBRNRead,
-    DeploymentRecordRead,
-    LanguageRecordRead,
-    MedicalReadinessSnapshotRead,
-    PersonalFamilyDataRead,
-    AdditionalSoldierDataRead,
 )
 
 router = APIRouter(
@@ -50,29 +41,6 @@ router = APIRouter(
     tags=["military_info"],
 )
 
-# ---------------------------------------------------------------------------
-# INTERNAL HELPERS
-# ---------------------------------------------------------------------------
-
-
-def _get_single_or_none(model, soldier_id: UUID, db: Session):
-    return (
-        db.query(model)
-        .filter(model.soldier_id == soldier_id)
-        .order_by(model.created_at.asc())
-        .first()
-    )
-
-
-def _get_many(model, soldier_id: UUID, db: Session):
-    return (
-        db.query(model)
-        .filter(model.soldier_id == soldier_id)
-        .order_by(model.created_at.asc())
-        .all()
-    )
-
-
 # ---------------------------------------------------------------------------
 # CREATE / UPDATE SCHEMAS (LOCAL TO THIS FILE)
 # ---------------------------------------------------------------------------
@@ -169,24 +137,29 @@ class ServiceDataUpdate(BaseModel):
     response_model=AdminDataRead,
     status_code=status.HTTP_201_CREATED,
 )
-def create_admin_data(
+async def create_admin_data(
     payload: AdminDataCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user),
 ):
     # Optional: enforce that soldier exists
-    soldier = (
-        db.query(ServiceMember)
-        .filter(ServiceMember.id == payload.soldier_id)
-        .first()
+    soldier = await db.scalar(
+        select(ServiceMember).where(ServiceMember.id == payload.soldier_id)
     )
     if not soldier:
         raise HTTPException(status_code=404, detail="Service member not found")
 
     obj = AdminData(**payload.model_dump())
     db.add(obj)
-    db.commit()
-    db.refresh(obj)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Admin data already exists for this service member",
+        )
+    await db.refresh(obj)
     return obj
 
 
@@ -194,12 +167,21 @@ def create_admin_data(
     "/admin-data/{admin_id}",
     response_model=AdminDataRead,
 )
-def get_admin_data(
+async def get_admin_data(
     admin_id: UUID,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user),
 ):
-    obj = db.query(AdminData).filter(AdminData.id == admin_id).first()
+    version = await load_version(db, version_select(AdminData.__table__, AdminData.id == admin_id))
+    if not version.count:
+        raise HTTPException(status_code=404, detail="Admin data not found")
+    cached = not_modified(request, response, version)
+    if cached is not None:
+        return cached
+
+    obj = await db.get(AdminData, admin_id)
     if not obj:
         raise HTTPException(status_code=404, detail="Admin data not found")
     return obj
@@ -209,31 +191,39 @@ def get_admin_data(
     "/admin-data/by-soldier/{soldier_id}",
     response_model=List[AdminDataRead],
 )
-def list_admin_data_for_soldier(
+async def list_admin_data_for_soldier(
     soldier_id: UUID,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user),
 ):
-    rows = (
-        db.query(AdminData)
-        .filter(AdminData.soldier_id == soldier_id)
+    version = await load_version(
+        db, version_select(AdminData.__table__, AdminData.soldier_id == soldier_id)
+    )
+    cached = not_modified(request, response, version)
+    if cached is not None:
+        return cached
+
+    rows = await db.scalars(
+        select(AdminData)
+        .where(AdminData.soldier_id == soldier_id)
         .order_by(AdminData.created_at.asc())
-        .all()
     )
-    return rows
+    return rows.all()
 
 
 @router.patch(
     "/admin-data/{admin_id}",
     response_model=AdminDataRead,
 )
-def update_admin_data(
+async def update_admin_data(
     admin_id: UUID,
     payload: AdminDataUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user),
 ):
-    obj = db.query(AdminData).filter(AdminData.id == admin_id).first()
+    obj = await db.get(AdminData, admin_id)
     if not obj:
         raise HTTPException(status_code=404, detail="Admin data not found")
 
@@ -242,8 +232,8 @@ def update_admin_data(
         setattr(obj, field, value)
 
     db.add(obj)
-    db.commit()
-    db.refresh(obj)
+    await db.commit()
+    await db.refresh(obj)
     return obj
 
 
@@ -251,17 +241,17 @@ def update_admin_data(
     "/admin-data/{admin_id}",
     status_code=status.HTTP_204_NO_CONTENT,
 )
-def delete_admin_data(
+async def delete_admin_data(
     admin_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user),
 ):
-    obj = db.query(AdminData).filter(AdminData.id == admin_id).first()
+    obj = await db.get(AdminData, admin_id)
     if not obj:
         raise HTTPException(status_code=404, detail="Admin data not found")
 
-    db.delete(obj)
-    db.commit()
+    await db.delete(obj)
+    await db.commit()
     return None
 
 
@@ -275,23 +265,28 @@ def delete_admin_data(
     response_model=ServiceDataRead,
     status_code=status.HTTP_201_CREATED,
 )
-def create_service_data(
+async def create_service_data(
     payload: ServiceDataCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user),
 ):
-    soldier = (
-        db.query(ServiceMember)
-        .filter(ServiceMember.id == payload.soldier_id)
-        .first()
+    soldier = await db.scalar(
+        select(ServiceMember).where(ServiceMember.id == payload.soldier_id)
     )
     if not soldier:
         raise HTTPException(status_code=404, detail="Service member not found")
 
     obj = ServiceData(**payload.model_dump())
     db.add(obj)
-    db.commit()
-    db.refresh(obj)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Service data already exists for this service member",
+        )
+    await db.refresh(obj)
     return obj
 
 
@@ -299,12 +294,21 @@ def create_service_data(
     "/service-data/{service_id}",
     response_model=ServiceDataRead,
 )
-def get_service_data(
+async def get_service_data(
     service_id: UUID,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user),
 ):
-    obj = db.query(ServiceData).filter(ServiceData.id == service_id).first()
+    version = await load_version(db, version_select(ServiceData.__table__, ServiceData.id == service_id))
+    if not version.count:
+        raise HTTPException(status_code=404, detail="Service data not found")
+    cached = not_modified(request, response, version)
+    if cached is not None:
+        return cached
+
+    obj = await db.get(ServiceData, service_id)
     if not obj:
         raise HTTPException(status_code=404, detail="Service data not found")
     return obj
@@ -314,31 +318,39 @@ def get_service_data(
     "/service-data/by-soldier/{soldier_id}",
     response_model=List[ServiceDataRead],
 )
-def list_service_data_for_soldier(
+async def list_service_data_for_soldier(
     soldier_id: UUID,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user),
 ):
-    rows = (
-        db.query(ServiceData)
-        .filter(ServiceData.soldier_id == soldier_id)
+    version = await load_version(
+        db, version_select(ServiceData.__table__, ServiceData.soldier_id == soldier_id)
+    )
+    cached = not_modified(request, response, version)
+    if cached is not None:
+        return cached
+
+    rows = await db.scalars(
+        select(ServiceData)
+        .where(ServiceData.soldier_id == soldier_id)
         .order_by(ServiceData.created_at.asc())
-        .all()
     )
-    return rows
+    return rows.all()
 
 
 @router.patch(
     "/service-data/{service_id}",
     response_model=ServiceDataRead,
 )
-def update_service_data(
+async def update_service_data(
     service_id: UUID,
     payload: ServiceDataUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user),
 ):
-    obj = db.query(ServiceData).filter(ServiceData.id == service_id).first()
+    obj = await db.get(ServiceData, service_id)
     if not obj:
         raise HTTPException(status_code=404, detail="Service data not found")
 
@@ -347,8 +359,8 @@ def update_service_data(
         setattr(obj, field, value)
 
     db.add(obj)
-    db.commit()
-    db.refresh(obj)
+    await db.commit()
+    await db.refresh(obj)
     return obj
 
 
@@ -356,108 +368,145 @@ def update_service_data(
     "/service-data/{service_id}",
     status_code=status.HTTP_204_NO_CONTENT,
 )
-def delete_service_data(
+async def delete_service_data(
     service_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user),
 ):
-    obj = db.query(ServiceData).filter(ServiceData.id == service_id).first()
+    obj = await db.get(ServiceData, service_id)
     if not obj:
         raise HTTPException(status_code=404, detail="Service data not found")
 
-    db.delete(obj)
-    db.commit()
+    await db.delete(obj)
+    await db.commit()
     return None
 
 
+# ---------------------------------------------------------------------------
+# BULK INGEST
+# ---------------------------------------------------------------------------
+
+
+@router.post(
+    "/bulk/{section}",
+    response_model=MilitaryInfoBulkIngestResult,
+)
+async def bulk_ingest_section(
+    section: str,
+    payload: MilitaryInfoBulkIngestRequest,
+    batch_size: Optional[int] = Query(None, ge=1, le=10_000),
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user),
+):
+    """
+    Load many rows of one section (e.g. an onboarding extract).
+
+    1:1 sections are upserted on soldier_id; list sections are appended.
+    Rows for unknown service members are skipped and listed in the result.
+    """
+    if section not in SECTIONS_BY_FIELD:
+        raise HTTPException(status_code=404, detail=f"Unknown section {section!r}")
+
+    try:
+        return await db.run_sync(
+            ingest_section_rows, section, payload.rows, batch_size=batch_size
+        )
+    except BulkRowError as exc:
+        raise HTTPException(
+            status_code=422,
+            detail={"invalid_rows": exc.errors},
+        )
+
+
+# ---------------------------------------------------------------------------
+# FULL EXPORT (declared before "/{service_member_id}" so it is matched first)
+# ---------------------------------------------------------------------------
+
+
+@router.get("/export")
+def export_military_info(
+    format: str = Query("ndjson", pattern="^(" + "|".join(EXPORT_FORMATS) + ")$"),
+    current_user=Depends(get_current_user),
+):
+    """
+    Stream every service member's Military Info record as NDJSON or CSV.
+
+    Rows are read with a server-side cursor and flushed to the socket
+    chunk by chunk; the export runs on its own DB session.
+    """
+    return StreamingResponse(
+        stream_export(format),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="military_info.{format}"',
+        },
+    )
+
+
 # ---------------------------------------------------------------------------
 # UNIFIED READ-ONLY BUNDLE
 # ---------------------------------------------------------------------------
 
 
+@router.post(
+    "/bundles",
+    response_model=List[MilitaryInfoBundle],
+)
+async def get_military_info_bundles(
+    payload: MilitaryInfoBundleBatchRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user),
+):
+    """
+    Batch variant of the bundle endpoint for roster views.
+
+    Returns one bundle per known service member, in request order.
+    Unknown ids are omitted rather than failing the whole batch.
+    """
+    return await load_military_info_bundles_async(db, payload.soldier_ids)
+
+
+def _bundle_version_selects(soldier_id: UUID):
+    yield version_select(ServiceMember.__table__, ServiceMember.id == soldier_id)
+    for section in BUNDLE_SECTIONS:
+        table = section.model.__table__
+        yield version_select(table, table.c.soldier_id == soldier_id)
+
+
 @router.get(
     "/{service_member_id}",
     response_model=MilitaryInfoBundle,
 )
-def get_military_info_bundle(
+async def get_military_info_bundle(
     service_member_id: UUID,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user),
 ):
     """
     Unified read-only endpoint that returns the full Military Info Box
     (ERB/STP master record) for a single service member.
-    """
 
-    service_member = (
-        db.query(ServiceMember)
-        .filter(ServiceMember.id == service_member_id)
-        .first()
-    )
-    if not service_member:
-        raise HTTPException(status_code=404, detail="Service member not found")
+    Sections are read in one UNION ALL statement (see loader.py). The ETag
+    covers the soldier row and every section row; a matching If-None-Match
+    is answered with 304 after one aggregate query.
+    """
 
     # TODO: enforce ownership/sharing later
     # if service_member.owner_user_id != current_user.id:
     #     raise HTTPException(status_code=403, detail="Not authorized")
 
-    admin_obj = _get_single_or_none(AdminData, service_member_id, db)
-    service_obj = _get_single_or_none(ServiceData, service_member_id, db)
-    security_obj = _get_single_or_none(SecurityDriverWeaponsCBRN, service_member_id, db)
-    medical_obj = _get_single_or_none(MedicalReadinessSnapshot, service_member_id, db)
-    personal_obj = _get_single_or_none(PersonalFamilyData, service_member_id, db)
-    additional_obj = _get_single_or_none(AdditionalSoldierData, service_member_id, db)
-
-    mil_ed_list = _get_many(MilitaryEducation, service_member_id, db)
-    civ_ed_list = _get_many(CivilianEducation, service_member_id, db)
-    awards_list = _get_many(AwardSummary, service_member_id, db)
-    assign_list = _get_many(AssignmentHistory, service_member_id, db)
-    deploy_list = _get_many(DeploymentRecord, service_member_id, db)
-    lang_list = _get_many(LanguageRecord, service_member_id, db)
-
-    bundle = MilitaryInfoBundle(
-        soldier_id=service_member_id,
-        admin_data=AdminDataRead.model_validate(admin_obj) if admin_obj else None,
-        service_data=ServiceDataRead.model_validate(service_obj) if service_obj else None,
-        military_education=[
-            MilitaryEducationRead.model_validate(obj) for obj in mil_ed_list
-        ],
-        civilian_education=[
-            CivilianEducationRead.model_validate(obj) for obj in civ_ed_list
-        ],
-        awards=[
-            AwardSummaryRead.model_validate(obj) for obj in awards_list
-        ],
-        assignments=[
-            AssignmentHistoryRead.model_validate(obj) for obj in assign_list
-        ],
-        deployments=[
-            DeploymentRecordRead.model_validate(obj) for obj in deploy_list
-        ],
-        languages=[
-            LanguageRecordRead.model_validate(obj) for obj in lang_list
-        ],
-        security_driver_weapons_cbrn=(
-            SecurityDriverWeaponsCBRNRead.model_validate(security_obj)
-            if security_obj
-            else None
-        ),
-        medical_readiness=(
-            MedicalReadinessSnapshotRead.model_validate(medical_obj)
-            if medical_obj
-            else None
-        ),
-        personal_family=(
-            PersonalFamilyDataRead.model_validate(personal_obj)
-            if personal_obj
-            else None
-        ),
-        additional_data=(
-            AdditionalSoldierDataRead.model_validate(additional_obj)
-            if additional_obj
-            else None
-        ),
-    )
+    version = await load_version(db, *_bundle_version_selects(service_member_id))
+    if not version.count:
+        raise HTTPException(status_code=404, detail="Service member not found")
+    cached = not_modified(request, response, version)
+    if cached is not None:
+        return cached
+
+    bundle = await load_military_info_bundle_async(db, service_member_id)
+    if bundle is None:
+        raise HTTPException(status_code=404, detail="Service member not found")
 
     return bundle
 
@@ -3,12 +3,14 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from uuid import UUID
 
 from app.core.db import get_db
 from app.core.security import get_current_user
 
+from .bulk import BulkRowError, ingest_section_rows
 from .models import AdminData
 from .schemas import AdminDataRead
 
@@ -31,12 +33,13 @@ def create_admin_data(
     if not soldier_id:
         raise HTTPException(status_code=400, detail="soldier_id is required")
 
-    # Delete old entry if exists (1:1 table)
-    db.query(AdminData).filter(AdminData.soldier_id == soldier_id).delete()
+    # One upsert on the unique soldier_id (1:1 table) instead of
+    # delete + insert; the row keeps its id
+    try:
+        result = ingest_section_rows(db, "admin_data", [payload], replace=True)
+    except BulkRowError as exc:
+        raise HTTPException(status_code=422, detail={"invalid_rows": exc.errors})
+    if result.unknown_soldier_ids:
+        raise HTTPException(status_code=404, detail="Service member not found")
 
-    obj = AdminData(**payload)
-    db.add(obj)
-    db.commit()
-    db.refresh(obj)
-
-    return obj
+    return db.scalar(select(AdminData).where(AdminData.soldier_id == UUID(str(soldier_id))))
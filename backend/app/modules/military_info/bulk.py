@@ -0,0 +1,173 @@
+# app/modules/military_info/bulk.py
+
+"""
+Bulk ingest of Military Info section rows (ERB/STP onboarding extracts).
+
+- rows are validated against the section's row schema up front
+- soldier existence is checked with one set-based IN query per batch
+- 1:1 sections (admin_data, service_data, ...) are upserted with
+  INSERT ... ON CONFLICT (soldier_id) DO UPDATE; list sections are inserted
+- only the fields present in a row are written, so an upsert never clears
+  columns the extract left out (replace=True writes every column)
+- each statement is one executemany per distinct set of columns in the
+  batch, committed every `batch_size` rows (Settings.bulk_ingest_batch_size)
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Type
+from uuid import UUID
+
+from pydantic import BaseModel, ValidationError, create_model
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.core.settings import get_settings
+from app.core.upsert import upsert_insert
+from app.modules.soldier_profile.models import ServiceMember
+
+from .loader import BUNDLE_SECTIONS, DEFAULT_BATCH_CHUNK_SIZE, BundleSection
+from .schemas import MilitaryInfoBulkIngestResult
+
+SECTIONS_BY_FIELD: Dict[str, BundleSection] = {s.field: s for s in BUNDLE_SECTIONS}
+
+
+# ---------------------------------------------------------------------------
+# ROW SCHEMAS (Read schema minus the server-generated id)
+# ---------------------------------------------------------------------------
+
+def _row_schema(section: BundleSection) -> Type[BaseModel]:
+    fields = {
+        name: (info.annotation, info)
+        for name, info in section.schema.model_fields.items()
+        if name != "id"
+    }
+    name = section.schema.__name__.removesuffix("Read") + "BulkRow"
+    return create_model(name, **fields)
+
+
+ROW_SCHEMAS: Dict[str, Type[BaseModel]] = {
+    field: _row_schema(section) for field, section in SECTIONS_BY_FIELD.items()
+}
+
+
+class BulkRowError(ValueError):
+    """One or more rows failed validation; `errors` maps row index -> detail."""
+
+    def __init__(self, errors: Dict[int, Any]) -> None:
+        super().__init__(f"{len(errors)} invalid row(s)")
+        self.errors = errors
+
+
+# ---------------------------------------------------------------------------
+# INTERNAL HELPERS
+# ---------------------------------------------------------------------------
+
+def validate_rows(
+    section_field: str,
+    rows: Iterable[Dict[str, Any]],
+    *,
+    replace: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Validate rows against the section's row schema. Only the fields each
+    row sets are kept unless `replace`, which fills omitted fields with
+    their defaults (None).
+    """
+    schema = ROW_SCHEMAS[section_field]
+    validated: List[Dict[str, Any]] = []
+    errors: Dict[int, Any] = {}
+
+    for index, row in enumerate(rows):
+        try:
+            validated.append(schema.model_validate(row).model_dump(exclude_unset=not replace))
+        except ValidationError as exc:
+            errors[index] = exc.errors(include_url=False, include_context=False)
+
+    if errors:
+        raise BulkRowError(errors)
+    return validated
+
+
+def _existing_soldier_ids(db: Session, soldier_ids: Set[UUID]) -> Set[UUID]:
+    ids = list(soldier_ids)
+    found: Set[UUID] = set()
+    for start in range(0, len(ids), DEFAULT_BATCH_CHUNK_SIZE):
+        chunk = ids[start:start + DEFAULT_BATCH_CHUNK_SIZE]
+        found.update(
+            db.execute(
+                select(ServiceMember.id).where(ServiceMember.id.in_(chunk))
+            ).scalars()
+        )
+    return found
+
+
+def _upsert_statement(db: Session, section: BundleSection, columns: List[str]):
+    stmt = upsert_insert(db, section.model.__table__)
+    set_ = {name: stmt.excluded[name] for name in columns if name != "soldier_id"}
+    set_["updated_at"] = datetime.utcnow()
+    return stmt.on_conflict_do_update(index_elements=["soldier_id"], set_=set_)
+
+
+def _batches(rows: List[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def _by_columns(rows: List[Dict[str, Any]]) -> Dict[Tuple[str, ...], List[Dict[str, Any]]]:
+    """Group rows by the columns they set; executemany needs one shape."""
+    groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+    return groups
+
+
+# ---------------------------------------------------------------------------
+# PUBLIC API
+# ---------------------------------------------------------------------------
+
+def ingest_section_rows(
+    db: Session,
+    section_field: str,
+    rows: Iterable[Dict[str, Any]],
+    *,
+    batch_size: Optional[int] = None,
+    validated: bool = False,
+    replace: bool = False,
+) -> MilitaryInfoBulkIngestResult:
+    """
+    Write many rows of one section. Rows for unknown soldiers are skipped
+    and reported instead of failing the whole load. Existing 1:1 rows keep
+    the columns a row omits unless `replace`.
+
+    Raises KeyError for an unknown section and BulkRowError for invalid rows.
+    """
+    section = SECTIONS_BY_FIELD[section_field]
+    batch_size = batch_size or get_settings().bulk_ingest_batch_size
+    rows = list(rows) if validated else validate_rows(section_field, rows, replace=replace)
+
+    result = MilitaryInfoBulkIngestResult(
+        section=section_field, received=len(rows), written=0, batches=0
+    )
+    unknown: Set[UUID] = set()
+
+    for batch in _batches(rows, batch_size):
+        existing = _existing_soldier_ids(db, {row["soldier_id"] for row in batch})
+        unknown.update(row["soldier_id"] for row in batch if row["soldier_id"] not in existing)
+        batch = [row for row in batch if row["soldier_id"] in existing]
+
+        if batch:
+            for columns, group in _by_columns(batch).items():
+                if section.many:
+                    stmt = insert(section.model.__table__)
+                else:
+                    stmt = _upsert_statement(db, section, list(columns))
+                db.execute(stmt, group)
+            db.commit()
+            result.written += len(batch)
+
+        result.batches += 1
+
+    result.unknown_soldier_ids = sorted(unknown, key=str)
+    return result
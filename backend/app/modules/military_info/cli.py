@@ -0,0 +1,92 @@
+# app/modules/military_info/cli.py
+
+"""
+Command-line tools for the Military Info module (run from backend/).
+
+    python -m app.modules.military_info.cli export --format csv --out brigade.csv
+    python -m app.modules.military_info.cli ingest --section awards --file awards.ndjson
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+
+def _cmd_export(args: argparse.Namespace) -> None:
+    from .export import stream_export
+
+    out = sys.stdout if args.out == "-" else open(args.out, "w", newline="", encoding="utf-8")
+    try:
+        for chunk in stream_export(args.format, chunk_size=args.chunk_size):
+            out.write(chunk)
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+def _cmd_ingest(args: argparse.Namespace) -> None:
+    from app.core.db import SessionLocal
+    from app.core.settings import get_settings
+
+    from .bulk import BulkRowError, ingest_section_rows
+
+    batch_size = args.batch_size or get_settings().bulk_ingest_batch_size
+    src = sys.stdin if args.file == "-" else open(args.file, encoding="utf-8")
+    db = SessionLocal()
+    written = unknown = 0
+
+    def _flush(rows: List[dict]) -> None:
+        nonlocal written, unknown
+        result = ingest_section_rows(db, args.section, rows, batch_size=batch_size)
+        written += result.written
+        unknown += len(result.unknown_soldier_ids)
+
+    try:
+        rows: List[dict] = []
+        for line in src:
+            if line.strip():
+                rows.append(json.loads(line))
+            if len(rows) >= batch_size:
+                _flush(rows)
+                rows = []
+        if rows:
+            _flush(rows)
+    except BulkRowError as exc:
+        raise SystemExit(f"[ingest] aborted after {written} rows: {exc} {exc.errors}")
+    finally:
+        db.close()
+        if src is not sys.stdin:
+            src.close()
+
+    print(f"[ingest] {args.section}: wrote {written} rows, skipped {unknown} unknown soldier ids")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from .bulk import SECTIONS_BY_FIELD
+    from .export import DEFAULT_EXPORT_CHUNK_SIZE, EXPORT_FORMATS
+
+    parser = argparse.ArgumentParser(prog="python -m app.modules.military_info.cli")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    export = sub.add_parser("export", help="stream every Military Info record")
+    export.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson")
+    export.add_argument("--out", default="-", help="output file (default: stdout)")
+    export.add_argument("--chunk-size", type=int, default=DEFAULT_EXPORT_CHUNK_SIZE)
+    export.set_defaults(func=_cmd_export)
+
+    ingest = sub.add_parser("ingest", help="bulk load one section from NDJSON rows")
+    ingest.add_argument("--section", choices=sorted(SECTIONS_BY_FIELD), required=True)
+    ingest.add_argument("--file", default="-", help="NDJSON input (default: stdin)")
+    ingest.add_argument("--batch-size", type=int, default=None)
+    ingest.set_defaults(func=_cmd_ingest)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
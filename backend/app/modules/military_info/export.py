@@ -0,0 +1,141 @@
+# app/modules/military_info/export.py
+
+"""
+Streaming export of the full Military Info (Master Personnel Record) for
+every service member, as NDJSON (one bundle per line) or CSV (one row per
+soldier; list sections embedded as JSON arrays).
+
+Service-member ids are read through a server-side cursor (yield_per) and
+each partition is loaded with the batch bundle loader, encoded, yielded and
+then dropped from the session, so memory stays flat whatever the row count.
+
+CLI (from backend/):
+    python -m app.modules.military_info.cli export --format ndjson > brigade.ndjson
+    python -m app.modules.military_info.cli export --format csv --out brigade.csv
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from typing import Iterator, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.db import SessionLocal
+from app.modules.soldier_profile.models import ServiceMember
+
+from .loader import BUNDLE_SECTIONS, load_military_info_bundles
+from .schemas import MilitaryInfoBundle
+
+EXPORT_FORMATS = ("ndjson", "csv")
+DEFAULT_EXPORT_CHUNK_SIZE = 500
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+# ---------------------------------------------------------------------------
+# ENCODERS
+# ---------------------------------------------------------------------------
+
+def csv_header() -> List[str]:
+    header = ["soldier_id"]
+    for section in BUNDLE_SECTIONS:
+        if section.many:
+            header.append(section.field)
+        else:
+            header.extend(
+                f"{section.field}.{name}"
+                for name in section.schema.model_fields
+                if name not in ("id", "soldier_id")
+            )
+    return header
+
+
+def _csv_row(bundle: MilitaryInfoBundle) -> List[object]:
+    data = bundle.model_dump(mode="json")
+    row: List[object] = [data["soldier_id"]]
+
+    for section in BUNDLE_SECTIONS:
+        value = data[section.field]
+        if section.many:
+            row.append(json.dumps(value, separators=(",", ":")))
+            continue
+        for name in section.schema.model_fields:
+            if name in ("id", "soldier_id"):
+                continue
+            row.append("" if value is None or value.get(name) is None else value[name])
+
+    return row
+
+
+def _encode_chunk(bundles: List[MilitaryInfoBundle], fmt: str) -> str:
+    if fmt == "ndjson":
+        return "".join(bundle.model_dump_json() + "\n" for bundle in bundles)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(_csv_row(bundle) for bundle in bundles)
+    return buffer.getvalue()
+
+
+# ---------------------------------------------------------------------------
+# STREAMING
+# ---------------------------------------------------------------------------
+
+def iter_military_info_bundles(
+    db: Session,
+    *,
+    chunk_size: int = DEFAULT_EXPORT_CHUNK_SIZE,
+) -> Iterator[List[MilitaryInfoBundle]]:
+    """
+    Yield bundles in chunks of up to `chunk_size` soldiers, ordered by
+    (last_name, id).
+    """
+    id_stream = db.execute(
+        select(ServiceMember.id)
+        .order_by(ServiceMember.last_name, ServiceMember.id)
+        .execution_options(yield_per=chunk_size)
+    )
+
+    for partition in id_stream.partitions():
+        ids = [row.id for row in partition]
+        yield load_military_info_bundles(db, ids, chunk_size=chunk_size)
+        # Drop loaded section rows so the identity map does not grow
+        db.expunge_all()
+
+
+def stream_export(
+    fmt: str = "ndjson",
+    *,
+    chunk_size: int = DEFAULT_EXPORT_CHUNK_SIZE,
+    db: Optional[Session] = None,
+) -> Iterator[str]:
+    """
+    Yield encoded export text chunk by chunk (CSV starts with a header).
+
+    Opens its own session when none is given, so it can outlive the request
+    that started a StreamingResponse.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}")
+
+    owns_session = db is None
+    db = db or SessionLocal()
+    try:
+        if fmt == "csv":
+            buffer = io.StringIO()
+            csv.writer(buffer).writerow(csv_header())
+            yield buffer.getvalue()
+
+        for bundles in iter_military_info_bundles(db, chunk_size=chunk_size):
+            if bundles:
+                yield _encode_chunk(bundles, fmt)
+    finally:
+        if owns_session:
+            db.close()
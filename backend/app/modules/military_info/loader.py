@@ -0,0 +1,307 @@
+# app/modules/military_info/loader.py
+
+"""
+Bundle loader for the Military Info (Master Personnel Record) box.
+
+All twelve section tables are read with a single UNION ALL statement.
+Each branch of the union fills its own (prefixed) columns and pads every
+other section's columns with typed NULLs, so the result set is portable
+across SQLite and PostgreSQL. Rows are then split back per section and
+validated into the Read schemas.
+
+Many soldiers at once (company rosters) are loaded with one
+`soldier_id IN (...)` query per section table and grouped in memory.
+
+Both statement shapes are built once at import with bound parameters
+(`soldier_id`, `soldier_ids`); the wide union is ~1,800 labelled columns
+and rebuilding it per request cost far more than running it.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Type
+from uuid import UUID
+
+from pydantic import BaseModel as SchemaModel
+from sqlalchemy import bindparam, cast, literal, null, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.db import Base
+from app.modules.soldier_profile.models import ServiceMember
+
+from .models import (
+    AdminData,
+    ServiceData,
+    MilitaryEducation,
+    CivilianEducation,
+    AwardSummary,
+    AssignmentHistory,
+    SecurityDriverWeaponsCBRN,
+    DeploymentRecord,
+    LanguageRecord,
+    MedicalReadinessSnapshot,
+    PersonalFamilyData,
+    AdditionalSoldierData,
+)
+from .schemas import (
+    MilitaryInfoBundle,
+    AdminDataRead,
+    ServiceDataRead,
+    MilitaryEducationRead,
+    CivilianEducationRead,
+    AwardSummaryRead,
+    AssignmentHistoryRead,
+    SecurityDriverWeaponsCBRNRead,
+    DeploymentRecordRead,
+    LanguageRecordRead,
+    MedicalReadinessSnapshotRead,
+    PersonalFamilyDataRead,
+    AdditionalSoldierDataRead,
+)
+
+
+# ---------------------------------------------------------------------------
+# SECTION REGISTRY
+# ---------------------------------------------------------------------------
+
+class BundleSection(NamedTuple):
+    """
+    One section of the MilitaryInfoBundle.
+
+    field:  attribute name on MilitaryInfoBundle
+    model:  SQLAlchemy model holding the rows
+    schema: Read schema used to serialize a row
+    many:   True for list sections, False for 1:1 sections
+    """
+
+    field: str
+    model: Type[Base]
+    schema: Type[SchemaModel]
+    many: bool
+
+
+BUNDLE_SECTIONS: Sequence[BundleSection] = (
+    BundleSection("admin_data", AdminData, AdminDataRead, False),
+    BundleSection("service_data", ServiceData, ServiceDataRead, False),
+    BundleSection("military_education", MilitaryEducation, MilitaryEducationRead, True),
+    BundleSection("civilian_education", CivilianEducation, CivilianEducationRead, True),
+    BundleSection("awards", AwardSummary, AwardSummaryRead, True),
+    BundleSection("assignments", AssignmentHistory, AssignmentHistoryRead, True),
+    BundleSection("deployments", DeploymentRecord, DeploymentRecordRead, True),
+    BundleSection("languages", LanguageRecord, LanguageRecordRead, True),
+    BundleSection(
+        "security_driver_weapons_cbrn",
+        SecurityDriverWeaponsCBRN,
+        SecurityDriverWeaponsCBRNRead,
+        False,
+    ),
+    BundleSection(
+        "medical_readiness",
+        MedicalReadinessSnapshot,
+        MedicalReadinessSnapshotRead,
+        False,
+    ),
+    BundleSection("personal_family", PersonalFamilyData, PersonalFamilyDataRead, False),
+    BundleSection("additional_data", AdditionalSoldierData, AdditionalSoldierDataRead, False),
+)
+
+
+# Upper bound on ids per IN (...) list; keeps each statement well under
+# SQLite's bound-parameter limit.
+DEFAULT_BATCH_CHUNK_SIZE = 500
+
+
+# ---------------------------------------------------------------------------
+# INTERNAL HELPERS
+# ---------------------------------------------------------------------------
+
+def _label(section: BundleSection, column_name: str) -> str:
+    return f"{section.field}__{column_name}"
+
+
+def _build_union_statement():
+    """
+    Build the wide UNION ALL over every section table for one soldier,
+    bound to the `soldier_id` parameter.
+
+    Every branch exposes the same column list, in the same order:
+        _section, _created_at, <section 1 columns>, <section 2 columns>, ...
+    """
+    branches = []
+    soldier_id = bindparam("soldier_id")
+
+    for current in BUNDLE_SECTIONS:
+        current_table = current.model.__table__
+        columns = [
+            literal(current.field).label("_section"),
+            current_table.c.created_at.label("_created_at"),
+        ]
+
+        for section in BUNDLE_SECTIONS:
+            for col in section.model.__table__.columns:
+                label = _label(section, col.name)
+                if section is current:
+                    columns.append(col.label(label))
+                else:
+                    columns.append(cast(null(), col.type).label(label))
+
+        branches.append(
+            select(*columns).where(current_table.c.soldier_id == soldier_id)
+        )
+
+    stmt = union_all(*branches)
+    return stmt.order_by(
+        stmt.selected_columns._section,
+        stmt.selected_columns._created_at,
+    )
+
+
+def _build_batch_statements() -> Dict[str, Any]:
+    """One `soldier_id IN :soldier_ids` select per section, keyed by field."""
+    statements = {}
+    for section in BUNDLE_SECTIONS:
+        model = section.model
+        statements[section.field] = (
+            select(model)
+            .where(model.soldier_id.in_(bindparam("soldier_ids", expanding=True)))
+            .order_by(model.soldier_id, model.created_at.asc())
+        )
+    return statements
+
+
+_SECTIONS_BY_FIELD: Dict[str, BundleSection] = {section.field: section for section in BUNDLE_SECTIONS}
+
+# (column name, result label) per section, for splitting union rows
+_SECTION_LABELS: Dict[str, List[tuple]] = {
+    section.field: [(col.name, _label(section, col.name)) for col in section.model.__table__.columns]
+    for section in BUNDLE_SECTIONS
+}
+
+_BUNDLE_STMT = _build_union_statement()
+_BATCH_STMTS = _build_batch_statements()
+_EXISTS_STMT = select(ServiceMember.id).where(ServiceMember.id == bindparam("soldier_id"))
+_EXISTS_MANY_STMT = select(ServiceMember.id).where(
+    ServiceMember.id.in_(bindparam("soldier_ids", expanding=True))
+)
+
+
+def _row_to_section_dict(section: BundleSection, row) -> Dict[str, Any]:
+    mapping = row._mapping
+    return {name: mapping[label] for name, label in _SECTION_LABELS[section.field]}
+
+
+def build_bundle(soldier_id: UUID, rows_by_section: Dict[str, List[Any]]) -> MilitaryInfoBundle:
+    """
+    Assemble a MilitaryInfoBundle from rows grouped by section field.
+
+    Rows may be ORM objects or plain dicts; they must already be ordered
+    by created_at ascending. 1:1 sections keep only their first row.
+    """
+    payload: Dict[str, Any] = {"soldier_id": soldier_id}
+
+    for section in BUNDLE_SECTIONS:
+        rows = rows_by_section.get(section.field, [])
+        if section.many:
+            payload[section.field] = [section.schema.model_validate(r) for r in rows]
+        else:
+            payload[section.field] = (
+                section.schema.model_validate(rows[0]) if rows else None
+            )
+
+    return MilitaryInfoBundle(**payload)
+
+
+# ---------------------------------------------------------------------------
+# PUBLIC API
+# ---------------------------------------------------------------------------
+
+def load_military_info_bundle(db: Session, soldier_id: UUID) -> Optional[MilitaryInfoBundle]:
+    """
+    Load the full Military Info bundle for one service member.
+
+    Issues exactly two statements:
+      1) ServiceMember existence check
+      2) one UNION ALL across all twelve section tables
+
+    Returns None when the service member does not exist.
+    """
+    params = {"soldier_id": soldier_id}
+    if db.execute(_EXISTS_STMT, params).first() is None:
+        return None
+
+    rows_by_section: Dict[str, List[Dict[str, Any]]] = {}
+
+    for row in db.execute(_BUNDLE_STMT, params):
+        section = _SECTIONS_BY_FIELD[row._section]
+        rows_by_section.setdefault(section.field, []).append(
+            _row_to_section_dict(section, row)
+        )
+
+    return build_bundle(soldier_id, rows_by_section)
+
+
+def load_military_info_bundles(
+    db: Session,
+    soldier_ids: Iterable[UUID],
+    *,
+    chunk_size: int = DEFAULT_BATCH_CHUNK_SIZE,
+) -> List[MilitaryInfoBundle]:
+    """
+    Load Military Info bundles for many service members.
+
+    Per chunk of ids this issues one ServiceMember IN query plus one
+    IN query per section table (13 statements), regardless of how many
+    soldiers the chunk holds. Unknown ids are skipped; the result keeps
+    the order of the requested ids with duplicates removed.
+    """
+    ordered_ids = list(dict.fromkeys(soldier_ids))
+    bundles: List[MilitaryInfoBundle] = []
+
+    for start in range(0, len(ordered_ids), chunk_size):
+        chunk = ordered_ids[start:start + chunk_size]
+
+        existing = set(
+            db.execute(_EXISTS_MANY_STMT, {"soldier_ids": chunk}).scalars()
+        )
+        if not existing:
+            continue
+
+        grouped: Dict[UUID, Dict[str, List[Any]]] = {sid: {} for sid in existing}
+        params = {"soldier_ids": list(existing)}
+
+        for section in BUNDLE_SECTIONS:
+            for obj in db.execute(_BATCH_STMTS[section.field], params).scalars():
+                grouped[obj.soldier_id].setdefault(section.field, []).append(obj)
+
+        bundles.extend(
+            build_bundle(sid, grouped[sid]) for sid in chunk if sid in existing
+        )
+
+    return bundles
+
+
+# ---------------------------------------------------------------------------
+# ASYNC VARIANTS
+# The sync loaders run inside AsyncSession.run_sync, so statement I/O is
+# awaited on the event loop instead of holding a threadpool worker.
+# ---------------------------------------------------------------------------
+
+async def load_military_info_bundle_async(
+    db: AsyncSession,
+    soldier_id: UUID,
+) -> Optional[MilitaryInfoBundle]:
+    return await db.run_sync(load_military_info_bundle, soldier_id)
+
+
+async def load_military_info_bundles_async(
+    db: AsyncSession,
+    soldier_ids: Iterable[UUID],
+    *,
+    chunk_size: int = DEFAULT_BATCH_CHUNK_SIZE,
+) -> List[MilitaryInfoBundle]:
+    return await db.run_sync(
+        load_military_info_bundles,
+        list(soldier_ids),
+        chunk_size=chunk_size,
+    )
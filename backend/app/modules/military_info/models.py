@@ -31,6 +31,7 @@ class AdminData(BaseModel):
         PGUUID(as_uuid=True),
         ForeignKey("service_members.id", ondelete="CASCADE"),
         index=True,
+        unique=True,
         nullable=False,
     )
 
@@ -84,6 +85,7 @@ class ServiceData(BaseModel):
         PGUUID(as_uuid=True),
         ForeignKey("service_members.id", ondelete="CASCADE"),
         index=True,
+        unique=True,
         nullable=False,
     )
 
@@ -200,6 +202,7 @@ class SecurityDriverWeaponsCBRN(BaseModel):
         PGUUID(as_uuid=True),
         ForeignKey("service_members.id", ondelete="CASCADE"),
         index=True,
+        unique=True,
         nullable=False,
     )
 
@@ -272,6 +275,7 @@ class MedicalReadinessSnapshot(BaseModel):
         PGUUID(as_uuid=True),
         ForeignKey("service_members.id"), 
         index=True,
+        unique=True,
         nullable=False,
     )
 
@@ -296,6 +300,7 @@ class PersonalFamilyData(BaseModel):
         PGUUID(as_uuid=True),
         ForeignKey("service_members.id"), 
         index=True,
+        unique=True,
         nullable=False,
     )
 
@@ -320,6 +325,7 @@ class AdditionalSoldierData(BaseModel):
         PGUUID(as_uuid=True),
         ForeignKey("service_members.id"), 
         index=True,
+        unique=True,
         nullable=False,
     )
 
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import date
 from uuid import UUID
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 
 from pydantic import BaseModel
 
@@ -281,3 +281,26 @@ class MilitaryInfoBundle(BaseModel):
     medical_readiness: Optional[MedicalReadinessSnapshotRead] = None
     personal_family: Optional[PersonalFamilyDataRead] = None
     additional_data: Optional[AdditionalSoldierDataRead] = None
+
+
+class MilitaryInfoBundleBatchRequest(BaseModel):
+    """
+    Request body for loading many bundles in one call.
+    """
+
+    soldier_ids: List[UUID]
+
+
+class MilitaryInfoBulkIngestRequest(BaseModel):
+    """
+    Rows for one section, shaped like the section's Read schema minus id.
+    """
+    rows: List[Dict[str, Any]]
+
+
+class MilitaryInfoBulkIngestResult(BaseModel):
+    section: str
+    received: int
+    written: int
+    batches: int
+    unknown_soldier_ids: List[UUID] = []
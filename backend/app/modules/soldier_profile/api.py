@@ -1,14 +1,33 @@
 from __future__ import annotations
 
-from typing import List
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db
+from app.core.conditional import load_version, not_modified, rows_version, version_select
+from app.core.db import get_async_db
+from app.core.models_base import Branch, Component
+from app.core.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    decode_cursor,
+    encode_cursor,
+    keyset_after,
+    parse_fields,
+)
 from .models import ServiceMember
-from .schemas import ServiceMemberCreate, ServiceMemberRead
+from .schemas import (
+    ServiceMemberCreate,
+    ServiceMemberListItem,
+    ServiceMemberPage,
+    ServiceMemberRead,
+)
+
+# Sort key for keyset pagination; backed by ix_service_members_last_name_id
+_SORT_COLUMNS = (ServiceMember.last_name, ServiceMember.id)
 
 
 def get_router() -> APIRouter:
@@ -18,19 +37,103 @@ def get_router() -> APIRouter:
     )
 
 
-    @router.get("/", response_model=List[ServiceMemberRead])
-    def list_service_members(db: Session = Depends(get_db)):
-        return db.query(ServiceMember).all()
+    @router.get(
+        "/",
+        response_model=ServiceMemberPage,
+        response_model_exclude_unset=True,
+    )
+    async def list_service_members(
+        request: Request,
+        response: Response,
+        cursor: Optional[str] = None,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        branch: Optional[Branch] = None,
+        component: Optional[Component] = None,
+        owner_user_id: Optional[UUID] = None,
+        fields: Optional[str] = Query(
+            None,
+            description="Comma-separated projection, e.g. fields=last_name,first_name",
+        ),
+        db: AsyncSession = Depends(get_async_db),
+    ):
+        """
+        Keyset-paginated soldier list ordered by (last_name, id).
+
+        Returns {items, next_cursor} rather than a bare list; pass
+        next_cursor back as ?cursor= for the next page (null on the last).
+        The ETag covers the rows of this page (and the one that decides
+        next_cursor), so If-None-Match gets 304 until one of them changes
+        or the page's membership does.
+        """
+        filters = []
+        if branch is not None:
+            filters.append(ServiceMember.branch == branch)
+        if component is not None:
+            filters.append(ServiceMember.component == component)
+        if owner_user_id is not None:
+            filters.append(ServiceMember.owner_user_id == owner_user_id)
+
+        selected = parse_fields(fields, ServiceMemberListItem.model_fields) or list(
+            ServiceMemberListItem.model_fields
+        )
+        # Sort keys are always read so the cursor can be built
+        columns = [getattr(ServiceMember, name) for name in selected]
+        columns += [c for c in _SORT_COLUMNS if c.key not in selected]
+        columns.append(ServiceMember.updated_at)
+
+        stmt = select(*columns).where(*filters).order_by(*_SORT_COLUMNS).limit(limit + 1)
+
+        if cursor:
+            last_name, raw_id = decode_cursor(cursor, len(_SORT_COLUMNS))
+            try:
+                last_id = UUID(raw_id)
+            except (TypeError, ValueError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            stmt = stmt.where(keyset_after(_SORT_COLUMNS, [last_name, last_id]))
+
+        rows = (await db.execute(stmt)).all()
+        version = rows_version((row.id, row.updated_at) for row in rows)
+        cached = not_modified(request, response, version)
+        if cached is not None:
+            return cached
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        items = [
+            ServiceMemberListItem(**{name: row._mapping[name] for name in selected})
+            for row in rows
+        ]
+        next_cursor = None
+        if has_more:
+            last = rows[-1]._mapping
+            next_cursor = encode_cursor([last["last_name"], last["id"]])
+
+        return ServiceMemberPage(items=items, next_cursor=next_cursor)
 
     @router.get("/{service_member_id}", response_model=ServiceMemberRead)
-    def get_service_member(service_member_id: UUID, db: Session = Depends(get_db)):
-        obj = db.query(ServiceMember).filter(ServiceMember.id == service_member_id).first()
+    async def get_service_member(
+        service_member_id: UUID,
+        request: Request,
+        response: Response,
+        db: AsyncSession = Depends(get_async_db),
+    ):
+        version = await load_version(
+            db, version_select(ServiceMember.__table__, ServiceMember.id == service_member_id)
+        )
+        if not version.count:
+            raise HTTPException(status_code=404, detail="Service member not found")
+        cached = not_modified(request, response, version)
+        if cached is not None:
+            return cached
+
+        obj = await db.get(ServiceMember, service_member_id)
         if not obj:
             raise HTTPException(status_code=404, detail="Service member not found")
         return obj
 
     @router.post("/", response_model=ServiceMemberRead)
-    def create_service_member(payload: ServiceMemberCreate, db: Session = Depends(get_db)):
+    async def create_service_member(payload: ServiceMemberCreate, db: AsyncSession = Depends(get_async_db)):
         obj = ServiceMember(
             first_name=payload.first_name,
             last_name=payload.last_name,
@@ -40,8 +143,8 @@ def get_router() -> APIRouter:
             owner_user_id=payload.owner_user_id,
         )
         db.add(obj)
-        db.commit()
-        db.refresh(obj)
+        await db.commit()
+        await db.refresh(obj)
         return obj
 
     return router
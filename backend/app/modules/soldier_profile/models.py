@@ -3,10 +3,11 @@ from __future__ import annotations
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import String, Enum as SAEnum, ForeignKey
+from sqlalchemy import String, Enum as SAEnum, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.models_base import BaseModel, Branch, Component
+from app.modules.auth.models import UserAccount  # Needed so the "owner" relationship resolves
 
 
 class ServiceMember(BaseModel):
@@ -34,3 +35,8 @@ class ServiceMember(BaseModel):
         "UserAccount",
         backref="service_members",
     )
+
+    __table_args__ = (
+        # Keyset pagination order for the soldier list
+        Index("ix_service_members_last_name_id", "last_name", "id"),
+    )
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -27,3 +27,23 @@ class ServiceMemberRead(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ServiceMemberListItem(BaseModel):
+    """
+    Row in the paginated soldier list. `id` is always returned (it is
+    the cursor tiebreaker); every other field is optional so a `fields=`
+    projection can return only the columns the view needs.
+    """
+    id: UUID
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    middle_initial: Optional[str] = None
+    branch: Optional[Branch] = None
+    component: Optional[Component] = None
+    owner_user_id: Optional[UUID] = None
+
+
+class ServiceMemberPage(BaseModel):
+    items: List[ServiceMemberListItem]
+    next_cursor: Optional[str] = None
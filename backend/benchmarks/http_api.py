@@ -0,0 +1,499 @@
+# benchmarks/http_api.py
+
+"""
+Load-test harness for the HTTP API.
+
+Seeds one SQLite database per dataset size (app.core.seed, cached under
+benchmarks/.data/), then drives the real app - in-process through
+httpx.ASGITransport with the app lifespan running, and/or over TCP against
+a uvicorn subprocess - with a fixed number of operations per scenario at a
+fixed concurrency:
+
+    login           POST /api/auth/login                (bcrypt bound)
+    me              GET  /api/auth/me
+    soldier_list    GET  /api/soldier-profile/?owner_user_id=...&limit=50
+    bundle          GET  /api/military-info/{soldier_id}
+    bundle_batch    POST /api/military-info/bundles     (25 soldiers)
+    section_crud    POST/GET/PATCH/DELETE /api/military-info/admin-data
+                    on a freshly created soldier
+
+Per scenario it reports throughput, p50/p95/p99 latency and queries per
+request (read from the Server-Timing header written by QueryStatsMiddleware,
+so keep sql_stats_enabled on) for every size, i.e. one scaling curve per
+scenario. Usage (from backend/):
+
+    python -m benchmarks.http_api --sizes company,battalion,brigade
+    python -m benchmarks.http_api --save benchmarks/baselines/sqlite.json
+    python -m benchmarks.http_api --compare benchmarks/baselines/sqlite.json [--fail-on-regression]
+
+Baselines are plain JSON with sorted keys, so a regression shows up in the
+diff as well as in the --compare report. Each size and mode runs in its
+own subprocess because the app reads DATABASE_URL at import time.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import re
+import socket
+import sqlite3
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+DATA_DIR = Path(__file__).resolve().parent / ".data"
+
+MODES = ("inprocess", "uvicorn")
+DEFAULT_SIZES = ("company", "battalion", "brigade")
+BUNDLE_BATCH_SIZE = 25
+
+# Relative change beyond which --compare reports a regression
+REGRESSION_THRESHOLD = 0.15
+
+_QUERIES = re.compile(r'desc="(\d+) queries')
+
+
+# ---------------------------------------------------------------------------
+# SAMPLES
+# ---------------------------------------------------------------------------
+
+@dataclass
+class ScenarioSamples:
+    latencies: List[float] = field(default_factory=list)
+    queries: List[int] = field(default_factory=list)
+    errors: int = 0
+    seconds: float = 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies)
+        count = len(ordered)
+
+        def percentile(p: float) -> Optional[float]:
+            if not ordered:
+                return None
+            return round(ordered[min(count - 1, int(p * count))] * 1000, 2)
+
+        return {
+            "requests": count,
+            "errors": self.errors,
+            "rps": round(count / self.seconds, 1) if self.seconds else None,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+            "queries_per_request": (
+                round(sum(self.queries) / len(self.queries), 2) if self.queries else None
+            ),
+        }
+
+
+class Recorder:
+    """
+    Wraps the httpx client; every request made by a scenario op is timed
+    and counted under that scenario.
+    """
+
+    def __init__(self, client, headers: Dict[str, str]) -> None:
+        self.client = client
+        self.headers = headers
+        self.samples: Optional[ScenarioSamples] = None
+
+    async def request(self, method: str, url: str, expect: int = 200, **kwargs):
+        kwargs.setdefault("headers", self.headers)
+        started = time.perf_counter()
+        response = await self.client.request(method, url, **kwargs)
+        elapsed = time.perf_counter() - started
+
+        if self.samples is not None:
+            self.samples.latencies.append(elapsed)
+            match = _QUERIES.search(response.headers.get("server-timing", ""))
+            if match:
+                self.samples.queries.append(int(match.group(1)))
+            if response.status_code != expect:
+                self.samples.errors += 1
+        return response
+
+
+# ---------------------------------------------------------------------------
+# SCENARIOS
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Fixture:
+    username: str
+    password: str
+    owner_id: str
+    soldier_ids: List[str]
+
+
+Op = Callable[[Recorder, Fixture, random.Random], Awaitable[None]]
+
+
+async def _login(r: Recorder, f: Fixture, rng: random.Random) -> None:
+    await r.request(
+        "POST", "/api/auth/login", json={"username_or_email": f.username, "password": f.password}, headers={}
+    )
+
+
+async def _me(r: Recorder, f: Fixture, rng: random.Random) -> None:
+    await r.request("GET", "/api/auth/me")
+
+
+async def _soldier_list(r: Recorder, f: Fixture, rng: random.Random) -> None:
+    await r.request("GET", "/api/soldier-profile/", params={"owner_user_id": f.owner_id, "limit": 50})
+
+
+async def _bundle(r: Recorder, f: Fixture, rng: random.Random) -> None:
+    await r.request("GET", f"/api/military-info/{rng.choice(f.soldier_ids)}")
+
+
+async def _bundle_batch(r: Recorder, f: Fixture, rng: random.Random) -> None:
+    ids = rng.sample(f.soldier_ids, min(BUNDLE_BATCH_SIZE, len(f.soldier_ids)))
+    await r.request("POST", "/api/military-info/bundles", json={"soldier_ids": ids})
+
+
+async def _section_crud(r: Recorder, f: Fixture, rng: random.Random) -> None:
+    soldier = await r.request(
+        "POST", "/api/soldier-profile/",
+        json={"first_name": "Bench", "last_name": f"Mark{rng.randrange(10 ** 6)}", "branch": "Army"},
+    )
+    if soldier.status_code >= 300:
+        return
+    soldier_id = soldier.json()["id"]
+    created = await r.request(
+        "POST", "/api/military-info/admin-data",
+        json={"soldier_id": soldier_id, "last_name": "Mark", "rank": "SPC"},
+        expect=201,
+    )
+    if created.status_code >= 300:
+        return
+    admin_id = created.json()["id"]
+    await r.request("GET", f"/api/military-info/admin-data/{admin_id}")
+    await r.request("PATCH", f"/api/military-info/admin-data/{admin_id}", json={"rank": "SGT"})
+    await r.request("DELETE", f"/api/military-info/admin-data/{admin_id}", expect=204)
+
+
+# name -> (op, share of --requests operations)
+SCENARIOS: Dict[str, tuple] = {
+    "login": (_login, 0.1),
+    "me": (_me, 1.0),
+    "soldier_list": (_soldier_list, 1.0),
+    "bundle": (_bundle, 1.0),
+    "bundle_batch": (_bundle_batch, 0.25),
+    "section_crud": (_section_crud, 0.25),
+}
+
+
+async def _prepare(client, password: str) -> Fixture:
+    username = "seed-co0001"
+    response = await client.post(
+        "/api/auth/login", json={"username_or_email": username, "password": password}
+    )
+    response.raise_for_status()
+    token = response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    me = (await client.get("/api/auth/me", headers=headers)).json()
+    page = (await client.get("/api/soldier-profile/", params={"limit": 200}, headers=headers)).json()
+    soldier_ids = [item["id"] for item in page["items"]]
+    owner_id = page["items"][0].get("owner_user_id") or me["id"]
+    client.headers.update(headers)
+    return Fixture(username=username, password=password, owner_id=owner_id, soldier_ids=soldier_ids)
+
+
+async def drive(client, scenarios: Sequence[str], operations: int, concurrency: int, password: str) -> Dict[str, Any]:
+    fixture = await _prepare(client, password)
+    recorder = Recorder(client, dict(client.headers))
+    results: Dict[str, Any] = {}
+
+    for name in scenarios:
+        op, share = SCENARIOS[name]
+        total = max(concurrency, int(operations * share))
+        rng = random.Random(name)
+
+        # Warm up caches and the connection pool outside the measurement
+        recorder.samples = None
+        for _ in range(min(concurrency, 5)):
+            await op(recorder, fixture, rng)
+
+        samples = recorder.samples = ScenarioSamples()
+        remaining = total
+
+        async def worker() -> None:
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                await op(recorder, fixture, rng)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        samples.seconds = time.perf_counter() - started
+        results[name] = samples.summary()
+
+    return results
+
+
+# ---------------------------------------------------------------------------
+# WORKER (one mode x one size, in a subprocess)
+# ---------------------------------------------------------------------------
+
+async def _run_inprocess(args: argparse.Namespace) -> Dict[str, Any]:
+    import httpx
+
+    sys.path.insert(0, str(BACKEND_DIR))
+    import main
+
+    from app.core.db import get_async_engine
+
+    transport = httpx.ASGITransport(app=main.app)
+    try:
+        async with main.app.router.lifespan_context(main.app):
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                return await drive(client, args.scenarios, args.requests, args.concurrency, args.password)
+    finally:
+        # Close aiosqlite connections while the loop is alive, not at exit
+        await get_async_engine().dispose()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _run_uvicorn(args: argparse.Namespace) -> Dict[str, Any]:
+    import httpx
+
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port),
+         "--workers", str(args.workers), "--log-level", "warning", "--no-access-log"],
+        cwd=BACKEND_DIR,
+        env=os.environ.copy(),
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+            deadline = time.monotonic() + 60
+            while True:
+                try:
+                    if (await client.get("/health")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if server.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("uvicorn did not start")
+                await asyncio.sleep(0.2)
+            return await drive(client, args.scenarios, args.requests, args.concurrency, args.password)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def _worker(args: argparse.Namespace) -> None:
+    runner = _run_inprocess if args.mode == "inprocess" else _run_uvicorn
+    results = asyncio.run(runner(args))
+    # Last stdout line is the result; the app may log above it
+    print(json.dumps(results))
+
+
+# ---------------------------------------------------------------------------
+# ORCHESTRATION
+# ---------------------------------------------------------------------------
+
+def _soldier_count(size: str) -> int:
+    from app.core.seed import SCALES
+
+    return SCALES[size] if size in SCALES else int(size)
+
+
+def _database(size: str, seed: int, password: str, reseed: bool) -> Path:
+    path = DATA_DIR / f"{size}-seed{seed}.db"
+    if path.exists() and not reseed:
+        return path
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{path}{suffix}").unlink(missing_ok=True)
+
+    print(f"[bench] seeding {size} -> {path.name}", file=sys.stderr)
+    subprocess.run(
+        [sys.executable, "-m", "app.core.seed", "--soldiers", str(_soldier_count(size)),
+         "--seed", str(seed), "--password", password],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "DATABASE_URL": f"sqlite:///{path}"},
+        check=True,
+        capture_output=True,
+    )
+    return path
+
+
+def _run_worker(mode: str, database: Path, args: argparse.Namespace) -> Dict[str, Any]:
+    command = [
+        sys.executable, "-m", "benchmarks.http_api", "--worker", "--mode", mode,
+        "--requests", str(args.requests), "--concurrency", str(args.concurrency),
+        "--workers", str(args.workers), "--password", args.password,
+    ]
+    for name in args.scenarios:
+        command += ["--scenario", name]
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{database}",
+        # Background schedules would only add noise to the measurement
+        "ATTACHMENT_REAPER_INTERVAL_SECONDS": "0",
+        "DASHBOARD_SNAPSHOT_INTERVAL_MINUTES": "0",
+        "SQL_STATS_ENABLED": "true",
+    }
+    completed = subprocess.run(command, cwd=BACKEND_DIR, env=env, check=True, capture_output=True, text=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    report: Dict[str, Any] = {
+        "meta": {
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "uvicorn_workers": args.workers,
+            "seed": args.seed,
+        },
+        "runs": {},
+    }
+    for size in args.sizes:
+        database = _database(size, args.seed, args.password, args.reseed)
+        for mode in args.modes:
+            print(f"[bench] {mode} / {size}", file=sys.stderr)
+            results = _run_worker(mode, database, args)
+            report["runs"].setdefault(mode, {})[size] = {
+                "soldiers": _soldier_count(size),
+                "scenarios": results,
+            }
+    return report
+
+
+# ---------------------------------------------------------------------------
+# REPORTING
+# ---------------------------------------------------------------------------
+
+def _fmt(value: Any) -> str:
+    return "-" if value is None else f"{value:g}" if isinstance(value, float) else str(value)
+
+
+def print_curves(report: Dict[str, Any]) -> None:
+    for mode, sizes in report["runs"].items():
+        scenarios = sorted({name for size in sizes.values() for name in size["scenarios"]})
+        print(f"\n== {mode}")
+        print(f"{'scenario':<14} {'size':<10} {'soldiers':>8} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'q/req':>6} {'err':>4}")
+        for name in scenarios:
+            for size, run_ in sizes.items():
+                row = run_["scenarios"].get(name)
+                if row is None:
+                    continue
+                print(
+                    f"{name:<14} {size:<10} {run_['soldiers']:>8} {_fmt(row['rps']):>8} "
+                    f"{_fmt(row['p50_ms']):>8} {_fmt(row['p95_ms']):>8} {_fmt(row['p99_ms']):>8} "
+                    f"{_fmt(row['queries_per_request']):>6} {row['errors']:>4}"
+                )
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float = REGRESSION_THRESHOLD) -> List[str]:
+    """
+    Print per-scenario changes against `baseline`; return the regressions:
+    throughput down or p95 up by more than `threshold`, any increase in
+    queries per request (those are deterministic), or new errors.
+    """
+    regressions: List[str] = []
+    print(f"\n== compared with baseline (threshold {threshold:.0%})")
+    for mode, sizes in report["runs"].items():
+        for size, run_ in sizes.items():
+            base_run = baseline.get("runs", {}).get(mode, {}).get(size)
+            if base_run is None:
+                continue
+            for name, row in run_["scenarios"].items():
+                base = base_run["scenarios"].get(name)
+                if base is None:
+                    continue
+                label = f"{mode}/{size}/{name}"
+                notes = []
+                if base["rps"] and row["rps"] is not None:
+                    change = row["rps"] / base["rps"] - 1
+                    notes.append(f"rps {change:+.0%}")
+                    if change < -threshold:
+                        regressions.append(f"{label}: throughput {change:+.0%}")
+                if base["p95_ms"] and row["p95_ms"] is not None:
+                    change = row["p95_ms"] / base["p95_ms"] - 1
+                    notes.append(f"p95 {change:+.0%}")
+                    if change > threshold:
+                        regressions.append(f"{label}: p95 {change:+.0%}")
+                if base["queries_per_request"] is not None and row["queries_per_request"] is not None:
+                    delta = row["queries_per_request"] - base["queries_per_request"]
+                    notes.append(f"queries {delta:+g}")
+                    if delta > 0:
+                        regressions.append(f"{label}: {delta:+g} queries per request")
+                if row["errors"] > base["errors"]:
+                    regressions.append(f"{label}: {row['errors']} errors (baseline {base['errors']})")
+                print(f"{label:<40} {', '.join(notes)}")
+
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.http_api")
+    parser.add_argument("--sizes", default=",".join(DEFAULT_SIZES),
+                        help="comma-separated seed scales or soldier counts")
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--scenario", dest="scenarios", action="append", choices=list(SCENARIOS),
+                        help="repeat to pick scenarios (default: all)")
+    parser.add_argument("--requests", type=int, default=400, help="operations per scenario (before its share)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--password", default="SeedPassw0rd!")
+    parser.add_argument("--reseed", action="store_true", help="rebuild cached datasets")
+    parser.add_argument("--save", type=Path, help="write the report as a baseline JSON file")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to diff against")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    args.scenarios = args.scenarios or list(SCENARIOS)
+
+    if args.worker:
+        _worker(args)
+        return
+
+    args.sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    args.modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    unknown = set(args.modes) - set(MODES)
+    if unknown:
+        parser.error(f"unknown mode(s): {', '.join(sorted(unknown))}")
+
+    report = run(args)
+    print_curves(report)
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+        print(f"\n[bench] baseline written to {args.save}")
+
+    if args.compare:
+        regressions = compare(report, json.loads(args.compare.read_text()))
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,19 +2,65 @@
 
 from __future__ import annotations
 
-# ---------------------------------------------------------
-# ABSOLUTELY FIRST: clear SQLAlchemy metadata BEFORE
-# any model imports (fixes "Table already defined" error)
-# ---------------------------------------------------------
-from app.core.db import Base, init_models, engine  # init_models imported early
-Base.metadata.clear()
-# ---------------------------------------------------------
+import asyncio
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-
-from app.core.router import include_all_routers
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.engine import make_url
+
+from app.core.db import engine, get_async_engine, init_models
+from app.core.metrics import MetricsMiddleware, instrument_engine_pool, render_metrics
+from app.core.metadata import start_metadata_watcher, stop_metadata_watcher
+from app.core.passwords import shutdown_password_pool
+from app.core.query_stats import QueryStatsMiddleware, install_query_hooks
+from app.core.router import include_all_routers, include_lazy_routers
 from app.core.settings import get_settings
+from app.core.status_colors import run_nightly
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Imported here, not at module level, so ROUTER_MODE=lazy still defers
+    # module imports past `import main`
+    from app.modules.dashboard.mirror import install_mirror_hooks, mirror_queue
+
+    settings = get_settings()
+    # Queue DashboardBoxMirror refreshes when source-module rows commit
+    install_mirror_hooks()
+    # Parses config/metadata once, then hot-reloads changed files
+    start_metadata_watcher()
+    tasks = []
+    if settings.status_color_recompute_hour is not None:
+        tasks.append(asyncio.create_task(run_nightly(settings.status_color_recompute_hour)))
+    if settings.dashboard_snapshot_interval_minutes:
+        from app.modules.dashboard.rollup import run_snapshot_schedule
+
+        tasks.append(
+            asyncio.create_task(run_snapshot_schedule(settings.dashboard_snapshot_interval_minutes))
+        )
+    if settings.attachment_reaper_interval_seconds:
+        # Imported here so `import main` does not load the attachments module
+        from app.modules.attachments.reaper import run_reaper_schedule
+
+        tasks.append(
+            asyncio.create_task(
+                run_reaper_schedule(
+                    settings.attachment_reaper_interval_seconds,
+                    settings.attachment_orphan_sweep_hours,
+                )
+            )
+        )
+    yield
+    for task in tasks:
+        task.cancel()
+    # Joins the watcher thread, which can take up to one poll interval
+    await asyncio.to_thread(stop_metadata_watcher)
+    # Write any debounced dashboard mirror refreshes before exiting
+    mirror_queue.flush()
+    # Stop bcrypt worker processes with the app
+    shutdown_password_pool()
 
 
 def create_app() -> FastAPI:
@@ -24,12 +70,14 @@ def create_app() -> FastAPI:
         title="Military Leaders Tool - Backend",
         version="0.1.0",
         description="Fresh minimal backend skeleton (SQLite, FastAPI, SQLAlchemy 2.x).",
+        lifespan=lifespan,
     )
 
     # -----------------------------------------------------
     # Create database tables AFTER metadata wipe
     # but BEFORE loading module routers (VERY IMPORTANT)
     # -----------------------------------------------------
+    # Runs pending migrations only; a no-op when the schema is current.
     init_models()
 
     # CORS (unchanged)
@@ -41,17 +89,39 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Per-request query count / DB time -> Server-Timing + N+1 warnings
+    if settings.sql_stats_enabled:
+        install_query_hooks()
+        app.add_middleware(QueryStatsMiddleware)
+
+    # Route latency / in-flight / status counters for /metrics
+    if settings.metrics_enabled:
+        instrument_engine_pool(engine, "sync")
+        instrument_engine_pool(get_async_engine().sync_engine, "async")
+        app.add_middleware(MetricsMiddleware)
+
     # Routers load ONLY after tables exist
-    include_all_routers(app)
+    lazy = settings.router_mode == "lazy"
+    if not (lazy and include_lazy_routers(app)):
+        include_all_routers(app)
 
     @app.get("/health", tags=["system"])
     async def health_check() -> dict:
         return {
             "status": "ok",
             "env": settings.environment,
-            "db": settings.database_url,
+            # Never echo credentials from a Postgres URL
+            "db": make_url(settings.database_url).render_as_string(hide_password=True),
+            "router_mode": settings.router_mode,
+            "module_import_ms": app.state.module_import_ms,
         }
 
+    if settings.metrics_enabled:
+
+        @app.get("/metrics", tags=["system"], response_class=PlainTextResponse)
+        async def metrics() -> PlainTextResponse:
+            return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
     return app
 
 
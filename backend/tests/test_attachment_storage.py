@@ -0,0 +1,224 @@
+# tests/test_attachment_storage.py
+
+"""
+Attachment storage against the S3 code path (LocalS3Client): content-
+addressed dedupe on upload, multipart uploads, presigned downloads,
+delete + reaper, the legacy-file dedupe CLI and the orphan sweeper.
+"""
+
+from __future__ import annotations
+
+import os
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Dict, List
+from uuid import UUID
+
+from sqlalchemy import select
+
+from app.core.db import SessionLocal
+from app.modules.attachments.models import Attachment, AttachmentBlob, AttachmentFileDeletion
+from app.modules.attachments.reaper import reap_file_deletions, sweep_orphans
+from app.modules.attachments.utils import build_storage_path, save_bytes
+
+BUCKET = "mlt-test"
+
+
+# ---------------------------------------------------------------------------
+# HELPERS
+# ---------------------------------------------------------------------------
+
+def _objects(s3_root: Path) -> List[str]:
+    bucket = s3_root / BUCKET
+    return sorted(p.relative_to(bucket).as_posix() for p in bucket.rglob("*") if p.is_file())
+
+
+def _upload(client, headers, data: bytes, name: str = "orders.pdf", owner_id: str = "1") -> Dict[str, Any]:
+    response = client.post(
+        "/api/attachments",
+        headers=headers,
+        files={"file": (name, data, "application/pdf")},
+        data={"owner_type": "test", "owner_id": owner_id},
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def _row(attachment_id: str) -> Attachment:
+    with SessionLocal() as db:
+        return db.scalars(select(Attachment).where(Attachment.id == UUID(str(attachment_id)))).one()
+
+
+def _blob(sha256: str) -> AttachmentBlob:
+    with SessionLocal() as db:
+        return db.get(AttachmentBlob, sha256)
+
+
+def _reap_all() -> Dict[str, int]:
+    totals = {"removed": 0, "kept": 0, "retry": 0}
+    while True:
+        counts = reap_file_deletions()
+        for name, count in counts.items():
+            totals[name] += count
+        if not any(counts.values()):
+            return totals
+
+
+# ---------------------------------------------------------------------------
+# TESTS
+# ---------------------------------------------------------------------------
+
+def test_identical_uploads_share_one_object(client, auth_headers, s3_root):
+    data = os.urandom(4096)
+    first = _upload(client, auth_headers, data, "a.pdf")
+    second = _upload(client, auth_headers, data, "b.pdf")
+
+    row = _row(first["id"])
+    assert row.storage_path.startswith("s3:cas/")
+    assert _row(second["id"]).storage_path == row.storage_path
+
+    blob = _blob(row.sha256)
+    assert (blob.storage_backend, blob.ref_count) == ("s3", 2)
+    assert row.storage_path.split(":", 1)[1] in _objects(s3_root)
+
+
+def test_multipart_upload_round_trips(client, auth_headers, s3_root):
+    data = os.urandom(3 * 1024 * 1024 + 5)  # four parts at 1 MiB
+    uploaded = _upload(client, auth_headers, data, "scan.pdf")
+
+    assert not list((s3_root / ".uploads").glob("*"))
+    key = _row(uploaded["id"]).storage_path.split(":", 1)[1]
+    assert (s3_root / BUCKET / key).read_bytes() == data
+
+
+def test_download_redirects_to_presigned_url(client, auth_headers):
+    data = os.urandom(2048)
+    uploaded = _upload(client, auth_headers, data, "scan order.pdf")
+
+    response = client.get(
+        f"/api/attachments/{uploaded['id']}/download", headers=auth_headers, follow_redirects=False
+    )
+    assert response.status_code == 307
+    location = response.headers["location"]
+    assert "signature=" in location
+
+    # The presigned URL needs no bearer token
+    body = client.get(location)
+    assert body.status_code == 200
+    assert body.content == data
+    assert body.headers["content-type"] == "application/pdf"
+    assert "scan%20order.pdf" in body.headers["content-disposition"]
+
+    assert client.get(location.replace("signature=", "signature=0")).status_code == 403
+
+
+def test_delete_queues_the_object_for_the_reaper(client, auth_headers, s3_root):
+    data = os.urandom(1024)
+    uploaded = _upload(client, auth_headers, data)
+    key = _row(uploaded["id"]).storage_path.split(":", 1)[1]
+
+    assert client.delete(f"/api/attachments/{uploaded['id']}", headers=auth_headers).status_code == 204
+    # Nothing is removed inline; the row is gone and the path is queued
+    assert key in _objects(s3_root)
+    with SessionLocal() as db:
+        assert db.get(AttachmentFileDeletion, f"s3:{key}") is not None
+
+    assert _reap_all()["removed"] >= 1
+    assert key not in _objects(s3_root)
+    with SessionLocal() as db:
+        assert db.get(AttachmentFileDeletion, f"s3:{key}") is None
+
+
+def test_shared_object_survives_deleting_one_reference(client, auth_headers, s3_root):
+    data = os.urandom(1024)
+    keep = _upload(client, auth_headers, data, "keep.pdf")
+    drop = _upload(client, auth_headers, data, "drop.pdf")
+    row = _row(keep["id"])
+    key = row.storage_path.split(":", 1)[1]
+
+    assert client.delete(f"/api/attachments/{drop['id']}", headers=auth_headers).status_code == 204
+    _reap_all()
+
+    assert key in _objects(s3_root)
+    assert _blob(row.sha256).ref_count == 1
+    assert client.get(f"/api/attachments/{keep['id']}/download", headers=auth_headers).content == data
+
+
+def test_dedupe_moves_legacy_files_into_the_store(s3_root):
+    from app.modules.attachments.cli import main as attachments_cli
+
+    data = os.urandom(1500)
+    stored_name, relative_path, file_size = save_bytes(data, "legacy.pdf")
+    with SessionLocal() as db:
+        legacy = Attachment(
+            owner_type="test",
+            owner_id="legacy",
+            original_name="legacy.pdf",
+            stored_name=stored_name,
+            storage_path=relative_path,
+            content_type="application/pdf",
+            file_size=file_size,
+        )
+        db.add(legacy)
+        db.commit()
+        legacy_id = legacy.id
+
+    attachments_cli(["dedupe"])
+
+    row = _row(legacy_id)
+    assert row.storage_path.startswith("s3:cas/")
+    assert row.sha256 and _blob(row.sha256).ref_count == 1
+    assert (s3_root / BUCKET / row.storage_path.split(":", 1)[1]).read_bytes() == data
+
+    # The flat-layout file is only removed once the reaper gets to it
+    assert build_storage_path(stored_name).is_file()
+    _reap_all()
+    assert not build_storage_path(stored_name).exists()
+
+
+def test_sweeper_queues_unreferenced_objects(s3_root):
+    stray = s3_root / BUCKET / "cas" / "00" / "00" / ("0" * 64)
+    stray.parent.mkdir(parents=True, exist_ok=True)
+    stray.write_bytes(b"stray")
+
+    assert sweep_orphans(grace_seconds=0)["orphans"] >= 1
+    _reap_all()
+    assert not stray.exists()
+
+
+def test_upload_restores_an_object_reaped_before_commit(s3_root):
+    from app.modules.attachments.service import attach_staged, blob_backend, ensure_stored, store_staged
+    from app.modules.attachments.utils import discard_staged, stage_stream
+
+    data = os.urandom(1024)
+    with SessionLocal() as db:
+        staged = stage_stream(BytesIO(data))
+        backend = blob_backend(db, staged.sha256)
+        db.commit()
+        assert store_staged(backend, staged)
+        # The reaper removes the (still unreferenced) object here
+        (s3_root / BUCKET / staged.key).unlink()
+
+        attachment = attach_staged(db, staged, backend=backend, original_name="late.pdf")
+        assert ensure_stored(attachment, staged)
+        db.commit()
+        discard_staged(staged)
+
+    assert (s3_root / BUCKET / staged.key).read_bytes() == data
+    assert not staged.temp_path.exists()
+
+
+def test_sweeper_repairs_reference_counts(client, auth_headers, s3_root):
+    data = os.urandom(1024)
+    uploaded = _upload(client, auth_headers, data, "counted.pdf")
+    row = _row(uploaded["id"])
+    with SessionLocal() as db:
+        db.get(AttachmentBlob, row.sha256).ref_count = 5
+        db.add(AttachmentBlob(sha256="f" * 64, file_size=1, ref_count=1, storage_backend="s3"))
+        db.commit()
+
+    assert sweep_orphans(grace_seconds=0)["ref_counts_fixed"] == 2
+    assert _blob(row.sha256).ref_count == 1
+    assert _blob("f" * 64) is None
+    with SessionLocal() as db:
+        assert db.get(AttachmentFileDeletion, f"s3:{'cas/ff/ff/' + 'f' * 64}") is not None
@@ -17,10 +17,11 @@ const BOXES = [
   "Evaluations",
 ];
 
-export const BoxGrid = () => {
+// Falls back to the static list until a compiled layout is loaded
+export const BoxGrid = ({ boxes = BOXES }) => {
   return (
     <section className="box-grid">
-      {BOXES.map((name) => (
+      {boxes.map((name) => (
         <BoxPlaceholder key={name} title={name} />
       ))}
     </section>
@@ -1,10 +1,22 @@
-import React from "react";
+import React, { useEffect, useState } from "react";
 import { BoxGrid } from "./BoxGrid";
 
+// Precompiled by the backend (master + unit + user layouts)
+const LAYOUT_URL = "/api/dashboard/layout";
+
 export const DashboardShell = () => {
+  const [layout, setLayout] = useState(null);
+
+  useEffect(() => {
+    fetch(LAYOUT_URL, { credentials: "include" })
+      .then((res) => (res.ok ? res.json() : null))
+      .then(setLayout)
+      .catch(() => setLayout(null));
+  }, []);
+
   return (
     <main>
-      <BoxGrid />
+      <BoxGrid boxes={layout ? layout.boxes.map((box) => box.name) : undefined} />
     </main>
   );
 };